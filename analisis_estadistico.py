@@ -6,56 +6,45 @@ Todas las tablas del Capítulo IV recalculadas con precisión
 
 import pandas as pd
 import numpy as np
-from scipy.stats import kruskal, mannwhitneyu, spearmanr
+from scipy.stats import kruskal, spearmanr
 import os
+from catalogo import DIRECTORIO_EXPORTACION, FORMATOS_TABLAS
+from contexto_datos import obtener_contexto
+from cache_resultados import en_cache
+from manifiesto_exportacion import Manifiesto, huella_artefacto, escritura_atomica
+from renderizado_tablas import TablaFormateada, formatear_columna
+from motor_estadistico import (resumen_por_grupo, medias_por_grupo, kruskal_wallis,
+                               mann_whitney_pares, correlaciones_spearman,
+                               seleccionar_correlaciones)
+from remuestreo import permutacion_kruskal, permutacion_mann_whitney, bootstrap_medias
+from ingesta_streaming import (agregados_contexto, generar_tabla3_agregados, generar_tabla6_agregados,
+                               generar_tabla7_agregados, generar_tabla8_agregados,
+                               generar_tabla9_agregados)
 
 # ============================================================================
 # DATOS ORIGINALES EXACTOS
 # ============================================================================
 
-def cargar_datos_originales():
-    """Carga el dataset original exacto"""
-    data = [
-        ["ENT_PUB1", 2500, 180000, "Perimetral", 12, "Medio", 28, 18, 64.3, 45.2, 15.3, 3, 3, "Trimestral", 15, 8],
-        ["ENT_PUB2", 1800, 95000, "Perimetral", 15, "Bajo", 42, 25, 59.5, 52.5, 18.1, 2, 2, "Semestral", 12, 5],
-        ["ENT_PUB3", 3200, 220000, "Híbrido", 4, "Medio", 15, 12, 80.0, 22.8, 6.2, 4, 4, "Trimestral", 18, 12],
-        ["ENT_PUB4", 1500, 120000, "Perimetral", 10, "Bajo", 38, 22, 57.9, 48.4, 16.7, 2, 3, "Anual", 11, 6],
-        ["ENT_PUB5", 2800, 190000, "Híbrido", 3, "Medio", 18, 14, 77.8, 25.1, 7.5, 3, 4, "Trimestral", 17, 11],
-        ["ENT_PUB6", 2200, 280000, "Zero Trust", 2, "Medio", 8, 7, 87.5, 8.4, 2.8, 4, 4, "Mensual", 22, 9],
-        ["ENT_PUB7", 1900, 85000, "Perimetral", 8, "Bajo", 45, 26, 57.8, 55.3, 19.9, 2, 2, "Semestral", 10, 4],
-        ["ENT_PUB8", 2600, 320000, "Zero Trust", 1, "Bajo", 12, 10, 83.3, 12.7, 4.3, 3, 3, "Trimestral", 24, 7],
-        ["ENT_PUB9", 1700, 140000, "Híbrido", 5, "Medio", 16, 13, 81.3, 23.6, 6.8, 4, 3, "Trimestral", 16, 10],
-        ["ENT_PUB10", 3000, 350000, "Zero Trust", 2, "Medio", 6, 5, 83.3, 6.1, 1.7, 4, 5, "Mensual", 25, 14],
-        ["ENT_PUB11", 2100, 110000, "Perimetral", 11, "Medio", 32, 20, 62.5, 46.8, 17.4, 3, 3, "Trimestral", 13, 7],
-        ["ENT_PUB12", 2400, 260000, "Híbrido", 4, "Medio", 14, 11, 78.6, 21.9, 5.9, 4, 4, "Trimestral", 19, 13],
-        ["ENT_PUB13", 1300, 70000, "Perimetral", 9, "Bajo", 40, 23, 57.5, 53.7, 20.3, 2, 2, "Anual", 9, 3],
-        ["ENT_PUB14", 2700, 300000, "Zero Trust", 3, "Medio", 7, 6, 85.7, 5.8, 1.4, 5, 4, "Mensual", 23, 12],
-        ["ENT_PUB15", 2000, 170000, "Híbrido", 6, "Medio", 17, 13, 76.5, 24.5, 7.1, 3, 3, "Trimestral", 15, 9],
-        ["ENT_PUB16", 2300, 125000, "Perimetral", 14, "Medio", 35, 21, 60.0, 49.1, 16.2, 3, 2, "Semestral", 14, 6],
-        ["ENT_PUB17", 1600, 230000, "Zero Trust", 2, "Medio", 9, 8, 88.9, 9.3, 3.2, 4, 4, "Trimestral", 21, 8],
-        ["ENT_PUB18", 2900, 195000, "Híbrido", 5, "Medio", 13, 10, 76.9, 22.3, 6.5, 4, 4, "Trimestral", 16, 15],
-        ["ENT_PUB19", 1400, 80000, "Perimetral", 7, "Bajo", 43, 25, 58.1, 54.8, 21.5, 2, 2, "Anual", 8, 4],
-        ["ENT_PUB20", 2500, 400000, "Zero Trust", 3, "Alto", 10, 9, 90.0, 3.2, 0.8, 5, 5, "Mensual", 28, 16]
-    ]
-    
-    columnas = [
-        "Entidad", "Empleados", "Presupuesto_Seguridad_USD", "Modelo_Seguridad", 
-        "Años_Implementación", "Nivel_Madurez", "Incidentes_Mensuales", 
-        "Bloqueos_Exitosos", "Tasa_Bloqueo_%", "Tiempo_Respuesta_min", 
-        "Tiempo_Detección_min", "Percepción_1_5", "Capacitación_1_5", 
-        "Frecuencia_Simulacros", "%_Presupuesto_IT_Seguridad", "Especialistas"
-    ]
-    
-    df = pd.DataFrame(data, columns=columnas)
-    return df
+# El dataset en línea vive únicamente en datos.py; se re-exporta aquí por
+# compatibilidad con los módulos que lo importaban desde este archivo.
+from datos import cargar_datos_originales
 
 # ============================================================================
 # TABLA 3: CARACTERÍSTICAS GENERALES (CÁLCULO EXACTO)
 # ============================================================================
 
-def generar_tabla3():
+@en_cache
+def generar_tabla3(contexto=None):
     """Tabla 3: Características generales de las entidades evaluadas"""
-    df = cargar_datos_originales()
+    # CSV/Excel: desde los agregados por bloques, sin cargar el archivo
+    agregados = agregados_contexto(contexto)
+    if agregados is not None:
+        return generar_tabla3_agregados(agregados)
+    
+    df = obtener_contexto(contexto).columnas([
+        'Empleados', 'Presupuesto_Seguridad_USD', 'Años_Implementación', 'Especialistas',
+        '%_Presupuesto_IT_Seguridad'
+    ])
     
     # Calcular estadísticas exactas
     empleados_min = df['Empleados'].min()
@@ -78,6 +67,24 @@ def generar_tabla3():
     presupuesto_it_max = df['%_Presupuesto_IT_Seguridad'].max()
     presupuesto_it_media = df['%_Presupuesto_IT_Seguridad'].mean()
     
+    estadisticas = {
+        'Empleados': (empleados_min, empleados_max, empleados_media),
+        'Presupuesto_Seguridad_USD': (presupuesto_min, presupuesto_max, presupuesto_media),
+        'Años_Implementación': (años_min, años_max, años_media),
+        'Especialistas': (especialistas_min, especialistas_max, especialistas_media),
+        '%_Presupuesto_IT_Seguridad': (presupuesto_it_min, presupuesto_it_max, presupuesto_it_media)
+    }
+    
+    return presentar_tabla3(estadisticas)
+
+def presentar_tabla3(estadisticas):
+    """Formatea la Tabla 3 a partir de (mínimo, máximo, media) por variable"""
+    empleados_min, empleados_max, empleados_media = estadisticas['Empleados']
+    presupuesto_min, presupuesto_max, presupuesto_media = estadisticas['Presupuesto_Seguridad_USD']
+    años_min, años_max, años_media = estadisticas['Años_Implementación']
+    especialistas_min, especialistas_max, especialistas_media = estadisticas['Especialistas']
+    presupuesto_it_min, presupuesto_it_max, presupuesto_it_media = estadisticas['%_Presupuesto_IT_Seguridad']
+    
     tabla3 = pd.DataFrame({
         "Variable": [
             "Número de empleados",
@@ -108,14 +115,23 @@ def generar_tabla3():
 # TABLA 6: DISTRIBUCIÓN DE MODELOS (CÁLCULO EXACTO)
 # ============================================================================
 
-def generar_tabla6():
+@en_cache
+def generar_tabla6(contexto=None):
     """Tabla 6: Distribución de modelos de seguridad"""
-    df = cargar_datos_originales()
+    agregados = agregados_contexto(contexto)
+    if agregados is not None:
+        return generar_tabla6_agregados(agregados)
+    
+    df = obtener_contexto(contexto).columnas(['Modelo_Seguridad'])
     
     # Calcular distribución exacta
-    distribucion = df['Modelo_Seguridad'].value_counts().reset_index()
+    return presentar_tabla6(df['Modelo_Seguridad'].value_counts(), len(df))
+
+def presentar_tabla6(frecuencias, total_entidades):
+    """Formatea la Tabla 6 a partir de las frecuencias por modelo"""
+    distribucion = frecuencias.rename_axis('Modelo de seguridad').reset_index()
     distribucion.columns = ['Modelo de seguridad', 'Frecuencia']
-    distribucion['Porcentaje (%)'] = (distribucion['Frecuencia'] / len(df) * 100)
+    distribucion['Porcentaje (%)'] = (distribucion['Frecuencia'] / total_entidades * 100)
     
     # Ordenar por frecuencia descendente
     distribucion = distribucion.sort_values('Frecuencia', ascending=False)
@@ -132,8 +148,8 @@ def generar_tabla6():
     
     # Combinar y formatear
     distribucion_completa = pd.concat([distribucion, total], ignore_index=True)
-    distribucion_completa['Porcentaje (%)'] = distribucion_completa['Porcentaje (%)'].apply(
-        lambda x: f"{x:.1f}%" if pd.notnull(x) else ""
+    distribucion_completa['Porcentaje (%)'] = formatear_columna(
+        distribucion_completa['Porcentaje (%)'], '%.1f%%'
     )
     
     return distribucion_completa
@@ -142,15 +158,24 @@ def generar_tabla6():
 # TABLA 7: NIVEL DE MADUREZ (CÁLCULO EXACTO CON DESVIACIONES REALES)
 # ============================================================================
 
-def generar_tabla7():
+@en_cache
+def generar_tabla7(contexto=None):
     """Tabla 7: Nivel de madurez del modelo según años de implementación"""
-    df = cargar_datos_originales()
+    agregados = agregados_contexto(contexto)
+    if agregados is not None:
+        return generar_tabla7_agregados(agregados)
+    
+    ctx = obtener_contexto(contexto)
+    df = ctx.columnas([
+        'Nivel_Madurez', 'Años_Implementación', 'Modelo_Seguridad'
+    ])
+    indice = ctx.indice('Nivel_Madurez')
     
     # Calcular estadísticas por nivel de madurez
     resultados = []
     
     for nivel in ['Bajo', 'Medio', 'Alto']:
-        subset = df[df['Nivel_Madurez'] == nivel]
+        subset = df.take(indice.posiciones(nivel))
         
         if len(subset) > 0:
             años = subset['Años_Implementación']
@@ -165,15 +190,26 @@ def generar_tabla7():
             modelo_pred = modelo_predominante[0] if len(modelo_predominante) > 0 else "N/A"
             
             resultados.append({
-                'Nivel de madurez': nivel,
-                'Promedio de años de implementación': f"{promedio:.4f}",
-                'Desviación estándar': f"{desviacion:.4f}",
-                'Varianza': f"{varianza:.4f}",
-                'Cantidad': len(subset),
-                'Modelo predominante': modelo_pred
+                'nivel': nivel,
+                'promedio': promedio,
+                'desviacion': desviacion,
+                'varianza': varianza,
+                'cantidad': len(subset),
+                'modelo_predominante': modelo_pred
             })
     
-    tabla7 = pd.DataFrame(resultados)
+    return presentar_tabla7(resultados)
+
+def presentar_tabla7(resultados):
+    """Formatea la Tabla 7 a partir de las estadísticas por nivel de madurez"""
+    tabla7 = pd.DataFrame([{
+        'Nivel de madurez': r['nivel'],
+        'Promedio de años de implementación': f"{r['promedio']:.4f}",
+        'Desviación estándar': f"{r['desviacion']:.4f}",
+        'Varianza': f"{r['varianza']:.4f}",
+        'Cantidad': r['cantidad'],
+        'Modelo predominante': r['modelo_predominante']
+    } for r in resultados])
     
     # Formatear para presentación
     tabla7_formateada = pd.DataFrame({
@@ -189,186 +225,213 @@ def generar_tabla7():
 # TABLA 8: DESEMPEÑO PROMEDIO (CÁLCULO EXACTO)
 # ============================================================================
 
-def generar_tabla8():
+# Métricas de la Tabla 8 y encabezado de presentación
+METRICAS_TABLA8 = {
+    'Incidentes_Mensuales': 'Incidentes mensuales (M)',
+    'Bloqueos_Exitosos': 'Bloqueos exitosos (M)',
+    'Tasa_Bloqueo_%': 'Tasa de bloqueo (%)',
+    'Tiempo_Respuesta_min': 'Tiempo de respuesta (min)',
+    'Tiempo_Detección_min': 'Tiempo de detección (min)'
+}
+
+@en_cache
+def generar_tabla8(contexto=None, con_de=False, bootstrap=None, semilla=None, metodo_ic='bca'):
     """Tabla 8: Desempeño promedio de los modelos de seguridad"""
-    df = cargar_datos_originales()
+    # Los intervalos bootstrap remuestrean valores individuales: esos sí se cargan
+    agregados = None if bootstrap else agregados_contexto(contexto)
+    if agregados is not None:
+        return generar_tabla8_agregados(agregados, con_de)
     
-    modelos = ['Perimetral', 'Híbrido', 'Zero Trust']
-    resultados = []
+    resumen = resumen_por_grupo(contexto, list(METRICAS_TABLA8))
     
-    for modelo in modelos:
-        subset = df[df['Modelo_Seguridad'] == modelo]
-        
-        if len(subset) > 0:
-            # Calcular estadísticas exactas
-            incidentes_media = subset['Incidentes_Mensuales'].mean()
-            bloqueos_media = subset['Bloqueos_Exitosos'].mean()
-            tasa_bloqueo_media = subset['Tasa_Bloqueo_%'].mean()
-            tiempo_respuesta_media = subset['Tiempo_Respuesta_min'].mean()
-            tiempo_deteccion_media = subset['Tiempo_Detección_min'].mean()
-            
-            # Calcular desviaciones estándar
-            incidentes_std = subset['Incidentes_Mensuales'].std(ddof=1)
-            bloqueos_std = subset['Bloqueos_Exitosos'].std(ddof=1)
-            tasa_bloqueo_std = subset['Tasa_Bloqueo_%'].std(ddof=1)
-            tiempo_respuesta_std = subset['Tiempo_Respuesta_min'].std(ddof=1)
-            tiempo_deteccion_std = subset['Tiempo_Detección_min'].std(ddof=1)
-            
-            resultados.append({
-                'Modelo': modelo,
-                'N': len(subset),
-                'Incidentes mensuales (M±SD)': f"{incidentes_media:.4f} ± {incidentes_std:.4f}",
-                'Bloqueos exitosos (M±SD)': f"{bloqueos_media:.4f} ± {bloqueos_std:.4f}",
-                'Tasa de bloqueo % (M±SD)': f"{tasa_bloqueo_media:.4f} ± {tasa_bloqueo_std:.4f}",
-                'Tiempo respuesta min (M±SD)': f"{tiempo_respuesta_media:.4f} ± {tiempo_respuesta_std:.4f}",
-                'Tiempo detección min (M±SD)': f"{tiempo_deteccion_media:.4f} ± {tiempo_deteccion_std:.4f}"
-            })
+    # Intervalos de confianza bootstrap (opcional): bootstrap = número de remuestras
+    intervalos = None
+    if bootstrap:
+        intervalos = bootstrap_medias(contexto, list(METRICAS_TABLA8),
+                                      remuestras=bootstrap, semilla=semilla)
     
-    tabla8 = pd.DataFrame(resultados)
+    return presentar_tabla8(resumen, con_de, intervalos, metodo_ic)
+
+def _formatear_resumen(resumen, metrica, con_de=False):
+    """Formatea media (y opcionalmente DE) de una métrica por modelo"""
+    filas = resumen[resumen['Métrica'] == metrica]
+    if con_de:
+        return [f"{m:.4f} ± {s:.4f}" for m, s in zip(filas['media'], filas['de'])]
+    return [f"{m:.4f}" for m in filas['media']]
+
+def _agregar_intervalos(tabla, intervalos, encabezados, metodo_ic='bca'):
+    """Inserta, tras cada métrica, la columna con su IC bootstrap formateado"""
+    if metodo_ic not in ('bca', 'percentil'):
+        raise ValueError(f"Método de IC no soportado: '{metodo_ic}' (use 'bca' o 'percentil')")
+    
+    for metrica, encabezado in encabezados.items():
+        filas = intervalos[intervalos['Métrica'] == metrica].set_index('Modelo_Seguridad')
+        filas = filas.reindex(tabla['Modelo'])
+        nivel = int(round(intervalos['nivel'].iloc[0] * 100))
+        posicion = tabla.columns.get_loc(encabezado) + 1
+        tabla.insert(posicion, f"IC {nivel}% {encabezado}", [
+            f"[{inf:.4f}, {sup:.4f}]"
+            for inf, sup in zip(filas[f'ic_{metodo_ic}_inf'], filas[f'ic_{metodo_ic}_sup'])
+        ])
+    return tabla
+
+def _modelos_presentes(resumen):
+    """Modelos con al menos una observación, en el orden del resumen"""
+    conteos = resumen.groupby('Modelo_Seguridad', sort=False)['n'].max()
+    return resumen[resumen['Modelo_Seguridad'].isin(conteos[conteos > 0].index)]
+
+def presentar_tabla8(resumen, con_de=False, intervalos=None, metodo_ic='bca'):
+    """Formatea la Tabla 8 a partir del resumen numérico por modelo"""
+    resumen = _modelos_presentes(resumen)
+    modelos = list(dict.fromkeys(resumen['Modelo_Seguridad']))
     
-    # Versión simplificada para la tesis
-    tabla8_simple = pd.DataFrame({
-        'Modelo': tabla8['Modelo'],
-        'Incidentes mensuales (M)': [x.split(' ± ')[0] for x in tabla8['Incidentes mensuales (M±SD)']],
-        'Bloqueos exitosos (M)': [x.split(' ± ')[0] for x in tabla8['Bloqueos exitosos (M±SD)']],
-        'Tasa de bloqueo (%)': [x.split(' ± ')[0] for x in tabla8['Tasa de bloqueo % (M±SD)']],
-        'Tiempo de respuesta (min)': [x.split(' ± ')[0] for x in tabla8['Tiempo respuesta min (M±SD)']],
-        'Tiempo de detección (min)': [x.split(' ± ')[0] for x in tabla8['Tiempo detección min (M±SD)']]
-    })
+    tabla8 = pd.DataFrame({'Modelo': modelos})
+    for metrica, encabezado in METRICAS_TABLA8.items():
+        tabla8[encabezado] = _formatear_resumen(resumen, metrica, con_de)
+    
+    if intervalos is not None:
+        _agregar_intervalos(tabla8, intervalos, METRICAS_TABLA8, metodo_ic)
     
-    return tabla8_simple
+    return tabla8
 
 # ============================================================================
 # TABLA 9: PERCEPCIÓN Y CAPACITACIÓN
 # ============================================================================
 
-def generar_tabla9():
+# Métricas numéricas de la Tabla 9 y encabezado de presentación
+METRICAS_TABLA9 = {
+    'Percepción_1_5': 'Percepción de seguridad (1–5)',
+    'Capacitación_1_5': 'Nivel de capacitación (1–5)',
+    'Especialistas': 'Media especialistas'
+}
+
+@en_cache
+def generar_tabla9(contexto=None, con_de=False, bootstrap=None, semilla=None, metodo_ic='bca'):
     """Tabla 9 CORREGIDA: Indicadores de percepción y capacitación"""
-    df = cargar_datos_originales()
+    agregados = None if bootstrap else agregados_contexto(contexto)
+    if agregados is not None:
+        return generar_tabla9_agregados(agregados, con_de)
     
-    modelos = ['Perimetral', 'Híbrido', 'Zero Trust']
-    resultados = []
+    resumen = resumen_por_grupo(contexto, [
+        'Percepción_1_5', 'Capacitación_1_5', 'Especialistas', 'Frecuencia_Simulacros'
+    ])
     
-    for modelo in modelos:
-        subset = df[df['Modelo_Seguridad'] == modelo]
-        
-        if len(subset) > 0:
-            # Calcular promedios EXACTOS
-            percepcion_media = subset['Percepción_1_5'].mean()
-            capacitacion_media = subset['Capacitación_1_5'].mean()
-            especialistas_media = subset['Especialistas'].mean()
-            
-            # Calcular desviaciones estándar
-            percepcion_std = subset['Percepción_1_5'].std(ddof=1)
-            capacitacion_std = subset['Capacitación_1_5'].std(ddof=1)
-            especialistas_std = subset['Especialistas'].std(ddof=1)
-            
-            # Determinar frecuencia más común de simulacros
-            frecuencia_counts = subset['Frecuencia_Simulacros'].value_counts()
-            if len(frecuencia_counts) > 0:
-                frecuencia_comun = frecuencia_counts.index[0]
-            else:
-                frecuencia_comun = "N/A"
-            
-            resultados.append({
-                'Modelo': modelo,
-                'Percepción de seguridad (1–5) (M±SD)': f"{percepcion_media:.4f} ± {percepcion_std:.4f}",
-                'Nivel de capacitación (1–5) (M±SD)': f"{capacitacion_media:.4f} ± {capacitacion_std:.4f}",
-                'Frecuencia de simulacros': frecuencia_comun,
-                'Especialistas (M±SD)': f"{especialistas_media:.4f} ± {especialistas_std:.4f}"
-            })
+    # Intervalos de confianza bootstrap (opcional), solo para las métricas numéricas
+    intervalos = None
+    if bootstrap:
+        intervalos = bootstrap_medias(contexto, list(METRICAS_TABLA9),
+                                      remuestras=bootstrap, semilla=semilla)
     
-    tabla9 = pd.DataFrame(resultados)
-    
-    # Versión para la tesis
-    tabla9_simple = pd.DataFrame({
-        'Modelo': tabla9['Modelo'],
-        'Percepción de seguridad (1–5)': [x.split(' ± ')[0] for x in tabla9['Percepción de seguridad (1–5) (M±SD)']],
-        'Nivel de capacitación (1–5)': [x.split(' ± ')[0] for x in tabla9['Nivel de capacitación (1–5) (M±SD)']],
-        'Frecuencia de simulacros': tabla9['Frecuencia de simulacros'],
-        'Media especialistas': [x.split(' ± ')[0] for x in tabla9['Especialistas (M±SD)']]
+    return presentar_tabla9(resumen, con_de, intervalos, metodo_ic)
+
+def presentar_tabla9(resumen, con_de=False, intervalos=None, metodo_ic='bca'):
+    """Formatea la Tabla 9 a partir del resumen numérico por modelo"""
+    resumen = _modelos_presentes(resumen)
+    modelos = list(dict.fromkeys(resumen['Modelo_Seguridad']))
+    
+    # Frecuencia de simulacros más común (empates: primera aparición)
+    frecuencias = resumen.loc[resumen['Métrica'] == 'Frecuencia_Simulacros', 'moda']
+    
+    tabla9 = pd.DataFrame({
+        'Modelo': modelos,
+        'Percepción de seguridad (1–5)': _formatear_resumen(resumen, 'Percepción_1_5', con_de),
+        'Nivel de capacitación (1–5)': _formatear_resumen(resumen, 'Capacitación_1_5', con_de),
+        'Frecuencia de simulacros': [f if pd.notna(f) else "N/A" for f in frecuencias],
+        'Media especialistas': _formatear_resumen(resumen, 'Especialistas', con_de)
     })
     
-    return tabla9_simple
+    if intervalos is not None:
+        _agregar_intervalos(tabla9, intervalos, METRICAS_TABLA9, metodo_ic)
+    
+    return tabla9
 
 # ============================================================================
 # TABLA 10: KRUSKAL-WALLIS (¡CÁLCULO EXACTO!)
 # ============================================================================
 
-def generar_tabla10():
+# Variables de desempeño contrastadas con Kruskal–Wallis (y familia post-hoc de la Tabla 11)
+VARIABLES_TABLA10 = [
+    ('Incidentes mensuales', 'Incidentes_Mensuales'),
+    ('Tasa de bloqueo (%)', 'Tasa_Bloqueo_%'),
+    ('Tiempo de respuesta (min)', 'Tiempo_Respuesta_min'),
+    ('Tiempo de detección (min)', 'Tiempo_Detección_min')
+]
+
+@en_cache
+def generar_tabla10(contexto=None, permutaciones=None, semilla=None):
     """Tabla 10: Prueba de Kruskal–Wallis con cálculos exactos"""
-    df = cargar_datos_originales()
+    ctx = obtener_contexto(contexto)
     
-    variables = [
-        ('Incidentes mensuales', 'Incidentes_Mensuales'),
-        ('Tasa de bloqueo (%)', 'Tasa_Bloqueo_%'),
-        ('Tiempo de respuesta (min)', 'Tiempo_Respuesta_min'),
-        ('Tiempo de detección (min)', 'Tiempo_Detección_min')
-    ]
+    variables = VARIABLES_TABLA10
+    columnas = [columna for _, columna in variables]
+    
+    # Todas las variables se prueban en una sola llamada sobre rangos compartidos
+    pruebas = kruskal_wallis(ctx, columnas).set_index('Métrica')
+    
+    # Valor p por permutación (opcional), útil con grupos pequeños
+    if permutaciones:
+        pruebas['p_permutacion'] = permutacion_kruskal(
+            ctx, columnas, permutaciones=permutaciones, semilla=semilla
+        ).set_index('Métrica')['p_permutacion']
+    medias_grupo = medias_por_grupo(ctx, columnas)
     
     resultados = []
     
     for nombre_var, columna in variables:
-        # Extraer datos por grupo
-        grupos = []
-        grupos_nombres = []
-        
-        for modelo in ['Perimetral', 'Híbrido', 'Zero Trust']:
-            grupo_data = df[df['Modelo_Seguridad'] == modelo][columna].dropna().values
-            if len(grupo_data) > 0:
-                grupos.append(grupo_data)
-                grupos_nombres.append(modelo)
+        prueba = pruebas.loc[columna]
         
         # Solo calcular si hay al menos 2 grupos con datos
-        if len(grupos) >= 2:
-            try:
-                # Calcular Kruskal-Wallis exacto
-                h_stat, p_valor = kruskal(*grupos)
-                
-                # Calcular medias por grupo para interpretación
-                medias = []
-                for i, modelo in enumerate(grupos_nombres):
-                    media = np.mean(grupos[i])
-                    medias.append((modelo, media))
-                
-                # Ordenar por media (ascendente o descendente según variable)
-                if "Incidentes" in nombre_var or "Tiempo" in nombre_var:
-                    # Para incidentes y tiempos, menor es mejor
-                    medias_ordenadas = sorted(medias, key=lambda x: x[1])
-                    mejor_modelo = medias_ordenadas[0][0]
-                    interpretacion = f"Mejor desempeño: {mejor_modelo}"
-                else:
-                    # Para tasa de bloqueo, mayor es mejor
-                    medias_ordenadas = sorted(medias, key=lambda x: x[1], reverse=True)
-                    mejor_modelo = medias_ordenadas[0][0]
-                    interpretacion = f"Mejor desempeño: {mejor_modelo}"
-                
-                # Determinar significancia
-                if p_valor < 0.001:
-                    significancia = "*** p < 0.001"
-                elif p_valor < 0.01:
-                    significancia = "** p < 0.01"
-                elif p_valor < 0.05:
-                    significancia = "* p < 0.05"
-                else:
-                    significancia = "ns p ≥ 0.05"
-                
-                resultados.append({
-                    'Variable': nombre_var,
-                    'H (gl = 2)': f"{h_stat:.6f}",
-                    'p valor': f"{p_valor:.6f}",
-                    'Significancia': significancia,
-                    'Interpretación': interpretacion
-                })
-                
-            except Exception as e:
-                resultados.append({
-                    'Variable': nombre_var,
-                    'H (gl = 2)': "Error",
-                    'p valor': "Error",
-                    'Significancia': "Error",
-                    'Interpretación': f"Error en cálculo: {str(e)}"
-                })
+        if prueba['grupos'] < 2:
+            continue
+        
+        if np.isnan(prueba['H']):
+            resultados.append({
+                'Variable': nombre_var,
+                'H (gl = 2)': "Error",
+                'p valor': "Error",
+                'Significancia': "Error",
+                'Interpretación': "Error en cálculo: todos los valores son idénticos"
+            })
+            continue
+        
+        h_stat, p_valor = prueba['H'], prueba['p']
+        
+        # Medias por grupo (solo grupos con datos) para interpretación
+        medias = [(modelo, media) for modelo, media in medias_grupo[columna].items()
+                  if not np.isnan(media)]
+        
+        # Ordenar por media (ascendente o descendente según variable)
+        if "Incidentes" in nombre_var or "Tiempo" in nombre_var:
+            # Para incidentes y tiempos, menor es mejor
+            medias_ordenadas = sorted(medias, key=lambda x: x[1])
+            mejor_modelo = medias_ordenadas[0][0]
+            interpretacion = f"Mejor desempeño: {mejor_modelo}"
+        else:
+            # Para tasa de bloqueo, mayor es mejor
+            medias_ordenadas = sorted(medias, key=lambda x: x[1], reverse=True)
+            mejor_modelo = medias_ordenadas[0][0]
+            interpretacion = f"Mejor desempeño: {mejor_modelo}"
+        
+        # Determinar significancia
+        if p_valor < 0.001:
+            significancia = "*** p < 0.001"
+        elif p_valor < 0.01:
+            significancia = "** p < 0.01"
+        elif p_valor < 0.05:
+            significancia = "* p < 0.05"
+        else:
+            significancia = "ns p ≥ 0.05"
+        
+        fila = {
+            'Variable': nombre_var,
+            'H (gl = 2)': f"{h_stat:.6f}",
+            'p valor': f"{p_valor:.6f}",
+        }
+        if permutaciones:
+            fila['p permutación'] = f"{prueba['p_permutacion']:.6f}"
+        fila['Significancia'] = significancia
+        fila['Interpretación'] = interpretacion
+        resultados.append(fila)
     
     return pd.DataFrame(resultados)
 
@@ -376,82 +439,86 @@ def generar_tabla10():
 # TABLA 11: MANN-WHITNEY (CÁLCULO EXACTO)
 # ============================================================================
 
-def generar_tabla11():
+# Comparaciones reportadas en la tesis
+COMPARACIONES_TABLA11 = [
+    ("Perimetral", "Híbrido", "Incidentes mensuales", "Incidentes_Mensuales"),
+    ("Perimetral", "Zero Trust", "Incidentes mensuales", "Incidentes_Mensuales"),
+    ("Híbrido", "Zero Trust", "Incidentes mensuales", "Incidentes_Mensuales"),
+    ("Perimetral", "Zero Trust", "Tiempo detección (min)", "Tiempo_Detección_min"),
+    ("Perimetral", "Híbrido", "Tasa de bloqueo (%)", "Tasa_Bloqueo_%"),
+    ("Perimetral", "Zero Trust", "Tasa de bloqueo (%)", "Tasa_Bloqueo_%")
+]
+
+@en_cache
+def generar_tabla11(contexto=None, correccion=None, permutaciones=None, semilla=None):
     """Tabla 11: Comparaciones pareadas con Mann-Whitney U"""
-    df = cargar_datos_originales()
-    
-    # Comparaciones relevantes
-    comparaciones = [
-        ("Perimetral vs Híbrido", "Perimetral", "Híbrido", "Incidentes mensuales", "Incidentes_Mensuales"),
-        ("Perimetral vs Zero Trust", "Perimetral", "Zero Trust", "Incidentes mensuales", "Incidentes_Mensuales"),
-        ("Híbrido vs Zero Trust", "Híbrido", "Zero Trust", "Incidentes mensuales", "Incidentes_Mensuales"),
-        ("Perimetral vs Zero Trust", "Perimetral", "Zero Trust", "Tiempo detección (min)", "Tiempo_Detección_min"),
-        ("Perimetral vs Híbrido", "Perimetral", "Híbrido", "Tasa de bloqueo (%)", "Tasa_Bloqueo_%"),
-        ("Perimetral vs Zero Trust", "Perimetral", "Zero Trust", "Tasa de bloqueo (%)", "Tasa_Bloqueo_%")
-    ]
+    ctx = obtener_contexto(contexto)
+    columnas = [columna for _, columna in VARIABLES_TABLA10]
+    
+    # Todos los pares × todas las variables de la Tabla 10; la tabla es una vista filtrada
+    pares = mann_whitney_pares(ctx, columnas, correccion=correccion or 'holm')
+    pares = pares.set_index(['Grupo 1', 'Grupo 2', 'Métrica'])
+    
+    # Valor p por permutación (opcional)
+    if permutaciones:
+        pares['p_permutacion'] = permutacion_mann_whitney(
+            ctx, columnas, permutaciones=permutaciones, semilla=semilla
+        ).set_index(['Grupo 1', 'Grupo 2', 'Métrica'])['p_permutacion']
+    medias = medias_por_grupo(ctx, columnas)
     
     resultados = []
     
-    for nombre_comp, modelo1, modelo2, nombre_var, columna in comparaciones:
-        # Extraer datos
-        grupo1 = df[df['Modelo_Seguridad'] == modelo1][columna].dropna().values
-        grupo2 = df[df['Modelo_Seguridad'] == modelo2][columna].dropna().values
+    for modelo1, modelo2, nombre_var, columna in COMPARACIONES_TABLA11:
+        prueba = pares.loc[(modelo1, modelo2, columna)]
+        
+        if prueba['n1'] == 0 or prueba['n2'] == 0:
+            continue
+        
+        u_stat = prueba['U']
+        p_valor = prueba['p_ajustado'] if correccion else prueba['p']
+        media1, media2 = medias.loc[modelo1, columna], medias.loc[modelo2, columna]
+        
+        # Determinar dirección del efecto
+        if "Incidentes" in nombre_var or "Tiempo" in nombre_var:
+            # Menor es mejor
+            if media1 < media2:
+                direccion = f"{modelo1} < {modelo2}"
+            else:
+                direccion = f"{modelo2} < {modelo1}"
+        else:
+            # Mayor es mejor (tasa de bloqueo)
+            if media1 > media2:
+                direccion = f"{modelo1} > {modelo2}"
+            else:
+                direccion = f"{modelo2} > {modelo1}"
         
-        if len(grupo1) > 0 and len(grupo2) > 0:
-            try:
-                # Calcular Mann-Whitney U exacto
-                u_stat, p_valor = mannwhitneyu(grupo1, grupo2, alternative='two-sided')
-                
-                # Calcular medias
-                media1 = np.mean(grupo1)
-                media2 = np.mean(grupo2)
-                
-                # Determinar dirección del efecto
-                if "Incidentes" in nombre_var or "Tiempo" in nombre_var:
-                    # Menor es mejor
-                    if media1 < media2:
-                        direccion = f"{modelo1} < {modelo2}"
-                    else:
-                        direccion = f"{modelo2} < {modelo1}"
-                else:
-                    # Mayor es mejor (tasa de bloqueo)
-                    if media1 > media2:
-                        direccion = f"{modelo1} > {modelo2}"
-                    else:
-                        direccion = f"{modelo2} > {modelo1}"
-                
-                # Determinar significancia
-                if p_valor < 0.001:
-                    significancia = "***"
-                    interpretacion = f"Diferencia altamente significativa ({direccion})"
-                elif p_valor < 0.01:
-                    significancia = "**"
-                    interpretacion = f"Diferencia muy significativa ({direccion})"
-                elif p_valor < 0.05:
-                    significancia = "*"
-                    interpretacion = f"Diferencia significativa ({direccion})"
-                else:
-                    significancia = "ns"
-                    interpretacion = f"Sin diferencia significativa"
-                
-                resultados.append({
-                    'Comparación': nombre_comp,
-                    'Variable': nombre_var,
-                    'U de Mann': f"{u_stat:.6f}",
-                    'p valor': f"{p_valor:.6f}",
-                    'Significancia': significancia,
-                    'Interpretación': interpretacion
-                })
-                
-            except Exception as e:
-                resultados.append({
-                    'Comparación': nombre_comp,
-                    'Variable': nombre_var,
-                    'U de Mann': "Error",
-                    'p valor': "Error",
-                    'Significancia': "Error",
-                    'Interpretación': f"Error en cálculo: {str(e)}"
-                })
+        # Determinar significancia
+        if p_valor < 0.001:
+            significancia = "***"
+            interpretacion = f"Diferencia altamente significativa ({direccion})"
+        elif p_valor < 0.01:
+            significancia = "**"
+            interpretacion = f"Diferencia muy significativa ({direccion})"
+        elif p_valor < 0.05:
+            significancia = "*"
+            interpretacion = f"Diferencia significativa ({direccion})"
+        else:
+            significancia = "ns"
+            interpretacion = f"Sin diferencia significativa"
+        
+        fila = {
+            'Comparación': f"{modelo1} vs {modelo2}",
+            'Variable': nombre_var,
+            'U de Mann': f"{u_stat:.6f}",
+            'p valor': f"{prueba['p']:.6f}",
+        }
+        if correccion:
+            fila[f'p ajustado ({correccion})'] = f"{prueba['p_ajustado']:.6f}"
+        if permutaciones:
+            fila['p permutación'] = f"{prueba['p_permutacion']:.6f}"
+        fila['Significancia'] = significancia
+        fila['Interpretación'] = interpretacion
+        resultados.append(fila)
     
     return pd.DataFrame(resultados)
 
@@ -459,34 +526,10 @@ def generar_tabla11():
 # TABLA 12: CORRELACIONES DE SPEARMAN (CÁLCULO EXACTO)
 # ============================================================================
 
-def generar_tabla12():
+@en_cache
+def generar_tabla12(contexto=None):
     """Tabla 12: Correlaciones de Spearman con cálculos exactos"""
-    df = cargar_datos_originales()
-    
-    # Seleccionar variables relevantes para correlación
-    variables_corr = [
-        'Años_Implementación',
-        'Nivel_Madurez_Num',  # Necesitamos convertir a numérico
-        'Tasa_Bloqueo_%',
-        'Tiempo_Detección_min',
-        'Percepción_1_5',
-        'Capacitación_1_5',
-        'Especialistas',
-        'Tiempo_Respuesta_min'
-    ]
-    
-    # Crear dataframe para correlaciones
-    df_corr = df.copy()
-    
-    # Convertir nivel de madurez a numérico
-    madurez_map = {'Bajo': 1, 'Medio': 2, 'Alto': 3}
-    df_corr['Nivel_Madurez_Num'] = df_corr['Nivel_Madurez'].map(madurez_map)
-    
-    # Convertir frecuencia de simulacros a numérico
-    frecuencia_map = {'Anual': 1, 'Semestral': 2, 'Trimestral': 4, 'Mensual': 12}
-    df_corr['Frecuencia_Num'] = df_corr['Frecuencia_Simulacros'].map(frecuencia_map)
-    
-    # Seleccionar columnas numéricas
+    # Seleccionar columnas numéricas (las ordinales se codifican en el motor)
     columnas_numericas = [
         'Años_Implementación',
         'Nivel_Madurez_Num',
@@ -499,8 +542,9 @@ def generar_tabla12():
         'Frecuencia_Num'
     ]
     
-    # Calcular matriz de correlación de Spearman
-    corr_matrix = df_corr[columnas_numericas].corr(method='spearman')
+    # Submatriz de Spearman de la matriz compartida con el Gráfico 7
+    correlaciones = correlaciones_spearman(contexto)
+    corr_matrix = seleccionar_correlaciones(correlaciones, columnas_numericas)['rho']
     
     # Crear tabla formateada
     nombres_amigables = {
@@ -521,68 +565,214 @@ def generar_tabla12():
         columns=nombres_amigables
     )
     
-    # Formatear valores
-    corr_formatted = corr_matrix_renamed.copy()
-    for col in corr_formatted.columns:
-        corr_formatted[col] = corr_formatted[col].apply(lambda x: f"{x:.6f}" if pd.notnull(x) else "N/A")
+    # Formatear valores (una pasada por columna)
+    corr_formatted = pd.DataFrame(
+        {col: formatear_columna(corr_matrix_renamed[col], decimales=6, faltante="N/A")
+         for col in corr_matrix_renamed.columns},
+        index=corr_matrix_renamed.index
+    )
     
     # Resetear índice para mostrar como tabla
     tabla12 = corr_formatted.reset_index().rename(columns={'index': 'Variable'})
     
     return tabla12
 
+# Funciones de todas las tablas del capítulo, en orden de presentación
+FUNCIONES_TABLAS = {
+    'tabla3': generar_tabla3,
+    'tabla6': generar_tabla6,
+    'tabla7': generar_tabla7,
+    'tabla8': generar_tabla8,
+    'tabla9': generar_tabla9,
+    'tabla10': generar_tabla10,
+    'tabla11': generar_tabla11,
+    'tabla12': generar_tabla12
+}
+
+# Títulos de las tablas tal como aparecen en el capítulo
+TITULOS_TABLAS = {
+    'tabla3': "Tabla 3: Características generales de las entidades evaluadas",
+    'tabla6': "Tabla 6: Distribución de modelos de seguridad en las entidades públicas",
+    'tabla7': "Tabla 7: Nivel de madurez del modelo de seguridad según años de implementación",
+    'tabla8': "Tabla 8: Desempeño promedio de los modelos de seguridad",
+    'tabla9': "Tabla 9: Indicadores de percepción y capacitación del personal",
+    'tabla10': "Tabla 10: Prueba de Kruskal–Wallis para métricas de desempeño",
+    'tabla11': "Tabla 11: Comparaciones pareadas entre modelos de seguridad",
+    'tabla12': "Tabla 12: Correlaciones de Spearman entre variables organizacionales y técnicas"
+}
+
 # ============================================================================
 # FUNCIONES DE EXPORTACIÓN
 # ============================================================================
 
-def crear_carpetas_exportacion():
+def crear_carpetas_exportacion(directorio=DIRECTORIO_EXPORTACION):
     """Crea las carpetas necesarias para exportación"""
-    carpetas = ['exportacion_capitulo_iv', 
-                'exportacion_capitulo_iv/tablas',
-                'exportacion_capitulo_iv/graficos',
-                'exportacion_capitulo_iv/dataset']
+    carpetas = [directorio, 
+                os.path.join(directorio, 'tablas'),
+                os.path.join(directorio, 'graficos'),
+                os.path.join(directorio, 'dataset')]
     
     for carpeta in carpetas:
         if not os.path.exists(carpeta):
-            os.makedirs(carpeta)
-
-def guardar_todas_tablas():
-    """Guarda todas las tablas en formato Markdown y CSV"""
-    crear_carpetas_exportacion()
-    
-    # Diccionario de tablas
-    tablas = {
-        'tabla3': generar_tabla3(),
-        'tabla6': generar_tabla6(),
-        'tabla7': generar_tabla7(),
-        'tabla8': generar_tabla8(),
-        'tabla9': generar_tabla9(),
-        'tabla10': generar_tabla10(),
-        'tabla11': generar_tabla11(),
-        'tabla12': generar_tabla12()
-    }
+            os.makedirs(carpeta, exist_ok=True)
+
+def _escribir_texto(ruta, contenido, encoding='utf-8'):
+    with escritura_atomica(ruta) as temporal:
+        with open(temporal, 'w', encoding=encoding, newline='') as f:
+            f.write(contenido)
+
+def exportar_tabla(nombre, tabla, directorio=DIRECTORIO_EXPORTACION, formatos=FORMATOS_TABLAS):
+    """Guarda una tabla en los formatos pedidos (Markdown, CSV, LaTeX, HTML, Excel); retorna las rutas"""
+    desconocidos = [f for f in formatos if f not in FORMATOS_TABLAS]
+    if desconocidos:
+        raise ValueError(f"Formatos de tabla no soportados: {desconocidos} (use {FORMATOS_TABLAS})")
+    
+    base = os.path.join(directorio, 'tablas', nombre)
+    rutas = []
+    
+    # Celdas formateadas una sola vez para todos los formatos de texto
+    formateada = TablaFormateada(tabla)
+    
+    # Guardar como Markdown
+    if 'md' in formatos:
+        _escribir_texto(f'{base}.md',
+                        f"# {nombre.upper().replace('TABLA', 'TABLA ')}\n\n"
+                        f"{formateada.markdown()}"
+                        f"\n\n*Nota: Cálculos exactos basados en el dataset original (n=20).*\n"
+                        f"*Fecha de generación: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}*\n")
+        rutas.append(f'{base}.md')
+    
+    # Guardar como CSV, LaTeX (tabular) y HTML
+    if 'csv' in formatos:
+        _escribir_texto(f'{base}.csv', formateada.csv(), encoding='utf-8-sig')
+        rutas.append(f'{base}.csv')
+    if 'tex' in formatos:
+        _escribir_texto(f'{base}.tex', formateada.latex() + '\n')
+        rutas.append(f'{base}.tex')
+    if 'html' in formatos:
+        _escribir_texto(f'{base}.html', formateada.html() + '\n')
+        rutas.append(f'{base}.html')
+    
+    # Guardar como Excel (valores originales)
+    if 'xlsx' in formatos:
+        with escritura_atomica(f'{base}.xlsx') as temporal:
+            tabla.to_excel(temporal, index=False)
+        rutas.append(f'{base}.xlsx')
+    
+    return rutas
+
+def exportar_dataset(df, directorio=DIRECTORIO_EXPORTACION):
+    """Guarda el dataset completo en Excel y CSV; retorna las rutas escritas"""
+    base = os.path.join(directorio, 'dataset', 'dataset_completo')
+    # Excel en modo de solo escritura: memoria constante aun con millones de filas
+    with escritura_atomica(f'{base}.xlsx') as temporal:
+        escribir_libro_excel({'dataset': df}, temporal)
+    with escritura_atomica(f'{base}.csv') as temporal:
+        df.to_csv(temporal, index=False, encoding='utf-8-sig')
+    return [f'{base}.xlsx', f'{base}.csv']
+
+# ============================================================================
+# LIBRO DE EXCEL ÚNICO (MODO DE SOLO ESCRITURA)
+# ============================================================================
+
+NOMBRE_LIBRO_EXCEL = 'capitulo_iv.xlsx'
+FILAS_MAXIMAS_HOJA = 1_048_576  # Límite de Excel, incluido el encabezado
+FILAS_BLOQUE_EXCEL = 50_000     # Filas convertidas a la vez antes de escribirlas
+
+def _filas_excel(df):
+    """Genera las filas del DataFrame como tuplas de Python (NaN/NaT → celda vacía)"""
+    for inicio in range(0, len(df), FILAS_BLOQUE_EXCEL):
+        bloque = df.iloc[inicio:inicio + FILAS_BLOQUE_EXCEL].astype(object)
+        bloque = bloque.where(bloque.notna(), None)
+        yield from bloque.itertuples(index=False, name=None)
+
+def _escribir_hojas(libro, titulo, df):
+    """Escribe el DataFrame en una o más hojas (titulo, titulo_2, ...) respetando el límite de filas"""
+    encabezado = [str(columna) for columna in df.columns]
+    filas_por_hoja = FILAS_MAXIMAS_HOJA - 1
+    hojas = []
+    
+    for parte, inicio in enumerate(range(0, max(len(df), 1), filas_por_hoja), start=1):
+        # Excel limita los nombres de hoja a 31 caracteres
+        nombre = titulo[:31] if parte == 1 else f"{titulo[:31 - len(str(parte)) - 1]}_{parte}"
+        hoja = libro.create_sheet(nombre)
+        hoja.append(encabezado)
+        for fila in _filas_excel(df.iloc[inicio:inicio + filas_por_hoja]):
+            hoja.append(fila)
+        hojas.append(nombre)
+    
+    return hojas
+
+def escribir_libro_excel(hojas, ruta):
+    """Escribe {título: DataFrame} en un solo libro con openpyxl en modo de solo escritura"""
+    from openpyxl import Workbook
+    
+    # Las filas se vuelcan a disco a medida que se agregan (sin cargar el libro en memoria)
+    libro = Workbook(write_only=True)
+    nombres = []
+    for titulo, df in hojas.items():
+        nombres.extend(_escribir_hojas(libro, titulo, df))
+    libro.save(ruta)
+    return nombres
+
+def exportar_libro_excel(tablas, df=None, directorio=DIRECTORIO_EXPORTACION):
+    """Guarda todas las tablas (una hoja por tabla) y el dataset en un solo libro; retorna la ruta"""
+    hojas = dict(tablas)
+    if df is not None:
+        hojas['dataset'] = df
+    
+    ruta = os.path.join(directorio, NOMBRE_LIBRO_EXCEL)
+    with escritura_atomica(ruta) as temporal:
+        escribir_libro_excel(hojas, temporal)
+    return [ruta]
+
+def guardar_todas_tablas(contexto=None, directorio=DIRECTORIO_EXPORTACION, forzar=False, libro=True,
+                         formatos=FORMATOS_TABLAS):
+    """Guarda las tablas y el dataset que cambiaron desde la última exportación (todo si forzar)
+
+    Con libro=True también escribe el libro único de Excel con una hoja por tabla y el dataset
+    """
+    crear_carpetas_exportacion(directorio)
+    
+    # Dataset cargado una sola vez para todas las tablas
+    ctx = obtener_contexto(contexto)
+    manifiesto = Manifiesto(directorio)
+    
+    # Solo se calculan y escriben los artefactos cuya huella cambió
+    tablas = {}
+    for nombre, funcion in FUNCIONES_TABLAS.items():
+        huella = huella_artefacto(ctx, nombre, formatos=tuple(formatos))
+        if not forzar and manifiesto.vigente(nombre, huella):
+            continue
+        tablas[nombre] = funcion(ctx)
+        manifiesto.registrar(nombre, huella, exportar_tabla(nombre, tablas[nombre], directorio, formatos))
     
     # También guardar dataset completo
-    df_completo = cargar_datos_originales()
-    df_completo.to_excel('exportacion_capitulo_iv/dataset/dataset_completo.xlsx', index=False)
-    df_completo.to_csv('exportacion_capitulo_iv/dataset/dataset_completo.csv', index=False, encoding='utf-8-sig')
-    
-    for nombre, tabla in tablas.items():
-        # Guardar como Markdown
-        with open(f'exportacion_capitulo_iv/tablas/{nombre}.md', 'w', encoding='utf-8') as f:
-            f.write(f"# {nombre.upper().replace('TABLA', 'TABLA ')}\n\n")
-            f.write(tabla.to_markdown(index=False))
-            f.write(f"\n\n*Nota: Cálculos exactos basados en el dataset original (n=20).*\n")
-            f.write(f"*Fecha de generación: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}*\n")
-        
-        # Guardar como CSV
-        tabla.to_csv(f'exportacion_capitulo_iv/tablas/{nombre}.csv', index=False, encoding='utf-8-sig')
-        
-        # Guardar como Excel
-        tabla.to_excel(f'exportacion_capitulo_iv/tablas/{nombre}.xlsx', index=False)
-    
-    print(f"✅ {len(tablas)} tablas guardadas en 'exportacion_capitulo_iv/tablas/'")
-    print(f"✅ Dataset completo guardado en 'exportacion_capitulo_iv/dataset/'")
+    huella = huella_artefacto(ctx, 'dataset')
+    dataset_guardado = forzar or not manifiesto.vigente('dataset', huella)
+    if dataset_guardado:
+        manifiesto.registrar('dataset', huella, exportar_dataset(ctx.df, directorio))
+    
+    # Libro único: necesita todas las tablas, incluidas las que no cambiaron
+    huella = huella_artefacto(ctx, 'libro_excel')
+    libro_guardado = libro and (forzar or not manifiesto.vigente('libro_excel', huella))
+    if libro_guardado:
+        todas = {nombre: tablas[nombre] if nombre in tablas else funcion(ctx)
+                 for nombre, funcion in FUNCIONES_TABLAS.items()}
+        manifiesto.registrar('libro_excel', huella, exportar_libro_excel(todas, ctx.df, directorio))
+    
+    # Tablas que ya no existen (p. ej. renombradas): se eliminan sus archivos
+    manifiesto.podar(FUNCIONES_TABLAS, prefijo='tabla')
+    manifiesto.guardar()
+    
+    print(f"✅ {len(tablas)} tablas guardadas en '{os.path.join(directorio, 'tablas')}/' "
+          f"({len(FUNCIONES_TABLAS) - len(tablas)} sin cambios)")
+    if dataset_guardado:
+        print(f"✅ Dataset completo guardado en '{os.path.join(directorio, 'dataset')}/'")
+    else:
+        print("✅ Dataset completo sin cambios")
+    if libro_guardado:
+        print(f"✅ Libro único guardado en '{os.path.join(directorio, NOMBRE_LIBRO_EXCEL)}'")
     
     return True
 
@@ -590,9 +780,14 @@ def guardar_todas_tablas():
 # FUNCIÓN DE VERIFICACIÓN DE CÁLCULOS
 # ============================================================================
 
-def verificar_todos_calculos():
+@en_cache
+def verificar_todos_calculos(contexto=None):
     """Verifica y muestra todos los cálculos exactos"""
-    df = cargar_datos_originales()
+    ctx = obtener_contexto(contexto)
+    df = ctx.columnas([
+        'Modelo_Seguridad', 'Percepción_1_5', 'Capacitación_1_5', 'Incidentes_Mensuales'
+    ])
+    indice = ctx.indice('Modelo_Seguridad')
     
     resultado = "=" * 80 + "\n"
     resultado += "VERIFICACIÓN DE CÁLCULOS - CAPÍTULO IV\n"
@@ -615,7 +810,7 @@ def verificar_todos_calculos():
     
     modelos = ['Perimetral', 'Híbrido', 'Zero Trust']
     for modelo in modelos:
-        subset = df[df['Modelo_Seguridad'] == modelo]
+        subset = df.take(indice.posiciones(modelo))
         if len(subset) > 0:
             percepcion = subset['Percepción_1_5'].mean()
             capacitacion = subset['Capacitación_1_5'].mean()
@@ -641,9 +836,7 @@ def verificar_todos_calculos():
     resultado += "3. TABLA 10 - KRUSKAL-WALLIS (INCIDENTES):\n"
     resultado += "-" * 40 + "\n"
     
-    perimetral_inc = df[df['Modelo_Seguridad'] == 'Perimetral']['Incidentes_Mensuales'].values
-    hibrido_inc = df[df['Modelo_Seguridad'] == 'Híbrido']['Incidentes_Mensuales'].values
-    zerotrust_inc = df[df['Modelo_Seguridad'] == 'Zero Trust']['Incidentes_Mensuales'].values
+    perimetral_inc, hibrido_inc, zerotrust_inc = indice.dividir(df['Incidentes_Mensuales'])
     
     try:
         h_stat, p_valor = kruskal(perimetral_inc, hibrido_inc, zerotrust_inc)
@@ -679,41 +872,41 @@ def verificar_todos_calculos():
     return resultado
 
 # ============================================================================
-# EJECUCIÓN PRINCIPAL
+# ANÁLISIS COMPLETO
 # ============================================================================
 
-if __name__ == "__main__":
-    print("=" * 80)
-    print("ANÁLISIS ESTADÍSTICO - CAPÍTULO IV")
-    print("=" * 80)
+def ejecutar_analisis_completo(contexto=None, directorio=DIRECTORIO_EXPORTACION):
+    """Muestra todas las tablas y la verificación, y guarda las tablas"""
     print("\nGenerando todas las tablas con cálculos exactos...\n")
     
-    # Generar y mostrar todas las tablas
-    tablas_funciones = [
-        ("Tabla 3", generar_tabla3),
-        ("Tabla 6", generar_tabla6),
-        ("Tabla 7", generar_tabla7),
-        ("Tabla 8", generar_tabla8),
-        ("Tabla 9", generar_tabla9),
-        ("Tabla 10", generar_tabla10),
-        ("Tabla 11", generar_tabla11),
-        ("Tabla 12", generar_tabla12)
-    ]
+    # Dataset compartido por todas las tablas
+    ctx = obtener_contexto(contexto)
     
-    for nombre, funcion in tablas_funciones:
-        print(f"\n{nombre}:")
+    # Generar y mostrar todas las tablas
+    for nombre, funcion in FUNCIONES_TABLAS.items():
+        print(f"\n{TITULOS_TABLAS[nombre].split(':')[0]}:")
         print("-" * 50)
-        tabla = funcion()
-        print(tabla.to_string(index=False, float_format=lambda x: f"{x:.6f}" if isinstance(x, float) else str(x)))
+        tabla = funcion(ctx)
+        print(TablaFormateada(tabla, decimales=6).texto())
     
     # Verificar cálculos
     print("\n" + "=" * 80)
     print("VERIFICANDO CÁLCULOS...")
     print("=" * 80)
-    print(verificar_todos_calculos())
+    print(verificar_todos_calculos(ctx))
     
     # Guardar todas las tablas
-    guardar_todas_tablas()
+    guardar_todas_tablas(ctx, directorio)
     
     print("\n✅ Análisis completado exitosamente!")
-    print("📁 Tablas guardadas en: 'exportacion_capitulo_iv/tablas/'")
\ No newline at end of file
+    print(f"📁 Tablas guardadas en: '{os.path.join(directorio, 'tablas')}/'")
+
+# ============================================================================
+# EJECUCIÓN PRINCIPAL
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("ANÁLISIS ESTADÍSTICO - CAPÍTULO IV")
+    print("=" * 80)
+    ejecutar_analisis_completo()
@@ -0,0 +1,90 @@
+# arranque.py
+"""
+ARRANQUE DIFERIDO E INFORME DEL TIEMPO DE INICIO
+La ventana se muestra sin importar pandas, SciPy, matplotlib ni seaborn: esos
+módulos se precargan después en segundo plano (o se importan al primer uso).
+El informe registra cuánto tardó cada etapa del arranque y cada importación
+diferida, para seguir el arranque en frío en los terminales ligeros
+"""
+
+import csv
+import importlib
+import os
+import platform
+import sys
+import time
+
+# Referencia de tiempo: main.py importa este módulo antes que cualquier otro
+INICIO = time.perf_counter()
+
+# Módulos pesados que la interfaz precarga en segundo plano, en este orden
+MODULOS_PRECARGA = ('numpy', 'pandas', 'contexto_datos', 'scipy.stats', 'analisis_estadistico',
+                    'renderizado_tablas', 'matplotlib.pyplot', 'seaborn', 'graficos_completos')
+
+# Módulos del proceso aislado (Agg) que rasteriza los gráficos
+MODULOS_PRECARGA_GRAFICOS = ('graficos_completos', 'salida_figuras')
+
+# Si está definida, cada informe se agrega como filas a este CSV
+VARIABLE_REGISTRO = 'TESIS_REGISTRO_ARRANQUE'
+
+def importar_modulos(modulos):
+    """Importa los módulos que falten; retorna {módulo: segundos} (0 si ya estaba cargado)"""
+    tiempos = {}
+    for modulo in modulos:
+        if modulo in sys.modules:
+            tiempos[modulo] = 0.0
+            continue
+        inicio = time.perf_counter()
+        importlib.import_module(modulo)
+        tiempos[modulo] = time.perf_counter() - inicio
+    return tiempos
+
+
+class InformeArranque:
+    """Etapas del arranque (segundos desde INICIO) e importaciones diferidas por proceso"""
+
+    def __init__(self):
+        self.etapas = {}
+        self.importaciones = {}
+
+    def marcar(self, etapa):
+        self.etapas[etapa] = time.perf_counter() - INICIO
+
+    def agregar_importaciones(self, tiempos, proceso='interfaz'):
+        for modulo, segundos in tiempos.items():
+            self.importaciones[(proceso, modulo)] = segundos
+
+    def texto(self):
+        lineas = ["⏱️ INFORME DE ARRANQUE"]
+        lineas += [f"  • {etapa}: {segundos:.2f} s" for etapa, segundos in self.etapas.items()]
+        if self.importaciones:
+            lineas.append("  Importaciones diferidas:")
+            lineas += [f"  • [{proceso}] {modulo}: {segundos:.2f} s"
+                       for (proceso, modulo), segundos in self.importaciones.items() if segundos > 0]
+        return '\n'.join(lineas)
+
+    def guardar(self, ruta):
+        """Agrega el informe al CSV (formato largo: una fila por etapa o importación)"""
+        fecha = time.strftime('%Y-%m-%d %H:%M:%S')
+        equipo = platform.node()
+        filas = [(fecha, equipo, 'etapa', etapa, f'{segundos:.4f}')
+                 for etapa, segundos in self.etapas.items()]
+        filas += [(fecha, equipo, f'importacion_{proceso}', modulo, f'{segundos:.4f}')
+                  for (proceso, modulo), segundos in self.importaciones.items()]
+
+        nuevo = not os.path.exists(ruta)
+        with open(ruta, 'a', newline='', encoding='utf-8') as archivo:
+            escritor = csv.writer(archivo)
+            if nuevo:
+                escritor.writerow(['fecha', 'equipo', 'tipo', 'nombre', 'segundos'])
+            escritor.writerows(filas)
+
+    def publicar(self):
+        """Imprime el informe y, si se configuró TESIS_REGISTRO_ARRANQUE, lo agrega al CSV"""
+        print(self.texto())
+        ruta = os.environ.get(VARIABLE_REGISTRO)
+        if ruta:
+            try:
+                self.guardar(ruta)
+            except OSError as e:
+                print(f"⚠️ No se pudo guardar el informe de arranque: {e}")
@@ -0,0 +1,122 @@
+# cache_figuras.py
+"""
+CACHÉ DE FIGURAS DE LA INTERFAZ (LRU)
+Conserva los últimos K gráficos mostrados (mapa de bits y figura serializada)
+para volver a mostrarlos al instante. Al descartar uno se cierra su figura en
+pyplot, así el número de figuras abiertas y la memoria quedan acotados aunque
+la sesión dure todo el día
+"""
+
+import os
+import pickle
+import sys
+from collections import OrderedDict
+
+# Menos que los ocho gráficos del capítulo: recorrerlos todos ya descarta los más antiguos
+CAPACIDAD_POR_DEFECTO = 4
+# Si está definida, fija la capacidad de la caché de la interfaz
+VARIABLE_CAPACIDAD = 'TESIS_CACHE_GRAFICOS'
+
+def capacidad_configurada():
+    """Capacidad de TESIS_CACHE_GRAFICOS (entero ≥ 1) o la capacidad por defecto"""
+    valor = os.environ.get(VARIABLE_CAPACIDAD, '')
+    try:
+        return max(1, int(valor)) if valor else CAPACIDAD_POR_DEFECTO
+    except ValueError:
+        print(f"⚠️ {VARIABLE_CAPACIDAD}={valor!r} no es un entero; se usa {CAPACIDAD_POR_DEFECTO}")
+        return CAPACIDAD_POR_DEFECTO
+
+def memoria_figura(fig):
+    """Memoria estimada del lienzo de una figura (RGBA a su resolución actual)"""
+    ancho, alto = fig.get_size_inches() * fig.dpi
+    return int(ancho * alto * 4)
+
+
+class EntradaFigura:
+    """Gráfico en caché: PNG para pantalla y figura serializada, deserializada solo si se necesita"""
+
+    def __init__(self, png, serializada):
+        self.png = png
+        self.serializada = serializada
+        self.figura = None
+
+    def obtener_figura(self):
+        if self.figura is None:
+            self.figura = pickle.loads(self.serializada)
+        return self.figura
+
+    def cerrar(self):
+        """Cierra la figura en pyplot (se puede volver a deserializar)"""
+        if self.figura is not None:
+            import matplotlib.pyplot as plt
+            plt.close(self.figura)
+            self.figura = None
+
+    def memoria(self):
+        memoria = len(self.png) + len(self.serializada)
+        if self.figura is not None:
+            memoria += memoria_figura(self.figura)
+        return memoria
+
+
+class CacheFiguras:
+    """Últimos `capacidad` gráficos mostrados; el menos usado recientemente se descarta y se cierra"""
+
+    def __init__(self, capacidad=None):
+        if capacidad is None:
+            capacidad = capacidad_configurada()
+        if capacidad < 1:
+            raise ValueError("La capacidad de la caché de figuras debe ser al menos 1")
+        self.capacidad = capacidad
+        self._entradas = OrderedDict()
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __contains__(self, clave):
+        return clave in self._entradas
+
+    def obtener(self, clave):
+        """Entrada de la clave (None si no está) y la marca como la más reciente"""
+        entrada = self._entradas.get(clave)
+        if entrada is not None:
+            self._entradas.move_to_end(clave)
+        return entrada
+
+    def guardar(self, clave, png, serializada):
+        """Agrega (o reemplaza) un gráfico y descarta los más antiguos si se supera la capacidad"""
+        self.descartar(clave)
+        entrada = self._entradas[clave] = EntradaFigura(png, serializada)
+        while len(self._entradas) > self.capacidad:
+            _, antigua = self._entradas.popitem(last=False)
+            antigua.cerrar()
+        return entrada
+
+    def descartar(self, clave):
+        entrada = self._entradas.pop(clave, None)
+        if entrada is not None:
+            entrada.cerrar()
+
+    def limpiar(self):
+        """Cierra todas las figuras y vacía la caché"""
+        for entrada in self._entradas.values():
+            entrada.cerrar()
+        self._entradas.clear()
+
+    def estadisticas(self):
+        """Entradas, figuras abiertas (en la caché y en todo pyplot) y memoria estimada en bytes"""
+        # pyplot se consulta solo si ya se importó (mostrar mapas de bits no lo necesita)
+        pyplot = sys.modules.get('matplotlib.pyplot')
+        return {
+            'entradas': len(self._entradas),
+            'capacidad': self.capacidad,
+            'figuras_cache': sum(entrada.figura is not None for entrada in self._entradas.values()),
+            'figuras_pyplot': len(pyplot.get_fignums()) if pyplot is not None else 0,
+            'memoria': sum(entrada.memoria() for entrada in self._entradas.values()),
+        }
+
+    def resumen(self):
+        e = self.estadisticas()
+        return (f"🧠 Caché de gráficos: {e['entradas']}/{e['capacidad']} · "
+                f"figuras abiertas: {e['figuras_cache']} (pyplot: {e['figuras_pyplot']}) · "
+                f"memoria estimada: {e['memoria'] / 2**20:.1f} MB")
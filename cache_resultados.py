@@ -0,0 +1,191 @@
+# cache_resultados.py
+"""
+CACHÉ PERSISTENTE DE RESULTADOS
+Resultados de tablas y verificaciones guardados en disco, direccionados por
+hash de (contenido del dataset, función, parámetros, versión del código)
+"""
+
+import functools
+import glob
+import hashlib
+import inspect
+import os
+import pickle
+import zlib
+from contexto_datos import obtener_contexto
+
+DIRECTORIO_MODULOS = os.path.dirname(os.path.abspath(__file__))
+
+# Configuración por defecto (modificable con configurar_cache o variables de entorno)
+DIRECTORIO_CACHE = os.environ.get(
+    'TESIS_CACHE_DIR', os.path.join(DIRECTORIO_MODULOS, '.cache_resultados')
+)
+TAMANO_MAXIMO_CACHE = 256 * 1024 * 1024  # bytes
+EXTENSION_CACHE = '.pkz'
+
+_configuracion = {
+    'directorio': DIRECTORIO_CACHE,
+    'tamano_maximo': TAMANO_MAXIMO_CACHE,
+    'habilitado': os.environ.get('TESIS_SIN_CACHE', '') == '',
+}
+
+# Parámetros que vuelven aleatorio un resultado cuando no se fija la semilla
+PARAMETROS_ALEATORIOS = ('permutaciones', 'bootstrap')
+
+def configurar_cache(directorio=None, tamano_maximo=None, habilitado=None):
+    """Cambia el directorio, el tamaño máximo (bytes) o activa/desactiva la caché
+
+    El directorio y la activación se copian también a las variables de entorno:
+    los procesos 'spawn' (pipeline, lotes, gráficos) vuelven a importar este
+    módulo y solo ven la configuración a través del entorno
+    """
+    if directorio is not None:
+        _configuracion['directorio'] = directorio
+        os.environ['TESIS_CACHE_DIR'] = directorio
+    if tamano_maximo is not None:
+        _configuracion['tamano_maximo'] = tamano_maximo
+    if habilitado is not None:
+        _configuracion['habilitado'] = habilitado
+        if habilitado:
+            os.environ.pop('TESIS_SIN_CACHE', None)
+        else:
+            os.environ['TESIS_SIN_CACHE'] = '1'
+    return dict(_configuracion)
+
+def limpiar_cache():
+    """Elimina todas las entradas de la caché"""
+    eliminadas = 0
+    for ruta in _entradas():
+        try:
+            os.remove(ruta)
+            eliminadas += 1
+        except OSError:
+            pass
+    return eliminadas
+
+# ============================================================================
+# CLAVES
+# ============================================================================
+
+@functools.lru_cache(maxsize=1)
+def version_codigo():
+    """Hash del código fuente de los módulos del proyecto (cualquier cambio invalida la caché)"""
+    h = hashlib.sha256()
+    for ruta in sorted(glob.glob(os.path.join(DIRECTORIO_MODULOS, '*.py'))):
+        h.update(os.path.basename(ruta).encode('utf-8'))
+        with open(ruta, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+def clave_resultado(ctx, funcion, parametros):
+    """Clave SHA-256 de (versión del dataset, función, parámetros, versión del código)"""
+    h = hashlib.sha256()
+    for parte in (ctx.version, f"{funcion.__module__}.{funcion.__qualname__}",
+                  repr(sorted(parametros.items())), version_codigo()):
+        h.update(str(parte).encode('utf-8'))
+        h.update(b'\x1f')
+    return h.hexdigest()
+
+def _es_determinista(parametros):
+    """Los resultados con remuestreo solo se guardan si la semilla está fijada"""
+    aleatorio = any(parametros.get(nombre) for nombre in PARAMETROS_ALEATORIOS)
+    return not aleatorio or parametros.get('semilla') is not None
+
+# ============================================================================
+# ALMACENAMIENTO (PICKLE + ZLIB) CON DESALOJO LRU
+# ============================================================================
+
+def _ruta_entrada(clave):
+    return os.path.join(_configuracion['directorio'], clave + EXTENSION_CACHE)
+
+def _entradas():
+    return glob.glob(os.path.join(_configuracion['directorio'], '*' + EXTENSION_CACHE))
+
+def leer_resultado(clave):
+    """Retorna (encontrado, resultado); un acierto actualiza la fecha de uso (LRU)"""
+    ruta = _ruta_entrada(clave)
+    try:
+        with open(ruta, 'rb') as f:
+            resultado = pickle.loads(zlib.decompress(f.read()))
+    except FileNotFoundError:
+        return False, None
+    except Exception:
+        # Entrada dañada o incompatible: se descarta
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass
+        return False, None
+
+    try:
+        os.utime(ruta)
+    except OSError:
+        pass
+    return True, resultado
+
+def guardar_resultado(clave, resultado):
+    """Guarda el resultado comprimido (escritura atómica) y aplica el límite de tamaño"""
+    os.makedirs(_configuracion['directorio'], exist_ok=True)
+    datos = zlib.compress(pickle.dumps(resultado, protocol=pickle.HIGHEST_PROTOCOL), 6)
+
+    ruta = _ruta_entrada(clave)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, 'wb') as f:
+        f.write(datos)
+    os.replace(temporal, ruta)
+
+    _desalojar()
+
+def _desalojar():
+    """Elimina las entradas usadas hace más tiempo hasta respetar el tamaño máximo"""
+    entradas = []
+    for ruta in _entradas():
+        try:
+            info = os.stat(ruta)
+        except OSError:
+            continue
+        entradas.append((info.st_mtime_ns, info.st_size, ruta))
+
+    total = sum(tamano for _, tamano, _ in entradas)
+    for _, tamano, ruta in sorted(entradas):
+        if total <= _configuracion['tamano_maximo']:
+            break
+        try:
+            os.remove(ruta)
+            total -= tamano
+        except OSError:
+            pass
+
+# ============================================================================
+# DECORADOR
+# ============================================================================
+
+def en_cache(funcion):
+    """Decora una función f(contexto=None, ...) para leer/guardar su resultado en la caché"""
+    firma = inspect.signature(funcion)
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        argumentos = firma.bind(*args, **kwargs)
+        argumentos.apply_defaults()
+        parametros = dict(argumentos.arguments)
+        ctx = obtener_contexto(parametros.pop('contexto', None))
+
+        if not _configuracion['habilitado'] or not _es_determinista(parametros):
+            return funcion(ctx, **parametros)
+
+        clave = clave_resultado(ctx, funcion, parametros)
+        encontrado, resultado = leer_resultado(clave)
+        if encontrado:
+            return resultado
+
+        resultado = funcion(ctx, **parametros)
+        try:
+            guardar_resultado(clave, resultado)
+        except OSError:
+            # Sin permisos de escritura: se sigue sin caché
+            pass
+        return resultado
+
+    envoltura.sin_cache = funcion
+    return envoltura
@@ -0,0 +1,20 @@
+# catalogo.py
+"""
+CATÁLOGO DE SALIDAS
+Nombres de las tablas y gráficos del capítulo, formatos de exportación y
+directorio por defecto, sin importar pandas, SciPy ni matplotlib: la línea
+de comandos arma --help, --listar y la validación de argumentos solo con esto
+"""
+
+# Mismo orden que FUNCIONES_TABLAS (analisis_estadistico) y FUNCIONES_GRAFICOS (graficos_completos)
+NOMBRES_TABLAS = ('tabla3', 'tabla6', 'tabla7', 'tabla8', 'tabla9', 'tabla10', 'tabla11', 'tabla12')
+
+NOMBRES_GRAFICOS = ('1_incidentes', '2_tasa_bloqueo', '3_tiempos', '4_percepcion_capacitacion',
+                    '5_madurez', '6_especialistas', '7_correlaciones', '8_boxplot_completo')
+
+FORMATOS_TABLAS = ('md', 'csv', 'tex', 'html', 'xlsx')
+
+FORMATOS_GRAFICOS = ('png', 'pdf', 'svg', 'vista_previa')
+FORMATOS_GRAFICOS_POR_DEFECTO = ('png', 'pdf')
+
+DIRECTORIO_EXPORTACION = 'exportacion_capitulo_iv'
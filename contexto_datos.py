@@ -0,0 +1,165 @@
+# contexto_datos.py
+"""
+CONTEXTO DE DATOS COMPARTIDO
+Dataset cargado una sola vez y versionado por hash de contenido
+"""
+
+import hashlib
+import numpy as np
+import pandas as pd
+from fuentes_datos import abrir_fuente
+
+# Orden de presentación de las categorías usadas para agrupar
+ORDEN_CATEGORIAS = {
+    'Modelo_Seguridad': ['Perimetral', 'Híbrido', 'Zero Trust'],
+    'Nivel_Madurez': ['Bajo', 'Medio', 'Alto'],
+}
+
+# ============================================================================
+# ÍNDICE DE GRUPOS
+# ============================================================================
+
+class IndiceGrupos:
+    """Posiciones de fila por categoría, calculadas una vez a partir de códigos categóricos"""
+
+    def __init__(self, serie, categorias=None):
+        if categorias is not None:
+            # Valores fuera de las categorías (p. ej. 'Sin dato'): sin grupo (código -1)
+            serie = serie.where(serie.isin(categorias))
+        categorico = pd.Categorical(serie, categories=categorias)
+        self.categorias = list(categorico.categories)
+        self.codigos = np.asarray(categorico.codes)
+
+        # Un único ordenamiento estable agrupa las filas por código; las filas
+        # sin categoría (código -1) quedan al inicio y se descartan
+        orden = np.argsort(self.codigos, kind='stable')
+        conteos = np.bincount(self.codigos[self.codigos >= 0], minlength=len(self.categorias))
+        limites = np.concatenate([[0], np.cumsum(conteos)]) + np.count_nonzero(self.codigos < 0)
+
+        self._posiciones = {
+            categoria: orden[limites[i]:limites[i + 1]]
+            for i, categoria in enumerate(self.categorias)
+        }
+
+    def posiciones(self, categoria):
+        """Posiciones (en orden original) de las filas de la categoría"""
+        return self._posiciones.get(categoria, np.empty(0, dtype=np.intp))
+
+    def tamano(self, categoria):
+        return len(self.posiciones(categoria))
+
+    def dividir(self, valores):
+        """Divide un arreglo alineado con el dataset en un arreglo por categoría"""
+        valores = np.asarray(valores)
+        return [valores[self.posiciones(categoria)] for categoria in self.categorias]
+
+# ============================================================================
+# CONTEXTO DE DATOS
+# ============================================================================
+
+class ContextoDatos:
+    """Dataset cargado una vez, compartido por todas las tablas y gráficos"""
+
+    def __init__(self, fuente):
+        self.fuente = fuente
+        self.origen = fuente.descripcion
+        self.firma = fuente.firma()
+        self.version = fuente.hash_contenido()
+        self._columnas = {}
+        self._df = None
+        self._indices = {}
+        self._memo = {}
+
+    @property
+    def df(self):
+        """Dataset completo (todas las columnas de la fuente)"""
+        if self._df is None:
+            self._df = self.columnas(self.fuente.columnas_disponibles())
+        return self._df
+
+    @property
+    def filas(self):
+        """Número de registros, leyendo a lo sumo una columna de la fuente"""
+        if self._df is not None:
+            return len(self._df)
+        columna = next(iter(self._columnas), None) or self.fuente.columnas_disponibles()[0]
+        return len(self.columnas([columna]))
+
+    def columnas(self, nombres):
+        """Retorna solo las columnas pedidas; cada columna se lee de la fuente una vez"""
+        nombres = list(nombres)
+        faltantes = [col for col in nombres if col not in self._columnas]
+
+        if faltantes:
+            leido = self.fuente.leer(faltantes)
+            for col in faltantes:
+                self._columnas[col] = leido[col]
+
+        return pd.DataFrame({col: self._columnas[col] for col in nombres}, columns=nombres)
+
+    def indice(self, columna, categorias=None):
+        """Índice de grupos de la columna, construido una sola vez por contexto"""
+        if categorias is None:
+            categorias = ORDEN_CATEGORIAS.get(columna)
+        clave = (columna, tuple(categorias) if categorias is not None else None)
+
+        if clave not in self._indices:
+            self._indices[clave] = IndiceGrupos(self.columnas([columna])[columna], categorias)
+
+        return self._indices[clave]
+
+    def memoizar(self, clave, calcular):
+        """Resultado intermedio calculado una vez por contexto (p. ej. rangos, correlaciones)"""
+        if clave not in self._memo:
+            self._memo[clave] = calcular()
+        return self._memo[clave]
+
+    def __repr__(self):
+        return f"ContextoDatos(origen={self.origen!r}, version={self.version[:12]})"
+
+
+def calcular_hash_contenido(df):
+    """Calcula el hash SHA-256 de columnas y valores del DataFrame"""
+    h = hashlib.sha256()
+    h.update("\x1f".join(str(col) for col in df.columns).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()
+
+# ============================================================================
+# CONTEXTO MEMOIZADO
+# ============================================================================
+
+_fuente_actual = None
+_contexto_actual = None
+
+def configurar_fuente(fuente=None):
+    """Define la fuente por defecto (objeto fuente, ruta o None para el dataset en línea)"""
+    global _fuente_actual, _contexto_actual
+
+    if fuente is None or isinstance(fuente, str):
+        fuente = abrir_fuente(fuente)
+
+    _fuente_actual = fuente
+    _contexto_actual = None
+    return fuente
+
+def obtener_contexto(contexto=None):
+    """Retorna el contexto recibido o el contexto memoizado de la fuente por defecto"""
+    global _contexto_actual
+
+    if contexto is not None:
+        return contexto
+
+    if _fuente_actual is None:
+        configurar_fuente()
+
+    # Solo se recarga si la fuente cambió (firma distinta)
+    if _contexto_actual is None or _contexto_actual.firma != _fuente_actual.firma():
+        _contexto_actual = ContextoDatos(_fuente_actual)
+
+    return _contexto_actual
+
+def invalidar_contexto():
+    """Descarta el contexto memoizado para forzar una nueva carga"""
+    global _contexto_actual
+    _contexto_actual = None
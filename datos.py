@@ -6,6 +6,15 @@ Módulo que contiene los datos originales del estudio
 
 import pandas as pd
 
+# Esquema de 16 columnas común a todas las fuentes de datos
+COLUMNAS_DATASET = [
+    "Entidad", "Empleados", "Presupuesto_Seguridad_USD", "Modelo_Seguridad", 
+    "Años_Implementación", "Nivel_Madurez", "Incidentes_Mensuales", 
+    "Bloqueos_Exitosos", "Tasa_Bloqueo_%", "Tiempo_Respuesta_min", 
+    "Tiempo_Detección_min", "Percepción_1_5", "Capacitación_1_5", 
+    "Frecuencia_Simulacros", "%_Presupuesto_IT_Seguridad", "Especialistas"
+]
+
 def cargar_datos_originales():
     """Carga y retorna el dataset original del estudio"""
     
@@ -32,20 +41,13 @@ def cargar_datos_originales():
         ["ENT_PUB20", 2500, 400000, "Zero Trust", 3, "Alto", 10, 9, 90.0, 3.2, 0.8, 5, 5, "Mensual", 28, 16]
     ]
     
-    columnas = [
-        "Entidad", "Empleados", "Presupuesto_Seguridad_USD", "Modelo_Seguridad", 
-        "Años_Implementación", "Nivel_Madurez", "Incidentes_Mensuales", 
-        "Bloqueos_Exitosos", "Tasa_Bloqueo_%", "Tiempo_Respuesta_min", 
-        "Tiempo_Detección_min", "Percepción_1_5", "Capacitación_1_5", 
-        "Frecuencia_Simulacros", "%_Presupuesto_IT_Seguridad", "Especialistas"
-    ]
-    
-    df = pd.DataFrame(data, columns=columnas)
+    df = pd.DataFrame(data, columns=COLUMNAS_DATASET)
     return df
 
 def obtener_resumen_datos():
     """Retorna un resumen estadístico básico del dataset"""
-    df = cargar_datos_originales()
+    from contexto_datos import obtener_contexto
+    df = obtener_contexto().df
     
     resumen = {
         'total_entidades': len(df),
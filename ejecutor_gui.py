@@ -0,0 +1,299 @@
+# ejecutor_gui.py
+"""
+EJECUTOR DE TAREAS EN SEGUNDO PLANO PARA LA INTERFAZ GRÁFICA
+Los cálculos corren fuera del hilo de Tk: en hilos o, si dibujan con pyplot, en
+un proceso aparte con Agg. Resultados, errores y progreso vuelven por una cola
+que el hilo de Tk revisa con root.after, así ningún widget ni messagebox se
+toca desde otro hilo. A lo sumo una tarea en curso por acción. Cancelar detiene
+las tareas en hilos entre pasos (Tarea.comprobar) y las aisladas terminando su
+proceso; las demás tareas aisladas pendientes pasan a un proceso nuevo
+"""
+
+import importlib
+import multiprocessing
+import os
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+
+INTERVALO_SONDEO_MS = 50
+HILOS_POR_DEFECTO = 2
+
+# ============================================================================
+# TAREAS
+# ============================================================================
+
+class TareaCancelada(Exception):
+    """La tarea se detuvo porque se pidió su cancelación"""
+
+
+class Tarea:
+    """Trabajo en curso de una acción: bandera de cancelación y aviso de progreso"""
+
+    def __init__(self, accion, cola, detener=None):
+        self.accion = accion
+        self.cancelacion = threading.Event()
+        self.futuro = None
+        self._cola = cola
+        self._detener = detener
+        self._envio = None
+
+    @property
+    def cancelado(self):
+        return self.cancelacion.is_set()
+
+    def cancelar(self):
+        """Pide la cancelación; si la tarea aún no empezó, ya no se ejecuta
+
+        Una tarea aislada que ya empezó no revisa la bandera: se termina su proceso
+        """
+        self.cancelacion.set()
+        if self.futuro is not None and not self.futuro.cancel() and self._detener is not None:
+            self._detener(self)
+
+    def comprobar(self):
+        """Lanza TareaCancelada si se pidió cancelar (para llamar entre pasos)"""
+        if self.cancelado:
+            raise TareaCancelada(self.accion)
+
+    def progreso(self, nombre, estado, hechos, total):
+        """Mismo formato que el progreso de pipeline.exportar_todo; seguro desde cualquier hilo"""
+        self._cola.put((self, 'progreso', (nombre, estado, hechos, total)))
+
+# ============================================================================
+# EJECUTOR
+# ============================================================================
+
+def _llamar(ruta, *args, **kwargs):
+    """Importa 'modulo.funcion' en el hilo o proceso de la tarea y la llama"""
+    modulo, nombre = ruta.rsplit('.', 1)
+    return getattr(importlib.import_module(modulo), nombre)(*args, **kwargs)
+
+def _inicializar_proceso():
+    """El proceso de las tareas aisladas usa Agg, sin tocar el backend Tk de la interfaz"""
+    os.environ['MPLBACKEND'] = 'Agg'
+    import matplotlib
+    matplotlib.use('Agg')
+
+def _terminar_grupo(grupo):
+    """Termina los procesos de un ProcessPoolExecutor sin esperar a sus tareas"""
+    terminar = getattr(grupo, 'terminate_workers', None)  # Python 3.14+
+    if terminar is not None:
+        terminar()
+        return
+    procesos = list((grupo._processes or {}).values())
+    grupo.shutdown(wait=False, cancel_futures=True)
+    for proceso in procesos:
+        if proceso.is_alive():
+            proceso.terminate()
+
+
+class EjecutorTareas:
+    """Ejecuta tareas en segundo plano y entrega sus resultados en el hilo de Tk"""
+
+    def __init__(self, root, hilos=HILOS_POR_DEFECTO, intervalo=INTERVALO_SONDEO_MS):
+        self.root = root
+        self.intervalo = intervalo
+        self._cola = queue.Queue()
+        self._hilos = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='tarea_gui')
+        self._procesos = None
+        self._en_curso = {}
+        self._sondeo = None
+
+    def ocupado(self, accion):
+        return accion in self._en_curso
+
+    def enviar(self, accion, funcion, *args, al_terminar=None, al_fallar=None,
+               al_progresar=None, al_cancelar=None, aislado=False, **kwargs):
+        """Ejecuta funcion(tarea, *args, **kwargs) en un hilo; retorna la Tarea (None si la acción ya está en curso)
+
+        Con aislado=True se ejecuta funcion(*args, **kwargs) en un proceso con Agg:
+        debe poder serializarse y no recibe la tarea. `funcion` puede ser la ruta
+        'modulo.funcion', que se importa ya dentro de la tarea (así los módulos
+        pesados no bloquean el hilo de Tk). Las retrollamadas siempre corren en
+        el hilo de Tk
+        """
+        if accion in self._en_curso:
+            return None
+        if isinstance(funcion, str):
+            funcion = partial(_llamar, funcion)
+
+        tarea = Tarea(accion, self._cola, detener=self._detener_procesos if aislado else None)
+        retrollamadas = {'terminar': al_terminar, 'fallar': al_fallar,
+                         'progresar': al_progresar, 'cancelar': al_cancelar}
+        self._en_curso[accion] = (tarea, retrollamadas)
+
+        if aislado:
+            tarea._envio = (funcion, args, kwargs)
+            self._enviar_aislada(tarea)
+        else:
+            tarea.futuro = self._hilos.submit(funcion, tarea, *args, **kwargs)
+            self._vigilar(tarea)
+
+        self._programar_sondeo()
+        return tarea
+
+    def cancelar(self, accion):
+        """Cancela la tarea en curso de una acción (si la hay)"""
+        if accion in self._en_curso:
+            self._en_curso[accion][0].cancelar()
+
+    def cerrar(self):
+        """Cancela todo, termina el proceso de las tareas aisladas y libera los hilos (al cerrar la ventana)"""
+        tareas = [tarea for tarea, _ in self._en_curso.values()]
+        self._en_curso.clear()  # Nada que reenviar al terminar el proceso
+        for tarea in tareas:
+            tarea.cancelar()
+        if self._sondeo is not None:
+            self.root.after_cancel(self._sondeo)
+            self._sondeo = None
+        self._hilos.shutdown(wait=False, cancel_futures=True)
+        if self._procesos is not None:
+            _terminar_grupo(self._procesos)
+            self._procesos = None
+
+    def _grupo_procesos(self):
+        # Un solo proceso reutilizado: se crea al primer uso y conserva lo importado
+        if self._procesos is None:
+            # 'spawn' evita heredar el estado de Tk/matplotlib del proceso principal
+            self._procesos = ProcessPoolExecutor(max_workers=1,
+                                                 mp_context=multiprocessing.get_context('spawn'),
+                                                 initializer=_inicializar_proceso)
+        return self._procesos
+
+    def _enviar_aislada(self, tarea):
+        funcion, args, kwargs = tarea._envio
+        tarea.futuro = self._grupo_procesos().submit(funcion, *args, **kwargs)
+        self._vigilar(tarea)
+
+    def _vigilar(self, tarea):
+        futuro = tarea.futuro
+        futuro.add_done_callback(lambda _: self._cola.put((tarea, 'fin', futuro)))
+
+    def _detener_procesos(self, tarea):
+        """Termina el proceso de una tarea aislada en curso y reenvía las demás a uno nuevo"""
+        if self._procesos is None or tarea.futuro.done():
+            return
+        # Las que ya terminaron conservan su resultado; el resto caería con el proceso
+        pendientes = [otra for otra, _ in self._en_curso.values()
+                      if otra is not tarea and otra._envio is not None
+                      and not otra.cancelado and not otra.futuro.done()]
+        _terminar_grupo(self._procesos)
+        self._procesos = None
+        for otra in pendientes:
+            self._enviar_aislada(otra)
+
+    # ------------------------------------------------------------------------
+    # COLA DE RESULTADOS (HILO DE TK)
+    # ------------------------------------------------------------------------
+
+    def _programar_sondeo(self):
+        if self._sondeo is None:
+            self._sondeo = self.root.after(self.intervalo, self._revisar_cola)
+
+    def _revisar_cola(self):
+        self._sondeo = None
+        while True:
+            try:
+                tarea, tipo, dato = self._cola.get_nowait()
+            except queue.Empty:
+                break
+
+            registro = self._en_curso.get(tarea.accion)
+            if registro is None or registro[0] is not tarea:
+                continue  # Tarea ya descartada (ventana cerrada)
+            if tipo == 'fin' and dato is not tarea.futuro:
+                continue  # Futuro del proceso terminado: la tarea se reenvió a otro
+            retrollamadas = registro[1]
+
+            if tipo == 'progreso':
+                if not tarea.cancelado and retrollamadas['progresar'] is not None:
+                    retrollamadas['progresar'](*dato)
+                continue
+
+            del self._en_curso[tarea.accion]
+            self._finalizar(tarea, dato, retrollamadas)
+
+        if self._en_curso:
+            self._programar_sondeo()
+
+    def _finalizar(self, tarea, futuro, retrollamadas):
+        if tarea.cancelado or futuro.cancelled():
+            if retrollamadas['cancelar'] is not None:
+                retrollamadas['cancelar']()
+            return
+
+        try:
+            resultado = futuro.result()
+        except TareaCancelada:
+            if retrollamadas['cancelar'] is not None:
+                retrollamadas['cancelar']()
+        except Exception as e:
+            if retrollamadas['fallar'] is not None:
+                retrollamadas['fallar'](e)
+            else:
+                print(f"❌ Error en {tarea.accion}: {e}")
+        else:
+            if retrollamadas['terminar'] is not None:
+                retrollamadas['terminar'](resultado)
+
+# ============================================================================
+# VENTANA DE PROGRESO
+# ============================================================================
+
+class VentanaProgreso:
+    """Ventana modal con barra de progreso determinada y botón de cancelar (solo hilo de Tk)"""
+
+    def __init__(self, root, titulo, mensaje, al_cancelar=None):
+        self.ventana = tk.Toplevel(root)
+        self.ventana.title(titulo)
+        self.ventana.geometry("420x170")
+        self.ventana.transient(root)
+        self.ventana.configure(bg='#2c3e50')
+        self.ventana.protocol("WM_DELETE_WINDOW", self.cancelar)
+        self._al_cancelar = al_cancelar
+
+        # Centrar ventana
+        self.ventana.update_idletasks()
+        x = (self.ventana.winfo_screenwidth() // 2) - 210
+        y = (self.ventana.winfo_screenheight() // 2) - 85
+        self.ventana.geometry(f'420x170+{x}+{y}')
+
+        tk.Label(self.ventana, text=mensaje, font=('Arial', 12, 'bold'),
+                 bg='#2c3e50', fg='white').pack(pady=(15, 5))
+
+        self.etiqueta = tk.Label(self.ventana, text="Por favor espere...", font=('Arial', 9),
+                                 bg='#2c3e50', fg='#bdc3c7')
+        self.etiqueta.pack()
+
+        # Indeterminada hasta el primer aviso de progreso
+        self.barra = ttk.Progressbar(self.ventana, mode='indeterminate', length=340)
+        self.barra.pack(pady=10)
+        self.barra.start()
+
+        tk.Button(self.ventana, text="✖ Cancelar", font=('Arial', 9), bg='#e74c3c', fg='white',
+                  padx=10, command=self.cancelar).pack()
+
+        self.ventana.grab_set()
+
+    def actualizar(self, nombre, estado, hechos, total):
+        """Retrollamada de progreso: avanza la barra a hechos/total"""
+        if str(self.barra['mode']) != 'determinate':
+            self.barra.stop()
+            self.barra.config(mode='determinate')
+        self.barra.config(maximum=max(total, 1), value=hechos)
+        self.etiqueta.config(text=f"[{hechos}/{total}] {nombre}: {estado}")
+
+    def cancelar(self):
+        if self._al_cancelar is not None:
+            self._al_cancelar()
+        self.cerrar()
+
+    def cerrar(self):
+        if self.ventana.winfo_exists():
+            self.barra.stop()
+            self.ventana.grab_release()
+            self.ventana.destroy()
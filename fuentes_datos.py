@@ -0,0 +1,226 @@
+# fuentes_datos.py
+"""
+FUENTES DE DATOS INTERCAMBIABLES
+Dataset en línea (por defecto) o archivos columnares en disco
+(Parquet, Arrow/Feather, directorio de arreglos NumPy mapeados en memoria)
+con lectura por columnas. Los CSV/Excel se leen por bloques con la ingesta
+por streaming: las Tablas 3 y 6-9 salen de agregados parciales con memoria
+constante; lo que necesita rangos o valores individuales (Tablas 10-12,
+gráficos, copia del dataset) lee en memoria solo sus columnas. Para análisis
+repetidos conviene Parquet
+"""
+
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+from datos import cargar_datos_originales, COLUMNAS_DATASET
+
+# Tamaño de bloque para calcular el hash de archivos sin cargarlos completos
+TAMANO_BLOQUE_HASH = 1 << 20
+
+# ============================================================================
+# FUENTE EN LÍNEA (POR DEFECTO)
+# ============================================================================
+
+class FuenteEnLinea:
+    """Dataset original de 20 entidades definido en datos.py"""
+
+    descripcion = "original"
+
+    def __init__(self):
+        self._hash = None
+
+    def columnas_disponibles(self):
+        return list(COLUMNAS_DATASET)
+
+    def firma(self):
+        # El dataset en línea no cambia durante la ejecución
+        return ("original",)
+
+    def hash_contenido(self):
+        if self._hash is None:
+            from contexto_datos import calcular_hash_contenido
+            self._hash = calcular_hash_contenido(cargar_datos_originales())
+        return self._hash
+
+    def leer(self, columnas=None):
+        df = cargar_datos_originales()
+        return df if columnas is None else df[list(columnas)]
+
+# ============================================================================
+# FUENTES EN DISCO
+# ============================================================================
+
+class _FuenteArchivo:
+    """Base para fuentes en disco: firma por (ruta, tamaño, mtime) y hash por contenido"""
+
+    def __init__(self, ruta):
+        self.ruta = os.path.abspath(ruta)
+        self.descripcion = os.path.basename(self.ruta)
+        self._hash = None
+        self._firma_hash = None
+
+    def _archivos(self):
+        return [self.ruta]
+
+    def firma(self):
+        firma = []
+        for archivo in self._archivos():
+            info = os.stat(archivo)
+            firma.append((archivo, info.st_size, info.st_mtime_ns))
+        return tuple(firma)
+
+    def hash_contenido(self):
+        # El hash se recalcula solo si la firma del archivo cambió
+        firma = self.firma()
+        if self._hash is None or firma != self._firma_hash:
+            h = hashlib.sha256()
+            for archivo in self._archivos():
+                h.update(os.path.basename(archivo).encode("utf-8"))
+                with open(archivo, "rb") as f:
+                    for bloque in iter(lambda: f.read(TAMANO_BLOQUE_HASH), b""):
+                        h.update(bloque)
+            self._hash = h.hexdigest()
+            self._firma_hash = firma
+        return self._hash
+
+
+def _importar_pyarrow():
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise ImportError("Se requiere pyarrow para leer archivos Parquet/Arrow (pip install pyarrow)")
+
+
+class FuenteParquet(_FuenteArchivo):
+    """Archivo Parquet leído con mapeo en memoria y solo las columnas solicitadas"""
+
+    def columnas_disponibles(self):
+        _importar_pyarrow()
+        import pyarrow.parquet as pq
+        return list(pq.ParquetFile(self.ruta, memory_map=True).schema_arrow.names)
+
+    def leer(self, columnas=None):
+        _importar_pyarrow()
+        import pyarrow.parquet as pq
+        tabla = pq.read_table(self.ruta, columns=columnas, memory_map=True)
+        return tabla.to_pandas()
+
+
+class FuenteArrow(_FuenteArchivo):
+    """Archivo Arrow IPC / Feather v2 mapeado en memoria, leído por columnas"""
+
+    def columnas_disponibles(self):
+        _importar_pyarrow()
+        import pyarrow.ipc as ipc
+        with ipc.open_file(self.ruta) as lector:
+            return list(lector.schema.names)
+
+    def leer(self, columnas=None):
+        _importar_pyarrow()
+        import pyarrow.feather as feather
+        tabla = feather.read_table(self.ruta, columns=columnas, memory_map=True)
+        return tabla.to_pandas()
+
+
+class FuenteMemmapNumpy(_FuenteArchivo):
+    """Directorio con un archivo .npy por columna, abierto con np.load(mmap_mode='r')"""
+
+    def _ruta_columna(self, columna):
+        return os.path.join(self.ruta, f"{columna}.npy")
+
+    def _archivos(self):
+        return [self._ruta_columna(col) for col in self.columnas_disponibles()]
+
+    def columnas_disponibles(self):
+        presentes = {nombre[:-4] for nombre in os.listdir(self.ruta) if nombre.endswith(".npy")}
+        # Conservar el orden del esquema; columnas adicionales al final
+        return ([col for col in COLUMNAS_DATASET if col in presentes] +
+                sorted(presentes.difference(COLUMNAS_DATASET)))
+
+    def leer(self, columnas=None):
+        if columnas is None:
+            columnas = self.columnas_disponibles()
+        datos = {}
+        for columna in columnas:
+            arreglo = np.load(self._ruta_columna(columna), mmap_mode="r", allow_pickle=False)
+            datos[columna] = arreglo
+        return pd.DataFrame(datos, columns=list(columnas))
+
+
+class FuenteTabular(_FuenteArchivo):
+    """CSV o Excel leído por bloques (ingesta_streaming), solo con las columnas solicitadas"""
+
+    # Las tablas que admiten agregados parciales no cargan el archivo en memoria
+    por_bloques = True
+
+    def columnas_disponibles(self):
+        from ingesta_streaming import leer_encabezado
+        return leer_encabezado(self.ruta)
+
+    def leer(self, columnas=None):
+        from ingesta_streaming import leer_por_bloques
+        if columnas is None:
+            columnas = self.columnas_disponibles()
+        columnas = list(columnas)
+        bloques = list(leer_por_bloques(self.ruta, columnas=columnas))
+        if not bloques:
+            return pd.DataFrame(columns=columnas)
+        # Mismo orden de columnas que el pedido (read_csv las entrega en el orden del archivo)
+        return pd.concat(bloques, ignore_index=True)[columnas]
+
+# ============================================================================
+# FÁBRICA Y ESCRITURA
+# ============================================================================
+
+EXTENSIONES_FUENTES = {
+    ".parquet": FuenteParquet,
+    ".pq": FuenteParquet,
+    ".arrow": FuenteArrow,
+    ".feather": FuenteArrow,
+    ".ipc": FuenteArrow,
+    ".csv": FuenteTabular,
+    ".xlsx": FuenteTabular,
+    ".xlsm": FuenteTabular,
+}
+
+def abrir_fuente(ruta=None):
+    """Crea la fuente adecuada para la ruta (None = dataset en línea)"""
+    if ruta is None:
+        return FuenteEnLinea()
+
+    if os.path.isdir(ruta):
+        return FuenteMemmapNumpy(ruta)
+
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension not in EXTENSIONES_FUENTES:
+        raise ValueError(f"Formato de datos no soportado: '{extension}' ({ruta})")
+
+    return EXTENSIONES_FUENTES[extension](ruta)
+
+def guardar_dataset_columnar(df, ruta):
+    """Guarda un DataFrame con el esquema del estudio en el formato indicado por la ruta"""
+    extension = os.path.splitext(ruta)[1].lower()
+
+    if extension in (".parquet", ".pq"):
+        _importar_pyarrow()
+        df.to_parquet(ruta, index=False)
+    elif extension in (".arrow", ".feather", ".ipc"):
+        _importar_pyarrow()
+        df.reset_index(drop=True).to_feather(ruta, compression="uncompressed")
+    elif extension == "":
+        # Directorio de arreglos NumPy (texto como unicode de ancho fijo)
+        os.makedirs(ruta, exist_ok=True)
+        for columna in df.columns:
+            serie = df[columna]
+            if pd.api.types.is_numeric_dtype(serie):
+                arreglo = serie.to_numpy()
+            else:
+                arreglo = serie.astype(str).to_numpy(dtype=str)
+            np.save(os.path.join(ruta, f"{columna}.npy"), arreglo, allow_pickle=False)
+    else:
+        raise ValueError(f"Formato de datos no soportado: '{extension}' ({ruta})")
+
+    return ruta
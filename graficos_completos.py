@@ -6,22 +6,33 @@ GRÁFICOS COMPLETOS PARA CAPÍTULO IV
 
 import matplotlib.pyplot as plt
 import seaborn as sns
-import pandas as pd
 import numpy as np
-from analisis_estadistico import cargar_datos_originales
+from contexto_datos import obtener_contexto
+from salida_figuras import guardar_figura, FORMATOS_POR_DEFECTO
+from motor_estadistico import (medias_por_grupo, correlaciones_spearman,
+                               seleccionar_correlaciones, MAPA_MADUREZ)
 import os
 
-# Configuración de estilo profesional
-plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_palette("husl")
-plt.rcParams['figure.figsize'] = [12, 8]
-plt.rcParams['font.size'] = 12
-plt.rcParams['axes.titlesize'] = 14
-plt.rcParams['axes.titleweight'] = 'bold'
+_estilo_aplicado = False
 
-def generar_grafico_incidentes():
+def aplicar_estilo():
+    """Configuración de estilo profesional (al generar el primer gráfico, no al importar)"""
+    global _estilo_aplicado
+    if _estilo_aplicado:
+        return
+    plt.style.use('seaborn-v0_8-whitegrid')
+    sns.set_palette("husl")
+    plt.rcParams['figure.figsize'] = [12, 8]
+    plt.rcParams['font.size'] = 12
+    plt.rcParams['axes.titlesize'] = 14
+    plt.rcParams['axes.titleweight'] = 'bold'
+    _estilo_aplicado = True
+
+def generar_grafico_incidentes(contexto=None):
     """Gráfico 1: Distribución de incidentes mensuales"""
-    df = cargar_datos_originales()
+    aplicar_estilo()
+    ctx = obtener_contexto(contexto)
+    df = ctx.columnas(['Modelo_Seguridad', 'Incidentes_Mensuales'])
     
     fig, axes = plt.subplots(1, 2, figsize=(15, 6))
     
@@ -37,8 +48,7 @@ def generar_grafico_incidentes():
     axes[0].set_ylabel('Incidentes Mensuales')
     
     # Gráfico de barras con promedios
-    promedios = df.groupby('Modelo_Seguridad')['Incidentes_Mensuales'].mean()
-    promedios = promedios.reindex(['Perimetral', 'Híbrido', 'Zero Trust'])
+    promedios = medias_por_grupo(ctx, ['Incidentes_Mensuales'])['Incidentes_Mensuales']
     
     bars = axes[1].bar(promedios.index, promedios.values, 
                        color=['#e74c3c', '#3498db', '#2ecc71'])
@@ -55,15 +65,16 @@ def generar_grafico_incidentes():
     plt.tight_layout()
     return fig
 
-def generar_grafico_tasa_bloqueo():
+def generar_grafico_tasa_bloqueo(contexto=None):
     """Gráfico 2: Tasa de bloqueo por modelo"""
-    df = cargar_datos_originales()
+    aplicar_estilo()
+    ctx = obtener_contexto(contexto)
+    df = ctx.columnas(['Modelo_Seguridad', 'Tasa_Bloqueo_%'])
     
     fig, axes = plt.subplots(1, 2, figsize=(15, 6))
     
     # Gráfico de barras
-    promedios = df.groupby('Modelo_Seguridad')['Tasa_Bloqueo_%'].mean()
-    promedios = promedios.reindex(['Perimetral', 'Híbrido', 'Zero Trust'])
+    promedios = medias_por_grupo(ctx, ['Tasa_Bloqueo_%'])['Tasa_Bloqueo_%']
     
     colors = ['#e74c3c', '#3498db', '#2ecc71']
     bars = axes[0].bar(promedios.index, promedios.values, color=colors)
@@ -90,9 +101,13 @@ def generar_grafico_tasa_bloqueo():
     plt.tight_layout()
     return fig
 
-def generar_grafico_tiempos():
+def generar_grafico_tiempos(contexto=None):
     """Gráfico 3: Tiempos de respuesta y detección"""
-    df = cargar_datos_originales()
+    aplicar_estilo()
+    ctx = obtener_contexto(contexto)
+    df = ctx.columnas([
+        'Modelo_Seguridad', 'Tiempo_Respuesta_min', 'Tiempo_Detección_min'
+    ])
     
     fig, axes = plt.subplots(2, 2, figsize=(15, 10))
     
@@ -113,8 +128,7 @@ def generar_grafico_tiempos():
     axes[0, 1].set_ylabel('Minutos')
     
     # Comparación de promedios
-    tiempos_avg = df.groupby('Modelo_Seguridad')[['Tiempo_Respuesta_min', 'Tiempo_Detección_min']].mean()
-    tiempos_avg = tiempos_avg.reindex(['Perimetral', 'Híbrido', 'Zero Trust'])
+    tiempos_avg = medias_por_grupo(ctx, ['Tiempo_Respuesta_min', 'Tiempo_Detección_min'])
     
     x = np.arange(len(tiempos_avg.index))
     width = 0.35
@@ -131,26 +145,13 @@ def generar_grafico_tiempos():
     axes[1, 0].legend()
     
     # Gráfico de radar para comparación
-    from matplotlib.patches import Circle
-    from matplotlib.path import Path
-    from matplotlib.spines import Spine
-    from matplotlib.projections.polar import PolarAxes
-    from matplotlib.projections import register_projection
-    
     # Datos normalizados para radar
     modelos = ['Perimetral', 'Híbrido', 'Zero Trust']
     metricas = ['Respuesta', 'Detección']
     
-    datos_radar = []
-    for modelo in modelos:
-        subset = df[df['Modelo_Seguridad'] == modelo]
-        datos_radar.append([
-            subset['Tiempo_Respuesta_min'].mean(),
-            subset['Tiempo_Detección_min'].mean()
-        ])
+    datos_radar = tiempos_avg.reindex(modelos).to_numpy()
     
     # Normalizar (invertir porque menor es mejor)
-    datos_radar = np.array(datos_radar)
     datos_normalizados = 1 - (datos_radar / datos_radar.max(axis=0))
     
     # Configurar radar
@@ -174,15 +175,15 @@ def generar_grafico_tiempos():
     plt.tight_layout()
     return fig
 
-def generar_grafico_percepcion_capacitacion():
+def generar_grafico_percepcion_capacitacion(contexto=None):
     """Gráfico 4: Percepción y capacitación (¡!)"""
-    df = cargar_datos_originales()
+    aplicar_estilo()
+    ctx = obtener_contexto(contexto)
     
     fig, axes = plt.subplots(1, 2, figsize=(15, 6))
     
     # Calcular promedios
-    promedios = df.groupby('Modelo_Seguridad')[['Percepción_1_5', 'Capacitación_1_5']].mean()
-    promedios = promedios.reindex(['Perimetral', 'Híbrido', 'Zero Trust'])
+    promedios = medias_por_grupo(ctx, ['Percepción_1_5', 'Capacitación_1_5'])
     
     # Gráfico de barras agrupadas
     x = np.arange(len(promedios.index))
@@ -232,9 +233,14 @@ def generar_grafico_percepcion_capacitacion():
     plt.tight_layout()
     return fig
 
-def generar_grafico_madurez():
+def generar_grafico_madurez(contexto=None):
     """Gráfico 5: Nivel de madurez por modelo"""
-    df = cargar_datos_originales()
+    aplicar_estilo()
+    ctx = obtener_contexto(contexto)
+    df = ctx.columnas([
+        'Modelo_Seguridad', 'Nivel_Madurez', 'Años_Implementación', 'Especialistas'
+    ])
+    indice = ctx.indice('Modelo_Seguridad')
     
     fig, axes = plt.subplots(1, 2, figsize=(15, 6))
     
@@ -264,11 +270,10 @@ def generar_grafico_madurez():
     from scipy import stats
     
     # Convertir madurez a numérico
-    madurez_map = {'Bajo': 1, 'Medio': 2, 'Alto': 3}
-    df['Madurez_Num'] = df['Nivel_Madurez'].map(madurez_map)
+    df = df.assign(Madurez_Num=df['Nivel_Madurez'].map(MAPA_MADUREZ))
     
     for modelo in ['Perimetral', 'Híbrido', 'Zero Trust']:
-        subset = df[df['Modelo_Seguridad'] == modelo]
+        subset = df.take(indice.posiciones(modelo))
         if len(subset) > 1:
             slope, intercept, r_value, p_value, std_err = stats.linregress(
                 subset['Años_Implementación'], subset['Madurez_Num'])
@@ -280,9 +285,12 @@ def generar_grafico_madurez():
     plt.tight_layout()
     return fig
 
-def generar_grafico_especialistas():
+def generar_grafico_especialistas(contexto=None):
     """Gráfico 6: Especialistas por modelo"""
-    df = cargar_datos_originales()
+    aplicar_estilo()
+    df = obtener_contexto(contexto).columnas([
+        'Entidad', 'Modelo_Seguridad', 'Especialistas', 'Presupuesto_Seguridad_USD'
+    ])
     
     fig, axes = plt.subplots(1, 2, figsize=(15, 6))
     
@@ -328,20 +336,9 @@ def generar_grafico_especialistas():
     plt.tight_layout()
     return fig
 
-def generar_grafico_correlaciones():
+def generar_grafico_correlaciones(contexto=None):
     """Gráfico 7: Mapa de correlaciones"""
-    df = cargar_datos_originales()
-    
-    # Preparar datos para correlación
-    df_corr = df.copy()
-    
-    # Convertir variables categóricas a numéricas
-    madurez_map = {'Bajo': 1, 'Medio': 2, 'Alto': 3}
-    df_corr['Nivel_Madurez_Num'] = df_corr['Nivel_Madurez'].map(madurez_map)
-    
-    frecuencia_map = {'Anual': 1, 'Semestral': 2, 'Trimestral': 4, 'Mensual': 12}
-    df_corr['Frecuencia_Num'] = df_corr['Frecuencia_Simulacros'].map(frecuencia_map)
-    
+    aplicar_estilo()
     # Seleccionar variables para correlación
     variables_corr = [
         'Años_Implementación',
@@ -371,8 +368,9 @@ def generar_grafico_correlaciones():
         'Frecuencia_Num': 'Frec. Simul.'
     }
     
-    # Calcular matriz de correlación
-    corr_matrix = df_corr[variables_corr].corr(method='spearman')
+    # Submatriz de la matriz de Spearman compartida con la Tabla 12
+    correlaciones = correlaciones_spearman(contexto)
+    corr_matrix = seleccionar_correlaciones(correlaciones, variables_corr)['rho'].copy()
     
     # Renombrar
     corr_matrix.index = [nombres_amigables.get(col, col) for col in corr_matrix.index]
@@ -393,9 +391,14 @@ def generar_grafico_correlaciones():
     plt.tight_layout()
     return fig
 
-def generar_grafico_boxplot_completo():
+def generar_grafico_boxplot_completo(contexto=None):
     """Gráfico 8: Boxplot completo de métricas por modelo"""
-    df = cargar_datos_originales()
+    aplicar_estilo()
+    df = obtener_contexto(contexto).columnas([
+        'Modelo_Seguridad', 'Incidentes_Mensuales', 'Tasa_Bloqueo_%',
+        'Tiempo_Respuesta_min', 'Tiempo_Detección_min', 'Percepción_1_5',
+        'Capacitación_1_5', 'Especialistas'
+    ])
     
     # Seleccionar métricas clave
     metricas = [
@@ -453,46 +456,60 @@ def generar_grafico_boxplot_completo():
     plt.tight_layout()
     return fig
 
-def generar_todos_graficos():
-    """Genera y guarda todos los gráficos"""
-    from analisis_estadistico import crear_carpetas_exportacion
-    crear_carpetas_exportacion()
-    
-    # Lista de funciones de gráficos
-    funciones_graficos = [
-        ('1_incidentes', generar_grafico_incidentes),
-        ('2_tasa_bloqueo', generar_grafico_tasa_bloqueo),
-        ('3_tiempos', generar_grafico_tiempos),
-        ('4_percepcion_capacitacion', generar_grafico_percepcion_capacitacion),
-        ('5_madurez', generar_grafico_madurez),
-        ('6_especialistas', generar_grafico_especialistas),
-        ('7_correlaciones', generar_grafico_correlaciones),
-        ('8_boxplot_completo', generar_grafico_boxplot_completo)
-    ]
+# Funciones de todos los gráficos del capítulo (nombre de archivo -> función)
+FUNCIONES_GRAFICOS = {
+    '1_incidentes': generar_grafico_incidentes,
+    '2_tasa_bloqueo': generar_grafico_tasa_bloqueo,
+    '3_tiempos': generar_grafico_tiempos,
+    '4_percepcion_capacitacion': generar_grafico_percepcion_capacitacion,
+    '5_madurez': generar_grafico_madurez,
+    '6_especialistas': generar_grafico_especialistas,
+    '7_correlaciones': generar_grafico_correlaciones,
+    '8_boxplot_completo': generar_grafico_boxplot_completo
+}
+
+def guardar_grafico(nombre, contexto=None, directorio='exportacion_capitulo_iv',
+                    formatos=FORMATOS_POR_DEFECTO):
+    """Genera un gráfico y lo guarda (por defecto PNG 300 DPI y PDF); retorna las rutas escritas"""
+    fig = FUNCIONES_GRAFICOS[nombre](obtener_contexto(contexto))
+    base = os.path.join(directorio, 'graficos', nombre)
+    
+    try:
+        # Un solo dibujo para todos los formatos
+        return guardar_figura(fig, base, formatos)
+    finally:
+        plt.close(fig)
+
+# ============================================================================
+# RENDERIZADO PARA PANTALLA Y EXPORTACIÓN
+# ============================================================================
+
+def grafico_para_pantalla(nombre, ancho=None, alto=None):
+    """Gráfico para la interfaz: (PNG, figura serializada, versión del dataset)
+
+    El contexto se obtiene aquí, en el proceso que rasteriza: la interfaz solo
+    envía el nombre y el tamaño del panel
+    """
+    from salida_figuras import renderizar_para_pantalla
+    ctx = obtener_contexto()
+    png, serializada = renderizar_para_pantalla(FUNCIONES_GRAFICOS[nombre], ctx, ancho=ancho, alto=alto)
+    return png, serializada, ctx.version
+
+def generar_todos_graficos(contexto=None, directorio='exportacion_capitulo_iv', procesos=None,
+                           formatos=FORMATOS_POR_DEFECTO, forzar=False):
+    """Genera y guarda los gráficos que cambiaron (todos si forzar); True si ninguno falló
+
+    Es el pipeline de exportación con solo los nodos de gráficos: mismo grupo de
+    procesos, manifiesto y manejo de trabajadores caídos
+    """
+    from pipeline import exportar_todo
     
     print("📊 Generando todos los gráficos...")
-    
-    for nombre, funcion in funciones_graficos:
-        try:
-            print(f"  • Generando {nombre}...")
-            fig = funcion()
-            
-            # Guardar en alta resolución
-            fig.savefig(f'exportacion_capitulo_iv/graficos/{nombre}.png', 
-                       dpi=300, bbox_inches='tight')
-            fig.savefig(f'exportacion_capitulo_iv/graficos/{nombre}.pdf', 
-                       bbox_inches='tight')
-            
-            plt.close(fig)
-            print(f"    ✅ Guardado: {nombre}.png/.pdf")
-            
-        except Exception as e:
-            print(f"    ❌ Error en {nombre}: {str(e)}")
-    
-    print("\n✅ Todos los gráficos generados exitosamente!")
-    print("📁 Guardados en: 'exportacion_capitulo_iv/graficos/'")
-    
-    return True
+    _, errores = exportar_todo(directorio, contexto, procesos=procesos, forzar=forzar,
+                               tablas=False, dataset=False, verificacion=False, libro=False,
+                               formatos_graficos=formatos)
+    print(f"📁 Guardados en: '{os.path.join(directorio, 'graficos')}/'")
+    return not errores
 
 # ============================================================================
 # EJECUCIÓN PRINCIPAL
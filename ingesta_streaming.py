@@ -0,0 +1,371 @@
+# ingesta_streaming.py
+"""
+INGESTA POR BLOQUES (STREAMING)
+Lectura de CSV/Excel de gran tamaño en bloques acotados y agregados
+parciales combinables por Modelo_Seguridad y Nivel_Madurez.
+Las Tablas 3, 6, 7, 8 y 9 se generan desde los agregados con memoria constante;
+con una fuente CSV/Excel, las funciones de analisis_estadistico las toman de
+aquí (las Tablas 10-12 necesitan rangos y sí cargan sus columnas).
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+TAMANO_BLOQUE = 100_000
+
+MODELOS = ['Perimetral', 'Híbrido', 'Zero Trust']
+NIVELES = ['Bajo', 'Medio', 'Alto']
+
+CLAVES_GRUPO = ['Modelo_Seguridad', 'Nivel_Madurez']
+
+COLUMNAS_NUMERICAS = [
+    'Empleados', 'Presupuesto_Seguridad_USD', 'Años_Implementación',
+    'Incidentes_Mensuales', 'Bloqueos_Exitosos', 'Tasa_Bloqueo_%',
+    'Tiempo_Respuesta_min', 'Tiempo_Detección_min', 'Percepción_1_5',
+    'Capacitación_1_5', '%_Presupuesto_IT_Seguridad', 'Especialistas'
+]
+
+COLUMNA_FRECUENCIA = 'Frecuencia_Simulacros'
+
+# ============================================================================
+# AGREGADOS PARCIALES COMBINABLES
+# ============================================================================
+
+class _AcumuladorGrupo:
+    """Conteo, suma, suma de cuadrados centrada, mínimo y máximo por métrica"""
+
+    def __init__(self, k, primera_fila):
+        self.filas = 0
+        self.primera_fila = primera_fila
+        self.n = np.zeros(k, dtype=np.int64)
+        self.suma = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.minimo = np.full(k, np.inf)
+        self.maximo = np.full(k, -np.inf)
+        self.frecuencias = {}
+        self.primera_frecuencia = {}
+
+    def combinar(self, n, suma, m2, minimo, maximo):
+        # Fórmula de Chan et al.: combina medias y sumas de cuadrados sin
+        # la cancelación numérica de sum(x²) - n·media²
+        n_total = self.n + n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = np.where(n > 0, suma / np.maximum(n, 1), 0) - \
+                    np.where(self.n > 0, self.suma / np.maximum(self.n, 1), 0)
+            ajuste = np.where(n_total > 0, delta ** 2 * self.n * n / np.maximum(n_total, 1), 0)
+        self.m2 = self.m2 + m2 + ajuste
+        self.n = n_total
+        self.suma = self.suma + suma
+        self.minimo = np.fmin(self.minimo, minimo)
+        self.maximo = np.fmax(self.maximo, maximo)
+
+    def media(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.n > 0, self.suma / self.n, np.nan)
+
+    def varianza(self):
+        # Varianza muestral (ddof=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.n > 1, self.m2 / (self.n - 1), np.nan)
+
+
+class AgregadosParciales:
+    """Agregados combinables por (Modelo_Seguridad, Nivel_Madurez)"""
+
+    def __init__(self, metricas=None):
+        self.metricas = list(metricas or COLUMNAS_NUMERICAS)
+        self.grupos = {}
+        self.filas = 0
+        self.enteras = set(self.metricas)
+
+    def actualizar(self, bloque):
+        """Incorpora un bloque (DataFrame) a los agregados"""
+        if len(bloque) == 0:
+            return self
+
+        bloque = bloque.reset_index(drop=True)
+        k = len(self.metricas)
+        valores = bloque[self.metricas].apply(pd.to_numeric, errors='coerce')
+
+        # Las métricas con decimales dejan de mostrarse como enteros
+        for metrica in self.metricas:
+            if not pd.api.types.is_integer_dtype(valores[metrica]):
+                serie = valores[metrica].dropna()
+                if not (serie == np.floor(serie)).all():
+                    self.enteras.discard(metrica)
+
+        claves = [bloque[col].astype(object) for col in CLAVES_GRUPO]
+        agrupado = valores.groupby(claves, sort=False, dropna=False)
+
+        conteo = agrupado.count()
+        suma = agrupado.sum(min_count=1).fillna(0.0)
+        varianza = agrupado.var(ddof=1)
+        minimo = agrupado.min()
+        maximo = agrupado.max()
+        filas = agrupado.size()
+        posiciones = pd.Series(np.arange(len(bloque)), index=bloque.index)
+        primera = posiciones.groupby(claves, sort=False, dropna=False).min()
+
+        # Todos los resultados comparten el orden de grupos: se recorren por posición
+        for pos, clave in enumerate(filas.index):
+            clave = tuple(None if pd.isna(valor) else valor for valor in clave)
+            n = conteo.iloc[pos].to_numpy(dtype=np.int64)
+            m2 = np.nan_to_num(varianza.iloc[pos].to_numpy(dtype=float) * np.maximum(n - 1, 0))
+            grupo = self.grupos.get(clave)
+            if grupo is None:
+                grupo = self.grupos[clave] = _AcumuladorGrupo(k, self.filas + int(primera.iloc[pos]))
+            grupo.combinar(n, suma.iloc[pos].to_numpy(dtype=float), m2,
+                           minimo.iloc[pos].to_numpy(dtype=float),
+                           maximo.iloc[pos].to_numpy(dtype=float))
+            grupo.filas += int(filas.iloc[pos])
+
+        # Conteos de frecuencia de simulacros por grupo (con primera aparición para desempates)
+        if COLUMNA_FRECUENCIA in bloque.columns:
+            frecuencia = bloque[COLUMNA_FRECUENCIA].astype(object)
+            resumen = posiciones.groupby(claves + [frecuencia], sort=False).agg(['size', 'min'])
+            for (modelo, nivel, valor), fila in resumen.iterrows():
+                grupo = self.grupos[(modelo, nivel)]
+                grupo.frecuencias[valor] = grupo.frecuencias.get(valor, 0) + int(fila['size'])
+                if valor not in grupo.primera_frecuencia:
+                    grupo.primera_frecuencia[valor] = self.filas + int(fila['min'])
+
+        self.filas += len(bloque)
+        return self
+
+    def combinar(self, otro):
+        """Combina con otros agregados (p. ej. calculados en paralelo sobre otro archivo)"""
+        desplazamiento = self.filas
+        for clave, grupo_otro in otro.grupos.items():
+            grupo = self.grupos.get(clave)
+            if grupo is None:
+                grupo = self.grupos[clave] = _AcumuladorGrupo(len(self.metricas),
+                                                               desplazamiento + grupo_otro.primera_fila)
+            grupo.combinar(grupo_otro.n, grupo_otro.suma, grupo_otro.m2,
+                           grupo_otro.minimo, grupo_otro.maximo)
+            grupo.filas += grupo_otro.filas
+            for valor, cantidad in grupo_otro.frecuencias.items():
+                grupo.frecuencias[valor] = grupo.frecuencias.get(valor, 0) + cantidad
+                if valor not in grupo.primera_frecuencia:
+                    grupo.primera_frecuencia[valor] = desplazamiento + grupo_otro.primera_frecuencia[valor]
+        self.filas += otro.filas
+        self.enteras &= otro.enteras
+        return self
+
+    def seleccionar(self, modelo=None, nivel=None):
+        """Combina los grupos que coinciden con el modelo y/o nivel indicados"""
+        resultado = _AcumuladorGrupo(len(self.metricas), None)
+        for (grupo_modelo, grupo_nivel), grupo in self.grupos.items():
+            if modelo is not None and grupo_modelo != modelo:
+                continue
+            if nivel is not None and grupo_nivel != nivel:
+                continue
+            resultado.combinar(grupo.n, grupo.suma, grupo.m2, grupo.minimo, grupo.maximo)
+            resultado.filas += grupo.filas
+            if resultado.primera_fila is None or grupo.primera_fila < resultado.primera_fila:
+                resultado.primera_fila = grupo.primera_fila
+            for valor, cantidad in grupo.frecuencias.items():
+                resultado.frecuencias[valor] = resultado.frecuencias.get(valor, 0) + cantidad
+                primera = grupo.primera_frecuencia[valor]
+                resultado.primera_frecuencia[valor] = min(primera, resultado.primera_frecuencia.get(valor, primera))
+        return resultado
+
+    def indice(self, metrica):
+        return self.metricas.index(metrica)
+
+# ============================================================================
+# LECTURA POR BLOQUES
+# ============================================================================
+
+def leer_por_bloques(ruta, tamano_bloque=TAMANO_BLOQUE, columnas=None):
+    """Genera DataFrames de a lo sumo `tamano_bloque` filas desde un CSV o Excel"""
+    extension = os.path.splitext(ruta)[1].lower()
+
+    if extension in ('.csv', '.txt'):
+        lector = pd.read_csv(ruta, chunksize=tamano_bloque, usecols=columnas, encoding='utf-8-sig')
+        for bloque in lector:
+            yield bloque
+
+    elif extension in ('.xlsx', '.xlsm'):
+        from openpyxl import load_workbook
+
+        libro = load_workbook(ruta, read_only=True, data_only=True)
+        try:
+            filas = libro.worksheets[0].iter_rows(values_only=True)
+            encabezado = [str(col) for col in next(filas)]
+            posiciones = [encabezado.index(col) for col in columnas] if columnas else None
+            nombres = list(columnas) if columnas else encabezado
+
+            pendientes = []
+            for fila in filas:
+                pendientes.append([fila[i] for i in posiciones] if posiciones else fila)
+                if len(pendientes) >= tamano_bloque:
+                    yield pd.DataFrame(pendientes, columns=nombres)
+                    pendientes = []
+            if pendientes:
+                yield pd.DataFrame(pendientes, columns=nombres)
+        finally:
+            libro.close()
+
+    else:
+        raise ValueError(f"Formato no soportado para ingesta por bloques: '{extension}' ({ruta})")
+
+def leer_encabezado(ruta):
+    """Nombres de columna de un CSV o Excel, sin leer sus filas"""
+    extension = os.path.splitext(ruta)[1].lower()
+
+    if extension in ('.csv', '.txt'):
+        return [str(col) for col in pd.read_csv(ruta, nrows=0, encoding='utf-8-sig').columns]
+
+    if extension in ('.xlsx', '.xlsm'):
+        from openpyxl import load_workbook
+
+        libro = load_workbook(ruta, read_only=True, data_only=True)
+        try:
+            encabezado = next(libro.worksheets[0].iter_rows(max_row=1, values_only=True), ())
+            return [str(col) for col in encabezado]
+        finally:
+            libro.close()
+
+    raise ValueError(f"Formato no soportado para ingesta por bloques: '{extension}' ({ruta})")
+
+def agregar_archivo(ruta, tamano_bloque=TAMANO_BLOQUE):
+    """Recorre el archivo por bloques y retorna sus agregados parciales"""
+    agregados = AgregadosParciales()
+    columnas = CLAVES_GRUPO + [COLUMNA_FRECUENCIA] + agregados.metricas
+
+    for bloque in leer_por_bloques(ruta, tamano_bloque, columnas):
+        agregados.actualizar(bloque)
+
+    return agregados
+
+def agregados_contexto(contexto=None):
+    """Agregados del archivo del contexto, una pasada por contexto; None si la fuente no es CSV/Excel"""
+    from contexto_datos import obtener_contexto
+    ctx = obtener_contexto(contexto)
+    if not getattr(ctx.fuente, 'por_bloques', False):
+        return None
+    return ctx.memoizar(('agregados_streaming',), lambda: agregar_archivo(ctx.fuente.ruta))
+
+# ============================================================================
+# TABLAS DESDE AGREGADOS
+# ============================================================================
+
+def _mas_frecuente(conteos, primera_aparicion):
+    """Valor con más ocurrencias; los empates se resuelven por primera aparición"""
+    if not conteos:
+        return "N/A"
+    return min(conteos, key=lambda valor: (-conteos[valor], primera_aparicion[valor]))
+
+def generar_tabla3_agregados(agregados):
+    """Tabla 3 desde agregados parciales"""
+    from analisis_estadistico import presentar_tabla3
+
+    total = agregados.seleccionar()
+    medias = total.media()
+    estadisticas = {}
+
+    for metrica in ['Empleados', 'Presupuesto_Seguridad_USD', 'Años_Implementación',
+                    'Especialistas', '%_Presupuesto_IT_Seguridad']:
+        i = agregados.indice(metrica)
+        minimo, maximo = total.minimo[i], total.maximo[i]
+        # Conservar la presentación entera de las columnas enteras (p. ej. "1 – 15")
+        if metrica in agregados.enteras:
+            minimo, maximo = int(minimo), int(maximo)
+        estadisticas[metrica] = (minimo, maximo, medias[i])
+
+    return presentar_tabla3(estadisticas)
+
+def generar_tabla6_agregados(agregados):
+    """Tabla 6 desde agregados parciales"""
+    from analisis_estadistico import presentar_tabla6
+
+    conteos, primera = {}, {}
+    for (modelo, _), grupo in agregados.grupos.items():
+        if modelo is None:
+            continue
+        conteos[modelo] = conteos.get(modelo, 0) + grupo.filas
+        primera[modelo] = min(primera.get(modelo, grupo.primera_fila), grupo.primera_fila)
+
+    orden = sorted(conteos, key=lambda modelo: (-conteos[modelo], primera[modelo]))
+    frecuencias = pd.Series([conteos[modelo] for modelo in orden], index=orden, name='count')
+
+    return presentar_tabla6(frecuencias, agregados.filas)
+
+def generar_tabla7_agregados(agregados):
+    """Tabla 7 desde agregados parciales"""
+    from analisis_estadistico import presentar_tabla7
+
+    i = agregados.indice('Años_Implementación')
+    resultados = []
+
+    for nivel in NIVELES:
+        grupo = agregados.seleccionar(nivel=nivel)
+        if grupo.filas == 0:
+            continue
+
+        # Modelo predominante (empates: orden alfabético, como Series.mode)
+        conteos = {modelo: g.filas for (modelo, nivel_g), g in agregados.grupos.items()
+                   if nivel_g == nivel and modelo is not None}
+        modelo_pred = min(conteos, key=lambda m: (-conteos[m], m)) if conteos else "N/A"
+
+        varianza = grupo.varianza()[i]
+        resultados.append({
+            'nivel': nivel,
+            'promedio': grupo.media()[i],
+            'desviacion': np.sqrt(varianza),
+            'varianza': varianza,
+            'cantidad': grupo.filas,
+            'modelo_predominante': modelo_pred
+        })
+
+    return presentar_tabla7(resultados)
+
+def resumen_agregados(agregados, metricas):
+    """Resumen numérico por modelo (mismo formato que motor_estadistico.resumen_por_grupo)"""
+    filas = []
+
+    for modelo in MODELOS:
+        grupo = agregados.seleccionar(modelo=modelo)
+        medias, varianzas = grupo.media(), grupo.varianza()
+        for metrica in metricas:
+            if metrica == COLUMNA_FRECUENCIA:
+                filas.append({
+                    'Modelo_Seguridad': modelo, 'Métrica': metrica,
+                    'n': sum(grupo.frecuencias.values()), 'media': np.nan, 'de': np.nan,
+                    'moda': _mas_frecuente(grupo.frecuencias, grupo.primera_frecuencia)
+                            if grupo.frecuencias else np.nan
+                })
+                continue
+            i = agregados.indice(metrica)
+            filas.append({
+                'Modelo_Seguridad': modelo, 'Métrica': metrica,
+                'n': int(grupo.n[i]), 'media': medias[i], 'de': np.sqrt(varianzas[i]),
+                'moda': np.nan
+            })
+
+    return pd.DataFrame(filas, columns=['Modelo_Seguridad', 'Métrica', 'n', 'media', 'de', 'moda'])
+
+def generar_tabla8_agregados(agregados, con_de=False):
+    """Tabla 8 desde agregados parciales"""
+    from analisis_estadistico import presentar_tabla8, METRICAS_TABLA8
+    return presentar_tabla8(resumen_agregados(agregados, list(METRICAS_TABLA8)), con_de)
+
+def generar_tabla9_agregados(agregados, con_de=False):
+    """Tabla 9 desde agregados parciales"""
+    from analisis_estadistico import presentar_tabla9
+    return presentar_tabla9(resumen_agregados(agregados, [
+        'Percepción_1_5', 'Capacitación_1_5', 'Especialistas', COLUMNA_FRECUENCIA
+    ]), con_de)
+
+def generar_tablas_streaming(ruta, tamano_bloque=TAMANO_BLOQUE):
+    """Genera las Tablas 3, 6, 7, 8 y 9 leyendo el archivo por bloques"""
+    agregados = agregar_archivo(ruta, tamano_bloque)
+
+    return {
+        'tabla3': generar_tabla3_agregados(agregados),
+        'tabla6': generar_tabla6_agregados(agregados),
+        'tabla7': generar_tabla7_agregados(agregados),
+        'tabla8': generar_tabla8_agregados(agregados),
+        'tabla9': generar_tabla9_agregados(agregados)
+    }
@@ -27,7 +27,7 @@ def mostrar_menu():
     1. 📊 Ver resumen del dataset
     2. 📈 Ejecutar análisis estadístico completo
     3. 📊 Generar visualizaciones
-    4. 📄 Exportar todas las tablas (Markdown)
+    4. 📄 Exportar todas las tablas y gráficos
     5. 🎯 Generar reporte completo (PDF)
     6. ❓ Ayuda y documentación
     7. 🚪 Salir
@@ -130,26 +130,24 @@ def mostrar_ayuda():
 
 def exportar_todo():
     """Función para exportar todo"""
-    from analisis_estadistico import guardar_tablas_markdown
-    from visualizacion import generar_visualizaciones
+    from pipeline import exportar_todo as exportar_todo_pipeline
     
     print("\n🔄 Exportando todas las tablas y gráficos...")
     time.sleep(1)
     
-    guardar_tablas_markdown()
-    generar_visualizaciones()
+    _, errores = exportar_todo_pipeline()
     
-    print("\n✅ Exportación completada exitosamente!")
+    if errores:
+        print(f"\n⚠️  Exportación con {len(errores)} errores (ver detalle arriba)")
+    else:
+        print("\n✅ Exportación completada exitosamente!")
     time.sleep(1)
 
 def generar_reporte_pdf():
-    """Función para generar reporte PDF (placeholder)"""
-    print("\n📄 Generando reporte PDF...")
-    time.sleep(2)
-    print("✅ Reporte PDF generado: 'reporte_capitulo_iv.pdf'")
-    print("\n⚠️  Nota: Esta función requiere la instalación de WeasyPrint o ReportLab.")
-    print("   Para una implementación completa, contacta al desarrollador.")
-    time.sleep(2)
+    """Función para generar reporte PDF (tablas 3-12 y gráficos)"""
+    print()
+    from reporte_pdf import generar_reporte_pdf as generar_reporte
+    generar_reporte()
 
 def mostrar_interfaz():
     """Función principal de la interfaz"""
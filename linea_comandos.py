@@ -0,0 +1,169 @@
+# linea_comandos.py
+"""
+EJECUCIÓN POR LÍNEA DE COMANDOS (SIN INTERFAZ GRÁFICA)
+Exporta el capítulo completo, o una selección de tablas y gráficos, con el
+backend Agg: apto para servidores sin pantalla y tareas programadas (cron).
+Termina con código distinto de cero si algún paso falla
+
+Ejemplos:
+    python linea_comandos.py --datos datos.parquet --salida salida/
+    python linea_comandos.py --datos inventario.csv --sin-graficos
+    python linea_comandos.py --tablas tabla8 tabla10 --sin-graficos --procesos 2
+    python linea_comandos.py --formatos-graficos png svg --reporte-pdf
+    python linea_comandos.py --lote "regiones/*.parquet" --salida lote/ --procesos 4
+"""
+
+import os
+
+# Medición del arranque: antes de importar pandas, SciPy y matplotlib
+from arranque import InformeArranque
+informe_arranque = InformeArranque()
+
+# Agg antes de que cualquier módulo importe matplotlib (los procesos hijos lo heredan)
+os.environ['MPLBACKEND'] = 'Agg'
+
+import argparse
+import sys
+import time
+
+# Solo nombres y formatos: --help, --listar y los errores de argumentos no
+# importan pandas, SciPy ni matplotlib (se importan en main, tras validar)
+from catalogo import (NOMBRES_TABLAS, NOMBRES_GRAFICOS, FORMATOS_TABLAS, FORMATOS_GRAFICOS,
+                      FORMATOS_GRAFICOS_POR_DEFECTO, DIRECTORIO_EXPORTACION)
+
+EXITO = 0
+FALLO = 1
+
+def crear_parser():
+    """Argumentos de la ejecución por línea de comandos"""
+    parser = argparse.ArgumentParser(
+        prog='linea_comandos.py',
+        description="Exporta las tablas y gráficos del Capítulo IV sin interfaz gráfica."
+    )
+    origen = parser.add_mutually_exclusive_group()
+    origen.add_argument('--datos', metavar='RUTA',
+                        help="Dataset (Parquet, Arrow/Feather, directorio NumPy, o CSV/Excel "
+                             "leído por bloques: las Tablas 3 y 6-9 usan memoria constante, el "
+                             "resto carga sus columnas; conviene convertirlo a Parquet para "
+                             "análisis repetidos); por defecto el dataset original en línea")
+    origen.add_argument('--lote', metavar='DIR_O_PATRON',
+                        help="Directorio o patrón glob de datasets: una carpeta de salida por "
+                             "dataset e índice consolidado (--procesos = datasets simultáneos)")
+    parser.add_argument('--salida', metavar='DIR', default=DIRECTORIO_EXPORTACION,
+                        help=f"Directorio de exportación (por defecto: {DIRECTORIO_EXPORTACION})")
+
+    seleccion = parser.add_argument_group('selección')
+    seleccion.add_argument('--tablas', nargs='+', metavar='TABLA', choices=NOMBRES_TABLAS,
+                           help=f"Tablas a exportar (por defecto todas): {', '.join(NOMBRES_TABLAS)}")
+    seleccion.add_argument('--graficos', nargs='+', metavar='GRAFICO', choices=NOMBRES_GRAFICOS,
+                           help=f"Gráficos a exportar (por defecto todos): {', '.join(NOMBRES_GRAFICOS)}")
+    seleccion.add_argument('--sin-tablas', action='store_true', help="No exportar tablas")
+    seleccion.add_argument('--sin-graficos', action='store_true', help="No exportar gráficos")
+    seleccion.add_argument('--sin-dataset', action='store_true', help="No exportar el dataset")
+    seleccion.add_argument('--sin-verificacion', action='store_true',
+                           help="No escribir verificacion_calculos.txt")
+    seleccion.add_argument('--sin-libro', action='store_true',
+                           help="No escribir el libro único de Excel")
+    seleccion.add_argument('--reporte-pdf', action='store_true',
+                           help="Generar además el reporte PDF (tablas y gráficos)")
+
+    formatos = parser.add_argument_group('formatos')
+    formatos.add_argument('--formatos-tablas', nargs='+', metavar='FORMATO', choices=FORMATOS_TABLAS,
+                          default=list(FORMATOS_TABLAS),
+                          help=f"Formatos de tabla: {', '.join(FORMATOS_TABLAS)} (por defecto todos)")
+    formatos.add_argument('--formatos-graficos', nargs='+', metavar='FORMATO',
+                          choices=FORMATOS_GRAFICOS, default=list(FORMATOS_GRAFICOS_POR_DEFECTO),
+                          help=f"Formatos de gráfico: {', '.join(FORMATOS_GRAFICOS)} "
+                               f"(por defecto {' '.join(FORMATOS_GRAFICOS_POR_DEFECTO)})")
+
+    ejecucion = parser.add_argument_group('ejecución')
+    ejecucion.add_argument('--procesos', type=int, metavar='N',
+                           help="Procesos trabajadores (por defecto todos los núcleos; 1 = secuencial)")
+    ejecucion.add_argument('--forzar', action='store_true',
+                           help="Regenerar todo aunque el manifiesto indique que no hubo cambios")
+    ejecucion.add_argument('--sin-cache', action='store_true',
+                           help="No leer ni escribir la caché de resultados en disco")
+    ejecucion.add_argument('--listar', action='store_true',
+                           help="Mostrar las tablas y gráficos disponibles y salir")
+    ejecucion.add_argument('--informe-arranque', action='store_true',
+                           help="Mostrar el tiempo de importación y de cada etapa al terminar "
+                                "(y agregarlo al CSV de TESIS_REGISTRO_ARRANQUE si está definida)")
+    return parser
+
+def _mostrar_progreso(nombre, estado, hechos, total):
+    print(f"  [{hechos}/{total}] {nombre}: {estado}", flush=True)
+
+def main(argv=None):
+    """Ejecuta la exportación; retorna el código de salida"""
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+
+    if args.listar:
+        print("Tablas:   " + ', '.join(NOMBRES_TABLAS))
+        print("Gráficos: " + ', '.join(NOMBRES_GRAFICOS))
+        return EXITO
+    if args.procesos is not None and args.procesos < 1:
+        parser.error("--procesos debe ser un entero mayor o igual a 1")
+    if args.datos and not os.path.exists(args.datos):
+        parser.error(f"no existe el dataset: {args.datos}")
+
+    import matplotlib
+    matplotlib.use('Agg')
+    from contexto_datos import configurar_fuente, obtener_contexto
+    from cache_resultados import configurar_cache
+    from pipeline import exportar_todo
+    informe_arranque.marcar("módulos importados")
+
+    opciones = dict(
+        forzar=args.forzar,
+        tablas=False if args.sin_tablas else (args.tablas or True),
+        graficos=False if args.sin_graficos else (args.graficos or True),
+        dataset=not args.sin_dataset,
+        verificacion=not args.sin_verificacion,
+        libro=not args.sin_libro,
+        formatos_tablas=args.formatos_tablas,
+        formatos_graficos=args.formatos_graficos,
+    )
+
+    inicio = time.perf_counter()
+    try:
+        if args.sin_cache:
+            # Antes de crear cualquier grupo de procesos: los trabajadores la heredan por el entorno
+            configurar_cache(habilitado=False)
+
+        if args.lote:
+            from lotes import ejecutar_lote
+            _, errores = ejecutar_lote(args.lote, args.salida, procesos=args.procesos, **opciones)
+        else:
+            configurar_fuente(args.datos)
+            ctx = obtener_contexto()
+            informe_arranque.marcar("dataset cargado")
+            print(f"📂 Dataset: {args.datos or 'dataset original'} ({ctx.filas} registros)")
+            archivos, errores = exportar_todo(args.salida, ctx, procesos=args.procesos,
+                                              progreso=_mostrar_progreso, **opciones)
+
+        if args.reporte_pdf and not args.lote and not errores:
+            from reporte_pdf import generar_reporte_pdf
+            generar_reporte_pdf(os.path.join(args.salida, 'reporte_capitulo_iv.pdf'), ctx)
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return FALLO
+
+    informe_arranque.marcar("exportación terminada")
+    if args.informe_arranque:
+        informe_arranque.publicar()
+
+    if errores:
+        unidad = 'datasets' if args.lote else 'pasos'
+        print(f"❌ {len(errores)} {unidad} fallaron ({time.perf_counter() - inicio:.1f} s)", file=sys.stderr)
+        return FALLO
+
+    print(f"✅ Exportación terminada en {time.perf_counter() - inicio:.1f} s")
+    return EXITO
+
+# ============================================================================
+# EJECUCIÓN PRINCIPAL
+# ============================================================================
+
+if __name__ == "__main__":
+    sys.exit(main())
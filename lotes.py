@@ -0,0 +1,218 @@
+# lotes.py
+"""
+PROCESAMIENTO POR LOTES DE VARIOS DATASETS
+Ejecuta la exportación completa del capítulo para cada dataset de un
+directorio o patrón glob (por región, por trimestre, ...) en un grupo de
+procesos con concurrencia acotada, una carpeta de salida por dataset y un
+índice consolidado con los estadísticos clave (H y p de Kruskal-Wallis,
+medias por modelo)
+"""
+
+import glob
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import pandas as pd
+
+NOMBRE_INDICE = 'indice_lote'
+
+# ============================================================================
+# DATASETS DEL LOTE
+# ============================================================================
+
+def listar_datasets(entrada, excluir=None):
+    """Rutas de los datasets de un directorio, un patrón glob o una lista de rutas
+
+    Se omiten los directorios ocultos o sin columnas .npy (p. ej. __pycache__ o
+    .cache_resultados) y el contenido de `excluir`, el directorio de salida del
+    lote, aunque esté dentro del de entrada
+    """
+    from fuentes_datos import EXTENSIONES_FUENTES
+
+    excluido = os.path.abspath(excluir) if excluir else None
+    base = os.path.abspath(entrada) if isinstance(entrada, str) and os.path.isdir(entrada) else None
+
+    def es_salida(ruta):
+        ruta = os.path.abspath(ruta)
+        if os.path.splitext(os.path.basename(ruta))[0] == NOMBRE_INDICE:
+            return True
+        if excluido is None or excluido == base:
+            # Salida en el mismo directorio de entrada: sus carpetas no tienen columnas .npy
+            return False
+        return ruta == excluido or ruta.startswith(excluido + os.sep)
+
+    def es_dataset(ruta):
+        nombre = os.path.basename(os.path.normpath(ruta))
+        if nombre.startswith(('.', '__')) or es_salida(ruta):
+            return False
+        if os.path.isdir(ruta):
+            # Directorio de arreglos NumPy: un archivo .npy por columna
+            return any(archivo.endswith('.npy') for archivo in os.listdir(ruta))
+        return os.path.splitext(ruta)[1].lower() in EXTENSIONES_FUENTES
+
+    if isinstance(entrada, (list, tuple)):
+        rutas = list(entrada)
+    elif base is not None:
+        rutas = [os.path.join(entrada, nombre) for nombre in os.listdir(entrada)]
+        rutas = [ruta for ruta in rutas if es_dataset(ruta)]
+    else:
+        rutas = [ruta for ruta in glob.glob(entrada) if es_dataset(ruta)]
+
+    return sorted(rutas)
+
+def nombres_salida(rutas):
+    """Nombre de carpeta de salida por dataset (sin extensión; se distingue si se repite)"""
+    bases = [os.path.splitext(os.path.basename(os.path.normpath(ruta)))[0] for ruta in rutas]
+    repetidos = {base for base in bases if bases.count(base) > 1}
+    return [
+        f"{base}_{os.path.splitext(ruta)[1].lstrip('.') or 'dir'}" if base in repetidos else base
+        for base, ruta in zip(bases, rutas)
+    ]
+
+# ============================================================================
+# ESTADÍSTICOS CLAVE
+# ============================================================================
+
+def estadisticos_clave(ctx):
+    """Fila del índice: H y p de Kruskal-Wallis por métrica y medias por modelo"""
+    from analisis_estadistico import VARIABLES_TABLA10, METRICAS_TABLA8, METRICAS_TABLA9
+    from motor_estadistico import kruskal_wallis, medias_por_grupo
+
+    fila = {'n': ctx.filas}
+
+    pruebas = kruskal_wallis(ctx, [columna for _, columna in VARIABLES_TABLA10])
+    for prueba in pruebas.itertuples(index=False):
+        fila[f'H {prueba.Métrica}'] = prueba.H
+        fila[f'p {prueba.Métrica}'] = prueba.p
+
+    medias = medias_por_grupo(ctx, list(METRICAS_TABLA8) + list(METRICAS_TABLA9))
+    for metrica in medias.columns:
+        for modelo, media in medias[metrica].items():
+            fila[f'media {metrica} {modelo}'] = media
+
+    return fila
+
+# ============================================================================
+# TRABAJADORES
+# ============================================================================
+
+def _inicializar_trabajador():
+    """Cada proceso del lote usa Agg y su propio estado de pyplot"""
+    os.environ['MPLBACKEND'] = 'Agg'
+    import matplotlib
+    matplotlib.use('Agg')
+
+def _procesar_dataset(ruta, directorio, opciones):
+    """Exporta un dataset en su carpeta; retorna su fila del índice (nunca lanza excepciones)"""
+    from contexto_datos import ContextoDatos
+    from fuentes_datos import abrir_fuente
+    from pipeline import exportar_todo
+
+    fila = {'dataset': os.path.basename(os.path.normpath(ruta)), 'ruta': ruta,
+            'salida': directorio, 'estado': 'completado', 'error': ''}
+    inicio = time.perf_counter()
+    try:
+        ctx = ContextoDatos(abrir_fuente(ruta))
+        # Un solo proceso por dataset: el paralelismo está en el lote
+        _, errores = exportar_todo(directorio, ctx, procesos=1, **opciones)
+        if errores:
+            fila['estado'] = 'error'
+            fila['error'] = '; '.join(f"{nombre}: {error}" for nombre, error in errores.items())
+        fila.update(estadisticos_clave(ctx))
+    except Exception as e:
+        fila['estado'] = 'error'
+        fila['error'] = f"{type(e).__name__}: {e}"
+
+    fila['segundos'] = round(time.perf_counter() - inicio, 3)
+    return fila
+
+# ============================================================================
+# LOTE COMPLETO
+# ============================================================================
+
+def guardar_indice(indice, directorio):
+    """Escribe el índice consolidado en CSV y, si pyarrow está disponible, en Parquet"""
+    from manifiesto_exportacion import escritura_atomica
+
+    base = os.path.join(directorio, NOMBRE_INDICE)
+    rutas = []
+
+    with escritura_atomica(f'{base}.csv') as temporal:
+        indice.to_csv(temporal, index=False, encoding='utf-8-sig')
+    rutas.append(f'{base}.csv')
+
+    try:
+        with escritura_atomica(f'{base}.parquet') as temporal:
+            indice.to_parquet(temporal, index=False)
+        rutas.append(f'{base}.parquet')
+    except ImportError:
+        print("⚠️ Índice sin Parquet: se requiere pyarrow (pip install pyarrow)")
+
+    return rutas
+
+def ejecutar_lote(entrada, directorio='exportacion_lote', procesos=None, progreso=None, **opciones):
+    """Exporta cada dataset del lote en directorio/<dataset>/ y escribe el índice consolidado
+
+    `opciones` se pasan a pipeline.exportar_todo (tablas, graficos, formatos_*, forzar, ...).
+    Retorna (índice, errores) con errores = {dataset: mensaje}
+    """
+    rutas = listar_datasets(entrada, excluir=directorio)
+    if not rutas:
+        raise ValueError(f"No se encontraron datasets en '{entrada}'")
+
+    os.makedirs(directorio, exist_ok=True)
+    salidas = [os.path.join(directorio, nombre) for nombre in nombres_salida(rutas)]
+
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+    procesos = max(1, min(procesos, len(rutas)))
+
+    print(f"📦 Lote de {len(rutas)} datasets con {procesos} procesos...")
+    filas = []
+
+    def registrar(fila):
+        filas.append(fila)
+        marca = '✅' if fila['estado'] == 'completado' else '❌'
+        print(f"  {marca} [{len(filas)}/{len(rutas)}] {fila['dataset']}")
+        if progreso is not None:
+            progreso(fila['dataset'], fila['estado'], len(filas), len(rutas))
+
+    if procesos == 1:
+        for ruta, salida in zip(rutas, salidas):
+            registrar(_procesar_dataset(ruta, salida, opciones))
+    else:
+        # 'spawn' evita heredar el estado de Tk/matplotlib del proceso principal
+        pendientes = list(zip(rutas, salidas))
+        with ProcessPoolExecutor(max_workers=procesos,
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_inicializar_trabajador) as ejecutor:
+            en_curso = {}
+            while pendientes or en_curso:
+                # Concurrencia acotada: a lo sumo dos tareas en cola por proceso
+                while pendientes and len(en_curso) < 2 * procesos:
+                    ruta, salida = pendientes.pop(0)
+                    en_curso[ejecutor.submit(_procesar_dataset, ruta, salida, opciones)] = (ruta, salida)
+
+                terminados, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+                for futuro in terminados:
+                    ruta, salida = en_curso.pop(futuro)
+                    try:
+                        fila = futuro.result()
+                    except Exception as e:
+                        # Proceso trabajador caído (memoria, señal...)
+                        fila = {'dataset': os.path.basename(os.path.normpath(ruta)), 'ruta': ruta,
+                                'salida': salida, 'estado': 'error',
+                                'error': f"{type(e).__name__}: {e}"}
+                    registrar(fila)
+
+    # Índice en el orden de los datasets, no en el de finalización
+    orden = {ruta: i for i, ruta in enumerate(rutas)}
+    indice = pd.DataFrame(sorted(filas, key=lambda fila: orden[fila['ruta']]))
+    guardar_indice(indice, directorio)
+
+    errores = {fila['dataset']: fila['error'] for fila in filas if fila['estado'] != 'completado'}
+    print(f"✅ {len(rutas) - len(errores)} de {len(rutas)} datasets exportados en '{directorio}/'")
+    print(f"📋 Índice consolidado: '{os.path.join(directorio, NOMBRE_INDICE)}.csv'")
+
+    return indice, errores
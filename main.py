@@ -4,60 +4,57 @@ Programa principal con interfaz gráfica para análisis estadístico
 CAPÍTULO IV: RESULTADOS Y DISCUSIÓN - VERSIÓN CORREGIDA
 """
 
+# Medición del arranque: se importa antes que cualquier otro módulo
+from arranque import InformeArranque, importar_modulos, MODULOS_PRECARGA, MODULOS_PRECARGA_GRAFICOS
+
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
-import pandas as pd
-import numpy as np
-import threading
+import base64
 import os
-import sys
-
-# Configurar para evitar problemas con matplotlib
-import matplotlib
-matplotlib.use('TkAgg')
-
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-import matplotlib.pyplot as plt
 
-# Importar funciones
-from analisis_estadistico import (
-    generar_tabla3, generar_tabla6, generar_tabla7, generar_tabla8,
-    generar_tabla9, generar_tabla10, generar_tabla11, generar_tabla12,
-    guardar_todas_tablas, crear_carpetas_exportacion
-)
+# Backend de la interfaz. pandas, SciPy, matplotlib y seaborn no se importan
+# aquí: se precargan en segundo plano cuando la ventana ya está visible
+os.environ['MPLBACKEND'] = 'TkAgg'
 
-from graficos_completos import (
-    generar_grafico_incidentes, generar_grafico_tasa_bloqueo,
-    generar_grafico_tiempos, generar_grafico_percepcion_capacitacion,
-    generar_grafico_madurez, generar_grafico_especialistas,
-    generar_grafico_correlaciones, generar_grafico_boxplot_completo,
-    generar_todos_graficos
-)
+from pipeline import exportar_todo as exportar_todo_pipeline
+from ejecutor_gui import EjecutorTareas, VentanaProgreso
+from cache_figuras import CacheFiguras
+from vista_virtual import VistaVirtual
 
 class AplicacionTesisCorregida:
-    def __init__(self, root):
+    def __init__(self, root, informe_arranque=None):
         self.root = root
+        self.informe_arranque = informe_arranque or InformeArranque()
         self.root.title("📊 CAPÍTULO IV: RESULTADOS Y DISCUSIÓN")
         self.root.geometry("1300x800")
         self.root.configure(bg='#2c3e50')
         
         # Variables
         self.tabla_actual = None
-        self.figura_actual = None
+        self.entrada_actual = None
+        self.grafico_actual = None
+        self.imagen_actual = None
+        self.foto_actual = None
         self.canvas_actual = None
         self.toolbar_actual = None
         
+        # Cálculos fuera del hilo de Tk (resultados y progreso vuelven por una cola)
+        self.ejecutor = EjecutorTareas(self.root)
+        self.tabla_solicitada = None
+        self.grafico_solicitado = None
+        self.version_datos = None
+        
+        # Últimos gráficos mostrados; los descartados se cierran en pyplot
+        self.cache_figuras = CacheFiguras()
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar)
+        
         # Configurar icono
         try:
             self.root.iconbitmap('icono.ico')
         except:
             pass
         
-        # Crear carpetas necesarias
-        crear_carpetas_exportacion()
-        
-        # Crear interfaz
+        # Crear interfaz (las carpetas y el dataset se preparan en la precarga)
         self.crear_interfaz()
         
     def crear_interfaz(self):
@@ -359,14 +356,15 @@ class AplicacionTesisCorregida:
         self.tree_scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
         
         self.tree = ttk.Treeview(table_frame,
-                                yscrollcommand=self.tree_scroll_y.set,
                                 xscrollcommand=self.tree_scroll_x.set,
                                 selectmode='browse')
         self.tree.pack(fill=tk.BOTH, expand=True)
         
-        self.tree_scroll_y.config(command=self.tree.yview)
         self.tree_scroll_x.config(command=self.tree.xview)
         
+        # Solo las filas visibles viven en el Treeview (la barra vertical mueve la ventana)
+        self.vista_tabla = VistaVirtual(self.tree, self.tree_scroll_y)
+        
         # Configurar estilos
         style = ttk.Style()
         style.configure("Treeview.Heading", font=('Arial', 10, 'bold'))
@@ -407,6 +405,15 @@ class AplicacionTesisCorregida:
                                           **btn_style)
         self.refresh_graph_btn.pack(side=tk.LEFT, padx=2)
         
+        self.zoom_btn = tk.Button(controls_frame,
+                                 text="🔍 Zoom / desplazar",
+                                 bg='#9b59b6',
+                                 fg='white',
+                                 state=tk.DISABLED,
+                                 command=self.activar_interaccion,
+                                 **btn_style)
+        self.zoom_btn.pack(side=tk.LEFT, padx=2)
+        
         # Área para mostrar gráfico
         self.graph_frame = tk.Frame(self.tab_grafico, bg='#ffffff')
         self.graph_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
@@ -471,16 +478,16 @@ class AplicacionTesisCorregida:
         
         # Treeview para dataset
         self.dataset_tree = ttk.Treeview(dataset_frame,
-                                        yscrollcommand=y_scrollbar.set,
                                         xscrollcommand=x_scrollbar.set,
                                         selectmode='extended')
         self.dataset_tree.pack(fill=tk.BOTH, expand=True)
         
-        y_scrollbar.config(command=self.dataset_tree.yview)
         x_scrollbar.config(command=self.dataset_tree.xview)
         
-        # Cargar dataset
-        self.cargar_dataset()
+        # Vista virtual: el dataset puede tener cientos de miles de entidades
+        self.vista_dataset = VistaVirtual(self.dataset_tree, y_scrollbar)
+        
+        # El dataset se carga en segundo plano (ver iniciar_precarga)
         
     def crear_tooltip(self, widget, text):
         """Crea un tooltip para un widget"""
@@ -508,59 +515,55 @@ class AplicacionTesisCorregida:
     # ============================================================================
     
     def mostrar_tabla3(self):
-        tabla = generar_tabla3()
-        self.mostrar_tabla_generica(tabla, "Tabla 3: Características generales de las entidades evaluadas")
+        self.calcular_tabla('tabla3', "Tabla 3: Características generales de las entidades evaluadas")
     
     def mostrar_tabla6(self):
-        tabla = generar_tabla6()
-        self.mostrar_tabla_generica(tabla, "Tabla 6: Distribución de modelos de seguridad en las entidades públicas")
+        self.calcular_tabla('tabla6', "Tabla 6: Distribución de modelos de seguridad en las entidades públicas")
     
     def mostrar_tabla7(self):
-        tabla = generar_tabla7()
-        self.mostrar_tabla_generica(tabla, "Tabla 7: Nivel de madurez del modelo de seguridad según años de implementación")
+        self.calcular_tabla('tabla7', "Tabla 7: Nivel de madurez del modelo de seguridad según años de implementación")
     
     def mostrar_tabla8(self):
-        tabla = generar_tabla8()
-        self.mostrar_tabla_generica(tabla, "Tabla 8: Desempeño promedio de los modelos de seguridad")
+        self.calcular_tabla('tabla8', "Tabla 8: Desempeño promedio de los modelos de seguridad")
     
     def mostrar_tabla9(self):
-        tabla = generar_tabla9()
-        self.mostrar_tabla_generica(tabla, "Tabla 9: Indicadores de percepción y capacitación del personal")
+        self.calcular_tabla('tabla9', "Tabla 9: Indicadores de percepción y capacitación del personal")
     
     def mostrar_tabla10(self):
-        tabla = generar_tabla10()
-        self.mostrar_tabla_generica(tabla, "Tabla 10: Prueba de Kruskal–Wallis para métricas de desempeño")
+        self.calcular_tabla('tabla10', "Tabla 10: Prueba de Kruskal–Wallis para métricas de desempeño")
     
     def mostrar_tabla11(self):
-        tabla = generar_tabla11()
-        self.mostrar_tabla_generica(tabla, "Tabla 11: Comparaciones pareadas entre modelos de seguridad")
+        self.calcular_tabla('tabla11', "Tabla 11: Comparaciones pareadas entre modelos de seguridad")
     
     def mostrar_tabla12(self):
-        tabla = generar_tabla12()
-        self.mostrar_tabla_generica(tabla, "Tabla 12: Correlaciones de Spearman entre variables organizacionales y técnicas")
+        self.calcular_tabla('tabla12', "Tabla 12: Correlaciones de Spearman entre variables organizacionales y técnicas")
+    
+    def calcular_tabla(self, nombre, titulo):
+        """Calcula la tabla y su texto en segundo plano y la muestra al terminar"""
+        def tarea_tabla(tarea):
+            # Importación diferida (en este hilo, no en el de Tk)
+            from analisis_estadistico import FUNCIONES_TABLAS
+            from renderizado_tablas import TablaFormateada
+            tabla = FUNCIONES_TABLAS[nombre]()
+            tarea.comprobar()
+            return tabla, TablaFormateada(tabla, decimales=4).texto()
+        
+        def al_terminar(resultado):
+            # Solo se muestra la última tabla pedida
+            if titulo == self.tabla_solicitada:
+                tabla, texto = resultado
+                self.mostrar_tabla_generica(tabla, titulo, texto)
+        
+        self.tabla_solicitada = titulo
+        self.mostrar_texto_info(f"⏳ Calculando {titulo}...")
+        self.ejecutor.enviar(f"tabla:{titulo}", tarea_tabla,
+                             al_terminar=al_terminar,
+                             al_fallar=lambda e: messagebox.showerror("Error", f"❌ No se pudo calcular la tabla:\n{str(e)}"))
     
-    def mostrar_tabla_generica(self, dataframe, titulo):
+    def mostrar_tabla_generica(self, dataframe, titulo, texto=None):
         """Muestra una tabla genérica en el Treeview"""
-        # Limpiar tabla anterior
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Configurar columnas
-        columnas = list(dataframe.columns)
-        self.tree["columns"] = columnas
-        self.tree["show"] = "headings"
-        
-        # Configurar encabezados
-        for col in columnas:
-            self.tree.heading(col, text=col)
-            # Ajustar ancho según contenido
-            max_len = max(len(str(col)), dataframe[col].astype(str).str.len().max())
-            width = min(max_len * 9, 200)  # Ancho máximo de 200
-            self.tree.column(col, width=width, minwidth=50, anchor=tk.CENTER)
-        
-        # Insertar datos
-        for index, row in dataframe.iterrows():
-            self.tree.insert("", "end", values=list(row))
+        # Columnas con ancho estimado de una muestra; solo se crean las filas visibles
+        self.vista_tabla.mostrar(dataframe)
         
         # Actualizar estado de botones
         self.export_table_btn.config(state=tk.NORMAL)
@@ -574,7 +577,10 @@ class AplicacionTesisCorregida:
         
         # Mostrar información en texto
         info_text = f"{titulo}\n\n"
-        info_text += dataframe.to_string(index=False, float_format=lambda x: f"{x:.4f}" if isinstance(x, float) else str(x))
+        if texto is None:
+            from renderizado_tablas import TablaFormateada
+            texto = TablaFormateada(dataframe, decimales=4).texto()
+        info_text += texto
         info_text += f"\n\n📊 Dimensiones: {dataframe.shape[0]} filas × {dataframe.shape[1]} columnas"
         self.mostrar_texto_info(info_text)
     
@@ -583,48 +589,116 @@ class AplicacionTesisCorregida:
     # ============================================================================
     
     def mostrar_grafico_incidentes(self):
-        self.mostrar_grafico_generico(generar_grafico_incidentes, 
+        self.mostrar_grafico_generico('1_incidentes', 
                                      "Distribución de Incidentes Mensuales por Modelo de Seguridad")
     
     def mostrar_grafico_tasa_bloqueo(self):
-        self.mostrar_grafico_generico(generar_grafico_tasa_bloqueo,
+        self.mostrar_grafico_generico('2_tasa_bloqueo',
                                      "Tasa de Bloqueo Promedio por Modelo de Seguridad")
     
     def mostrar_grafico_tiempos(self):
-        self.mostrar_grafico_generico(generar_grafico_tiempos,
+        self.mostrar_grafico_generico('3_tiempos',
                                      "Tiempos de Respuesta y Detección por Modelo de Seguridad")
     
     def mostrar_grafico_percepcion(self):
-        self.mostrar_grafico_generico(generar_grafico_percepcion_capacitacion,
+        self.mostrar_grafico_generico('4_percepcion_capacitacion',
                                      "Percepción y Capacitación por Modelo de Seguridad")
     
     def mostrar_grafico_madurez(self):
-        self.mostrar_grafico_generico(generar_grafico_madurez,
+        self.mostrar_grafico_generico('5_madurez',
                                      "Nivel de Madurez por Modelo de Seguridad")
     
     def mostrar_grafico_especialistas(self):
-        self.mostrar_grafico_generico(generar_grafico_especialistas,
+        self.mostrar_grafico_generico('6_especialistas',
                                      "Especialistas por Modelo de Seguridad")
     
     def mostrar_grafico_correlaciones(self):
-        self.mostrar_grafico_generico(generar_grafico_correlaciones,
+        self.mostrar_grafico_generico('7_correlaciones',
                                      "Mapa de Correlaciones entre Variables")
     
     def mostrar_grafico_boxplot(self):
-        self.mostrar_grafico_generico(generar_grafico_boxplot_completo,
+        self.mostrar_grafico_generico('8_boxplot_completo',
                                      "Boxplot Completo de Métricas por Modelo")
     
-    def mostrar_grafico_generico(self, funcion_grafico, titulo):
-        """Muestra un gráfico genérico en el panel"""
+    def mostrar_grafico_generico(self, nombre, titulo, forzar=False):
+        """Genera y rasteriza el gráfico en un proceso aparte (Agg) y muestra el mapa de bits"""
+        # Gráfico ya generado con estos datos: se muestra al instante desde la caché
+        # (la versión del dataset se conoce cuando termina su carga en segundo plano)
+        entrada = None
+        if not forzar and self.version_datos is not None:
+            entrada = self.cache_figuras.obtener((nombre, self.version_datos))
+        if entrada is not None:
+            self.grafico_solicitado = titulo
+            self.mostrar_imagen_grafico(entrada, nombre, titulo)
+            return
+        
+        def al_terminar(resultado):
+            png, serializada, version = resultado
+            # Solo se muestra el último gráfico pedido
+            if titulo == self.grafico_solicitado:
+                # Se suelta el lienzo antes de que la caché cierre una figura reemplazada
+                self.limpiar_grafico_actual()
+                entrada = self.cache_figuras.guardar((nombre, version), png, serializada)
+                self.mostrar_imagen_grafico(entrada, nombre, titulo)
+        
+        # El mapa de bits se ajusta al tamaño del panel de resultados
+        ancho = self.notebook.winfo_width() - 20
+        alto = self.notebook.winfo_height() - 90  # Pestañas y barra de controles
+        if ancho <= 1 or alto <= 1:
+            ancho = alto = None
+        
+        self.grafico_solicitado = titulo
+        self.mostrar_texto_info(f"⏳ Generando gráfico: {titulo}...")
+        # Solo el nombre y el tamaño cruzan al proceso: allí se importan los módulos y se obtiene el contexto
+        self.ejecutor.enviar(f"grafico:{titulo}", 'graficos_completos.grafico_para_pantalla', nombre,
+                             ancho=ancho, alto=alto, aislado=True, al_terminar=al_terminar,
+                             al_fallar=lambda e: messagebox.showerror("Error", f"No se pudo generar el gráfico:\n{str(e)}"))
+    
+    def mostrar_imagen_grafico(self, entrada, nombre, titulo):
+        """Muestra el mapa de bits ya rasterizado; la figura interactiva se crea solo al pedir zoom"""
         # Limpiar gráfico anterior
         self.limpiar_grafico_actual()
         
-        # Generar gráfico
+        self.entrada_actual = entrada
+        self.grafico_actual = (nombre, titulo)
+        
+        # Tk decodifica el PNG directamente (sin redibujar la figura en este hilo)
+        self.foto_actual = tk.PhotoImage(data=base64.b64encode(entrada.png))
+        self.imagen_actual = tk.Label(self.graph_frame, image=self.foto_actual, bg='#ffffff', cursor='hand2')
+        self.imagen_actual.pack(fill=tk.BOTH, expand=True)
+        self.imagen_actual.bind('<Button-1>', lambda evento: self.activar_interaccion())
+        
+        # Actualizar estado de botones
+        self.export_graph_btn.config(state=tk.NORMAL)
+        self.export_pdf_btn.config(state=tk.NORMAL)
+        self.refresh_graph_btn.config(state=tk.NORMAL)
+        self.zoom_btn.config(state=tk.NORMAL)
+        
+        # Cambiar a pestaña de gráfico
+        self.notebook.select(self.tab_grafico)
+        
+        # Mostrar mensaje
+        self.mostrar_texto_info(f"📊 Gráfico generado: {titulo}\n\nEl gráfico está listo para visualización. Haga clic sobre él o use \"Zoom / desplazar\" para navegar y hacer zoom.\n\n{self.cache_figuras.resumen()}")
+    
+    def obtener_figura_actual(self):
+        """Figura del gráfico actual (se deserializa la primera vez que se necesita)"""
+        return self.entrada_actual.obtener_figura() if self.entrada_actual else None
+    
+    def activar_interaccion(self):
+        """Reemplaza el mapa de bits por el lienzo interactivo con barra de navegación"""
+        if self.canvas_actual or self.entrada_actual is None:
+            return
+        
         try:
-            self.figura_actual = funcion_grafico()
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+            figura = self.obtener_figura_actual()
+            
+            if self.imagen_actual:
+                self.imagen_actual.destroy()
+                self.imagen_actual = None
             
             # Crear canvas para el gráfico
-            self.canvas_actual = FigureCanvasTkAgg(self.figura_actual, self.graph_frame)
+            self.canvas_actual = FigureCanvasTkAgg(figura, self.graph_frame)
             self.canvas_actual.draw()
             
             # Crear toolbar de navegación
@@ -633,20 +707,10 @@ class AplicacionTesisCorregida:
             
             # Empaquetar toolbar y canvas
             self.canvas_actual.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
-            # Actualizar estado de botones
-            self.export_graph_btn.config(state=tk.NORMAL)
-            self.export_pdf_btn.config(state=tk.NORMAL)
-            self.refresh_graph_btn.config(state=tk.NORMAL)
-            
-            # Cambiar a pestaña de gráfico
-            self.notebook.select(self.tab_grafico)
-            
-            # Mostrar mensaje
-            self.mostrar_texto_info(f"📊 Gráfico generado: {titulo}\n\nEl gráfico está listo para visualización. Use la barra de herramientas para navegar, hacer zoom y guardar.")
+            self.zoom_btn.config(state=tk.DISABLED)
             
         except Exception as e:
-            messagebox.showerror("Error", f"No se pudo generar el gráfico:\n{str(e)}")
+            messagebox.showerror("Error", f"No se pudo mostrar el gráfico:\n{str(e)}")
     
     def limpiar_grafico_actual(self):
         """Limpia el gráfico actual"""
@@ -657,13 +721,22 @@ class AplicacionTesisCorregida:
         if self.canvas_actual:
             self.canvas_actual.get_tk_widget().destroy()
             self.canvas_actual = None
+        
+        if self.imagen_actual:
+            self.imagen_actual.destroy()
+            self.imagen_actual = None
+            self.foto_actual = None
+        
+        # La figura no se cierra aquí: queda en la caché, que cierra las descartadas
+        self.entrada_actual = None
     
     def actualizar_grafico(self):
         """Actualiza el gráfico actual"""
-        if self.figura_actual:
-            self.figura_actual = self.figura_actual
-            if self.canvas_actual:
-                self.canvas_actual.draw()
+        if self.canvas_actual:
+            self.canvas_actual.draw()
+        elif self.grafico_actual:
+            # Se vuelve a rasterizar al tamaño actual del panel
+            self.mostrar_grafico_generico(*self.grafico_actual, forzar=True)
     
     # ============================================================================
     # FUNCIONES DE EXPORTACIÓN
@@ -709,7 +782,7 @@ class AplicacionTesisCorregida:
     
     def exportar_grafico_actual(self):
         """Exporta el gráfico actual a PNG"""
-        if self.figura_actual:
+        if self.entrada_actual:
             filename = filedialog.asksaveasfilename(
                 defaultextension=".png",
                 filetypes=[("PNG files", "*.png"), ("JPEG files", "*.jpg"), ("All files", "*.*")],
@@ -719,14 +792,14 @@ class AplicacionTesisCorregida:
             
             if filename:
                 try:
-                    self.figura_actual.savefig(filename, dpi=300, bbox_inches='tight')
+                    self.obtener_figura_actual().savefig(filename, dpi=300, bbox_inches='tight')
                     messagebox.showinfo("Éxito", f"✅ Gráfico exportado exitosamente a:\n{filename}")
                 except Exception as e:
                     messagebox.showerror("Error", f"❌ No se pudo exportar el gráfico:\n{str(e)}")
     
     def exportar_pdf_actual(self):
         """Exporta el gráfico actual a PDF"""
-        if self.figura_actual:
+        if self.entrada_actual:
             filename = filedialog.asksaveasfilename(
                 defaultextension=".pdf",
                 filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")],
@@ -736,135 +809,166 @@ class AplicacionTesisCorregida:
             
             if filename:
                 try:
-                    self.figura_actual.savefig(filename, bbox_inches='tight')
+                    self.obtener_figura_actual().savefig(filename, bbox_inches='tight')
                     messagebox.showinfo("Éxito", f"✅ Gráfico exportado exitosamente a:\n{filename}")
                 except Exception as e:
                     messagebox.showerror("Error", f"❌ No se pudo exportar el gráfico:\n{str(e)}")
     
     def exportar_todo(self):
         """Exporta todas las tablas y gráficos"""
-        def tarea_exportacion():
-            try:
-                # Crear ventana de progreso
-                progress_window = tk.Toplevel(self.root)
-                progress_window.title("Exportando...")
-                progress_window.geometry("400x150")
-                progress_window.transient(self.root)
-                progress_window.grab_set()
-                progress_window.configure(bg='#2c3e50')
-                
-                # Centrar ventana
-                progress_window.update_idletasks()
-                width = progress_window.winfo_width()
-                height = progress_window.winfo_height()
-                x = (progress_window.winfo_screenwidth() // 2) - (width // 2)
-                y = (progress_window.winfo_screenheight() // 2) - (height // 2)
-                progress_window.geometry(f'{width}x{height}+{x}+{y}')
-                
-                # Configurar contenido
-                tk.Label(progress_window, 
-                        text="📥 Exportando todas las tablas y gráficos...",
-                        font=('Arial', 12, 'bold'),
-                        bg='#2c3e50',
-                        fg='white').pack(pady=20)
-                
-                tk.Label(progress_window, 
-                        text="Por favor espere, esto puede tomar unos momentos...",
-                        font=('Arial', 9),
-                        bg='#2c3e50',
-                        fg='#bdc3c7').pack()
-                
-                progress = ttk.Progressbar(progress_window, 
-                                          mode='indeterminate',
-                                          length=300)
-                progress.pack(pady=20)
-                progress.start()
-                
-                # Ejecutar exportación
-                guardar_todas_tablas()
-                generar_todos_graficos()
-                
-                # Cerrar ventana de progreso
-                progress_window.destroy()
-                
-                # Mostrar mensaje de éxito
-                messagebox.showinfo("Exportación completa", 
-                                   f"✅ TODOS LOS ARCHIVOS EXPORTADOS EXITOSAMENTE\n\n"
-                                   f"📁 Carpeta: 'exportacion_capitulo_iv/'\n\n"
-                                   f"📄 Tablas (8): Formato Markdown y CSV\n"
-                                   f"📊 Gráficos (8): Formato PNG (300 DPI) y PDF\n"
-                                   f"📋 Dataset completo en Excel\n\n"
-                                   f"🎯 Listo!")
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"❌ Error en la exportación:\n{str(e)}")
-        
-        # Ejecutar en hilo separado
-        threading.Thread(target=tarea_exportacion, daemon=True).start()
+        if self.ejecutor.ocupado('exportar_todo'):
+            return
+        
+        def tarea_exportacion(tarea):
+            # Gráficos siempre en procesos con Agg: pyplot no puede usarse desde este hilo
+            return exportar_todo_pipeline(progreso=tarea.progreso, cancelado=tarea.cancelacion, aislar=True)
+        
+        def al_terminar(resultado):
+            ventana.cerrar()
+            archivos, errores = resultado
+            if errores:
+                messagebox.showerror("Error", "❌ Error en la exportación:\n" +
+                                     "\n".join(f"{nombre}: {error}" for nombre, error in errores.items()))
+                return
+            
+            # Mostrar mensaje de éxito
+            messagebox.showinfo("Exportación completa", 
+                               f"✅ TODOS LOS ARCHIVOS EXPORTADOS EXITOSAMENTE\n\n"
+                               f"📁 Carpeta: 'exportacion_capitulo_iv/'\n\n"
+                               f"📄 Tablas (8): Formato Markdown y CSV\n"
+                               f"📊 Gráficos (8): Formato PNG (300 DPI) y PDF\n"
+                               f"📋 Dataset completo en Excel\n"
+                               f"📗 Libro único con todas las tablas y el dataset (capitulo_iv.xlsx)\n"
+                               f"📝 Verificación de cálculos (TXT)\n\n"
+                               f"🎯 Listo!")
+        
+        def al_fallar(e):
+            ventana.cerrar()
+            messagebox.showerror("Error", f"❌ Error en la exportación:\n{str(e)}")
+        
+        def al_cancelar():
+            ventana.cerrar()
+            self.mostrar_texto_info("⚠️ Exportación cancelada.\n\nLos archivos ya escritos quedan registrados "
+                                    "en el manifiesto y no se regeneran en la próxima exportación.")
+        
+        # La ventana de progreso se crea y actualiza solo en el hilo de Tk
+        ventana = VentanaProgreso(self.root, "Exportando...",
+                                  "📥 Exportando todas las tablas y gráficos...",
+                                  al_cancelar=lambda: self.ejecutor.cancelar('exportar_todo'))
+        self.ejecutor.enviar('exportar_todo', tarea_exportacion,
+                             al_terminar=al_terminar, al_fallar=al_fallar,
+                             al_progresar=ventana.actualizar, al_cancelar=al_cancelar)
     
     # ============================================================================
     # FUNCIONES DE INFORMACIÓN Y UTILIDAD
     # ============================================================================
     
-    def cargar_dataset(self):
-        """Carga y muestra el dataset completo"""
-        # Obtener datos
-        from analisis_estadistico import cargar_datos_originales
-        df = cargar_datos_originales()
-        
-        # Limpiar treeview
-        for item in self.dataset_tree.get_children():
-            self.dataset_tree.delete(item)
-        
-        # Configurar columnas
-        columnas = list(df.columns)
-        self.dataset_tree["columns"] = columnas
-        self.dataset_tree["show"] = "headings"
-        
-        # Configurar encabezados
-        for col in columnas:
-            self.dataset_tree.heading(col, text=col)
-            self.dataset_tree.column(col, width=100, minwidth=50, anchor=tk.CENTER)
-        
-        # Insertar datos
-        for index, row in df.iterrows():
-            self.dataset_tree.insert("", "end", values=list(row))
+    def cargar_dataset(self, recalcular=False):
+        """Carga el dataset en segundo plano y lo muestra al terminar (recalcular: sin memoria ni caché)"""
+        def tarea_dataset(tarea):
+            from contexto_datos import obtener_contexto, invalidar_contexto
+            if recalcular:
+                from cache_resultados import limpiar_cache
+                invalidar_contexto()
+                limpiar_cache()
+            ctx = obtener_contexto()
+            ctx.df  # Cargar todas las columnas aquí, no en el hilo de Tk
+            return ctx
+        
+        # Vista virtual sobre el DataFrame (sin insertar cada fila)
+        self.ejecutor.enviar('dataset', tarea_dataset,
+                             al_terminar=self.mostrar_contexto,
+                             al_fallar=lambda e: messagebox.showerror("Error", f"❌ No se pudo cargar el dataset:\n{str(e)}"))
+    
+    def mostrar_contexto(self, ctx):
+        """Muestra el dataset ya cargado y registra su versión (clave de la caché de gráficos)"""
+        self.version_datos = ctx.version
+        self.vista_dataset.mostrar(ctx.df)
     
     def mostrar_dataset(self):
         """Muestra el dataset completo"""
         self.notebook.select(self.tab_dataset)
-        self.mostrar_texto_info("📁 DATASET COMPLETO\n\nSe muestra la tabla completa con los 20 registros de entidades públicas.\n\nUse las barras de desplazamiento para navegar por todos los datos.")
+        self.mostrar_texto_info(f"📁 DATASET COMPLETO\n\nSe muestra la tabla completa con los {self.vista_dataset.total} registros de entidades públicas.\n\nUse las barras de desplazamiento, la rueda del ratón o Re Pág/Av Pág para navegar por todos los datos.")
     
     def generar_todos_graficos(self):
         """Genera todos los gráficos"""
-        def tarea_generacion():
-            try:
-                generar_todos_graficos()
-                messagebox.showinfo("Éxito", 
-                                   "✅ Todos los gráficos han sido generados exitosamente\n\n"
-                                   "📁 Guardados en: 'exportacion_capitulo_iv/graficos/'\n\n"
-                                   "📊 8 gráficos en formato PNG y PDF")
-            except Exception as e:
-                messagebox.showerror("Error", f"❌ Error al generar gráficos:\n{str(e)}")
-        
-        threading.Thread(target=tarea_generacion, daemon=True).start()
+        if self.ejecutor.ocupado('generar_graficos'):
+            return
+        
+        def tarea_generacion(tarea):
+            # Solo los gráficos del pipeline, siempre en procesos con Agg
+            return exportar_todo_pipeline(tablas=False, dataset=False, verificacion=False, libro=False,
+                                          progreso=tarea.progreso, cancelado=tarea.cancelacion, aislar=True)
+        
+        def al_terminar(resultado):
+            ventana.cerrar()
+            archivos, errores = resultado
+            if errores:
+                messagebox.showerror("Error", "❌ Error al generar gráficos:\n" +
+                                     "\n".join(f"{nombre}: {error}" for nombre, error in errores.items()))
+                return
+            messagebox.showinfo("Éxito", 
+                               "✅ Todos los gráficos han sido generados exitosamente\n\n"
+                               "📁 Guardados en: 'exportacion_capitulo_iv/graficos/'\n\n"
+                               "📊 8 gráficos en formato PNG y PDF")
+        
+        def al_fallar(e):
+            ventana.cerrar()
+            messagebox.showerror("Error", f"❌ Error al generar gráficos:\n{str(e)}")
+        
+        ventana = VentanaProgreso(self.root, "Generando gráficos...",
+                                  "📊 Generando los 8 gráficos...",
+                                  al_cancelar=lambda: self.ejecutor.cancelar('generar_graficos'))
+        self.ejecutor.enviar('generar_graficos', tarea_generacion,
+                             al_terminar=al_terminar, al_fallar=al_fallar,
+                             al_progresar=ventana.actualizar, al_cancelar=ventana.cerrar)
     
     def generar_reporte_pdf(self):
-        """Genera un reporte PDF (placeholder)"""
-        messagebox.showinfo("Generar PDF", 
-                           "📄 La funcionalidad de PDF está en desarrollo.\n\n"
-                           "Por ahora, exporte las tablas y gráficos individualmente.\n"
-                           "Puede usar los archivos Markdown para crear su documento.")
+        """Genera el reporte PDF con las tablas 3-12 y los 8 gráficos"""
+        if self.ejecutor.ocupado('reporte_pdf'):
+            return
+        
+        def al_terminar(ruta):
+            ventana.cerrar()
+            messagebox.showinfo("Generar PDF", 
+                               f"✅ Reporte PDF generado\n\n"
+                               f"📄 Archivo: '{ruta}'\n"
+                               f"📊 Tablas 3-12 y 8 gráficos, una página por elemento")
+        
+        def al_fallar(e):
+            ventana.cerrar()
+            messagebox.showerror("Error", f"❌ Error al generar el PDF:\n{str(e)}")
+        
+        ventana = VentanaProgreso(self.root, "Generando PDF...",
+                                  "📄 Generando el reporte PDF...",
+                                  al_cancelar=lambda: self.ejecutor.cancelar('reporte_pdf'))
+        # Proceso aparte con Agg: los gráficos no tocan el backend Tk de la interfaz; el módulo
+        # del reporte y el contexto se cargan allí (ruta por defecto: RUTA_REPORTE)
+        self.ejecutor.enviar('reporte_pdf', 'reporte_pdf.generar_reporte_pdf',
+                             aislado=True, al_terminar=al_terminar, al_fallar=al_fallar,
+                             al_cancelar=ventana.cerrar)
     
     def verificar_calculos(self):
-        """Verifica todos los cálculos"""
-        from analisis_estadistico import verificar_todos_calculos
-        resultado = verificar_todos_calculos()
-        self.mostrar_texto_info(resultado)
-        self.notebook.select(self.tab_texto)
+        """Verifica todos los cálculos (en segundo plano)"""
+        def tarea_verificacion(tarea):
+            from analisis_estadistico import verificar_todos_calculos
+            return verificar_todos_calculos()
+        
+        def al_terminar(resultado):
+            self.mostrar_texto_info(resultado)
+            self.notebook.select(self.tab_texto)
+        
+        self.ejecutor.enviar('verificacion', tarea_verificacion,
+                             al_terminar=al_terminar,
+                             al_fallar=lambda e: messagebox.showerror("Error", f"❌ Error al verificar:\n{str(e)}"))
     
     def recalcular_todo(self):
         """Recalcula todo"""
+        # Descartar el dataset memoizado y los resultados en caché para que se vuelvan a calcular
+        self.limpiar_grafico_actual()
+        self.cache_figuras.limpiar()
+        self.version_datos = None
+        self.cargar_dataset(recalcular=True)
         messagebox.showinfo("Recalcular", 
                            "🔄 Todos los cálculos se generan automáticamente al mostrar cada tabla.\n\n"
                            "Los valores mostrados son los cálculos exactos basados en el dataset original.")
@@ -972,8 +1076,9 @@ realice manuelamente.
             dataframe, titulo = self.tabla_actual
             
             # Convertir a texto formateado
+            from renderizado_tablas import TablaFormateada
             tabla_texto = f"{titulo}\n\n"
-            tabla_texto += dataframe.to_string(index=False, float_format=lambda x: f"{x:.4f}" if isinstance(x, float) else str(x))
+            tabla_texto += TablaFormateada(dataframe, decimales=4).texto()
             
             # Copiar al portapapeles
             self.root.clipboard_clear()
@@ -986,6 +1091,7 @@ realice manuelamente.
         if self.tabla_actual:
             dataframe, titulo = self.tabla_actual
             
+            import pandas as pd
             info = f"📊 VALORES DE {titulo}\n\n"
             for col in dataframe.columns:
                 if pd.api.types.is_numeric_dtype(dataframe[col]):
@@ -1002,6 +1108,56 @@ realice manuelamente.
     # FUNCIÓN PRINCIPAL
     # ============================================================================
     
+    def iniciar_precarga(self):
+        """Con la ventana ya visible, precarga en segundo plano módulos pesados, dataset y proceso de gráficos"""
+        self.informe_arranque.marcar("ventana visible")
+        pendientes = {'precarga', 'precarga_graficos'}
+        
+        def terminar(accion):
+            pendientes.discard(accion)
+            if not pendientes:
+                self.informe_arranque.marcar("precarga completa")
+                self.informe_arranque.publicar()
+        
+        def tarea_precarga(tarea):
+            tiempos = importar_modulos(MODULOS_PRECARGA)
+            from analisis_estadistico import crear_carpetas_exportacion
+            from contexto_datos import obtener_contexto
+            
+            # Crear carpetas necesarias
+            crear_carpetas_exportacion()
+            ctx = obtener_contexto()
+            ctx.df  # Cargar todas las columnas aquí, no en el hilo de Tk
+            return tiempos, ctx
+        
+        def al_terminar_precarga(resultado):
+            tiempos, ctx = resultado
+            self.informe_arranque.agregar_importaciones(tiempos)
+            self.mostrar_contexto(ctx)
+            self.informe_arranque.marcar("dataset visible")
+            terminar('precarga')
+        
+        def al_fallar_precarga(e):
+            messagebox.showerror("Error", f"❌ No se pudo cargar el dataset:\n{str(e)}")
+            terminar('precarga')
+        
+        def al_terminar_graficos(tiempos):
+            self.informe_arranque.agregar_importaciones(tiempos, 'graficos')
+            terminar('precarga_graficos')
+        
+        self.ejecutor.enviar('precarga', tarea_precarga,
+                             al_terminar=al_terminar_precarga, al_fallar=al_fallar_precarga)
+        # El proceso con Agg que rasteriza los gráficos se inicia y precarga ahora, no al primer clic
+        self.ejecutor.enviar('precarga_graficos', importar_modulos, MODULOS_PRECARGA_GRAFICOS, aislado=True,
+                             al_terminar=al_terminar_graficos,
+                             al_fallar=lambda e: terminar('precarga_graficos'))
+    
+    def cerrar(self):
+        """Cancela las tareas en segundo plano y cierra la ventana"""
+        self.ejecutor.cerrar()
+        self.cache_figuras.limpiar()
+        self.root.destroy()
+    
     def ejecutar(self):
         """Ejecuta la aplicación"""
         # Mostrar mensaje de bienvenida
@@ -1039,12 +1195,16 @@ Use "Verificar cálculos" para confirmar la precisión
 de todos los valores estadísticos.
 """
         self.mostrar_texto_info(bienvenida)
+        # La precarga empieza cuando la ventana ya se dibujó
+        self.root.after_idle(self.iniciar_precarga)
         self.root.mainloop()
 
 def main():
     """Función principal"""
+    informe_arranque = InformeArranque()
+    informe_arranque.marcar("módulos de la interfaz")
     root = tk.Tk()
-    app = AplicacionTesisCorregida(root)
+    app = AplicacionTesisCorregida(root, informe_arranque)
     app.ejecutar()
 
 if __name__ == "__main__":
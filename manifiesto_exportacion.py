@@ -0,0 +1,140 @@
+# manifiesto_exportacion.py
+"""
+MANIFIESTO DE EXPORTACIÓN INCREMENTAL
+Registra, por artefacto exportado (tabla, gráfico, dataset, verificación),
+la huella de sus entradas y los archivos que produjo; una reexportación
+solo regenera lo que cambió y cada archivo se escribe de forma atómica
+"""
+
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+import pandas as pd
+from cache_resultados import version_codigo
+
+NOMBRE_MANIFIESTO = 'manifiesto.json'
+VERSION_MANIFIESTO = 1
+
+# ============================================================================
+# ESCRITURA ATÓMICA
+# ============================================================================
+
+@contextmanager
+def escritura_atomica(ruta):
+    """Entrega una ruta temporal (misma extensión) que reemplaza a `ruta` solo si no hubo errores"""
+    raiz, extension = os.path.splitext(ruta)
+    temporal = f"{raiz}.tmp{os.getpid()}{extension}"
+    try:
+        yield temporal
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+# ============================================================================
+# HUELLAS DE ENTRADA
+# ============================================================================
+
+def huella_artefacto(ctx, artefacto, **parametros):
+    """SHA-256 de (versión del dataset, artefacto, parámetros, versión del código)"""
+    # Solo entradas: la fecha de generación de los archivos no forma parte de la huella
+    h = hashlib.sha256()
+    for parte in (ctx.version, artefacto, repr(sorted(parametros.items())), version_codigo()):
+        h.update(str(parte).encode('utf-8'))
+        h.update(b'\x1f')
+    return h.hexdigest()
+
+# ============================================================================
+# MANIFIESTO
+# ============================================================================
+
+class Manifiesto:
+    """Huella y archivos de cada artefacto de un directorio de exportación
+
+    Los archivos que un artefacto deja de producir (un formato quitado, una
+    tabla renombrada) se eliminan; los de un artefacto olvidado tras un fallo
+    quedan en disco, listados como huérfanos hasta que se regeneren
+    """
+
+    def __init__(self, directorio):
+        self.directorio = directorio
+        self.ruta = os.path.join(directorio, NOMBRE_MANIFIESTO)
+        self.artefactos, self.huerfanos = self._cargar()
+
+    def _cargar(self):
+        try:
+            with open(self.ruta, encoding='utf-8') as f:
+                datos = json.load(f)
+        except (OSError, ValueError):
+            return {}, []
+        # Un manifiesto de otra versión o dañado equivale a exportar todo
+        if not isinstance(datos, dict) or datos.get('version') != VERSION_MANIFIESTO:
+            return {}, []
+        return datos.get('artefactos', {}), datos.get('huerfanos', [])
+
+    def vigente(self, artefacto, huella):
+        """True si el artefacto tiene la misma huella y todos sus archivos existen"""
+        entrada = self.artefactos.get(artefacto)
+        if entrada is None or entrada.get('huella') != huella:
+            return False
+        return all(os.path.exists(os.path.join(self.directorio, archivo))
+                   for archivo in entrada.get('archivos', []))
+
+    def registrar(self, artefacto, huella, archivos):
+        anteriores = self.artefactos.get(artefacto, {}).get('archivos', [])
+        actuales = [os.path.relpath(ruta, self.directorio) for ruta in archivos]
+        self.artefactos[artefacto] = {
+            'huella': huella,
+            'archivos': actuales,
+            'generado': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        self.huerfanos = [archivo for archivo in self.huerfanos if archivo not in actuales]
+        # Archivos de la exportación anterior que ya no se generan (p. ej. un formato quitado)
+        self._eliminar([archivo for archivo in anteriores if archivo not in actuales])
+
+    def olvidar(self, artefacto):
+        """Deja de registrar el artefacto; sus archivos, ya no vigentes, quedan como huérfanos"""
+        entrada = self.artefactos.pop(artefacto, None)
+        if entrada is None:
+            return
+        cubiertos = self._cubiertos()
+        self.huerfanos += [archivo for archivo in entrada.get('archivos', [])
+                           if archivo not in cubiertos and archivo not in self.huerfanos]
+
+    def podar(self, conocidos, prefijo=''):
+        """Elimina los artefactos con el prefijo que ya no existen (p. ej. una tabla renombrada) y sus archivos"""
+        obsoletos = [artefacto for artefacto in self.artefactos
+                     if artefacto.startswith(prefijo) and artefacto not in conocidos]
+        for artefacto in obsoletos:
+            self._eliminar(self.artefactos.pop(artefacto).get('archivos', []))
+        return obsoletos
+
+    def _cubiertos(self):
+        return {archivo for entrada in self.artefactos.values() for archivo in entrada.get('archivos', [])}
+
+    def _eliminar(self, archivos):
+        """Borra los archivos que ningún artefacto cubre; los que no se pueden borrar quedan como huérfanos"""
+        cubiertos = self._cubiertos()
+        for archivo in archivos:
+            if archivo in cubiertos:
+                continue
+            try:
+                os.remove(os.path.join(self.directorio, archivo))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                if archivo not in self.huerfanos:
+                    self.huerfanos.append(archivo)
+
+    def guardar(self):
+        """Escribe el manifiesto de forma atómica"""
+        os.makedirs(self.directorio, exist_ok=True)
+        # Los huérfanos borrados a mano dejan de listarse
+        self.huerfanos = sorted(archivo for archivo in self.huerfanos
+                                if os.path.exists(os.path.join(self.directorio, archivo)))
+        datos = {'version': VERSION_MANIFIESTO, 'artefactos': self.artefactos,
+                 'huerfanos': self.huerfanos}
+        with escritura_atomica(self.ruta) as temporal:
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(datos, f, ensure_ascii=False, indent=2, sort_keys=True)
@@ -0,0 +1,391 @@
+# motor_estadistico.py
+"""
+MOTOR ESTADÍSTICO VECTORIZADO
+Cálculos numéricos compartidos por tablas, gráficos y exportaciones.
+Los resultados son DataFrames numéricos; el formato se aplica aparte.
+"""
+
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata, chi2, norm, t as student_t
+from contexto_datos import obtener_contexto
+
+# ============================================================================
+# RESUMEN POR GRUPO (MEDIA, DE, N, MODA)
+# ============================================================================
+
+def resumen_por_grupo(contexto=None, metricas=None, columna_grupo='Modelo_Seguridad'):
+    """Media, DE (ddof=1), n y moda por grupo y métrica (formato largo, valores numéricos)"""
+    ctx = obtener_contexto(contexto)
+    metricas = tuple(metricas)
+
+    return ctx.memoizar(('resumen_por_grupo', columna_grupo, metricas),
+                        lambda: _calcular_resumen(ctx, list(metricas), columna_grupo))
+
+def _calcular_resumen(ctx, metricas, columna_grupo):
+    indice = ctx.indice(columna_grupo)
+    codigos = indice.codigos
+    validos = codigos >= 0
+    valores = ctx.columnas(metricas)[validos].reset_index(drop=True)
+    codigos = codigos[validos]
+
+    # Media y DE de todas las métricas numéricas en una sola agregación agrupada
+    numericas = [m for m in metricas if pd.api.types.is_numeric_dtype(valores[m])]
+    estadisticas = valores[numericas].groupby(codigos).agg(['mean', 'std'])
+
+    # Conteo y moda de todas las métricas sobre el formato largo
+    # (grupo, métrica, valor); los empates de la moda se resuelven por
+    # el primer valor que aparece en el dataset
+    n, k = len(valores), len(metricas)
+    largo = pd.DataFrame({
+        'grupo': np.tile(codigos, k),
+        'metrica': np.repeat(np.arange(k), n),
+        'valor': pd.concat([valores[m].astype(object) for m in metricas], ignore_index=True),
+        'posicion': np.tile(np.arange(n), k),
+    }).dropna(subset=['valor'])
+
+    frecuencias = (largo.groupby(['grupo', 'metrica', 'valor'], sort=False)['posicion']
+                   .agg(['size', 'min']).reset_index())
+    conteos = frecuencias.groupby(['grupo', 'metrica'])['size'].sum()
+    modas = (frecuencias
+             .sort_values(['grupo', 'metrica', 'size', 'min'], ascending=[True, True, False, True])
+             .drop_duplicates(['grupo', 'metrica'])
+             .set_index(['grupo', 'metrica'])['valor'])
+
+    filas = []
+    for g, categoria in enumerate(indice.categorias):
+        for j, metrica in enumerate(metricas):
+            media = de = np.nan
+            if metrica in numericas and g in estadisticas.index:
+                media = estadisticas.loc[g, (metrica, 'mean')]
+                de = estadisticas.loc[g, (metrica, 'std')]
+            filas.append({
+                columna_grupo: categoria,
+                'Métrica': metrica,
+                'n': int(conteos.get((g, j), 0)),
+                'media': media,
+                'de': de,
+                'moda': modas.get((g, j), np.nan),
+            })
+
+    return pd.DataFrame(filas, columns=[columna_grupo, 'Métrica', 'n', 'media', 'de', 'moda'])
+
+def medias_por_grupo(contexto=None, metricas=None, columna_grupo='Modelo_Seguridad'):
+    """Medias por grupo en formato ancho (grupos × métricas), en el orden de presentación"""
+    ctx = obtener_contexto(contexto)
+    resumen = resumen_por_grupo(ctx, metricas, columna_grupo)
+
+    medias = resumen.pivot(index=columna_grupo, columns='Métrica', values='media')
+    medias = medias.reindex(index=ctx.indice(columna_grupo).categorias, columns=list(metricas))
+    medias.columns.name = None
+    return medias
+
+# ============================================================================
+# RANGOS COMPARTIDOS Y KRUSKAL-WALLIS VECTORIZADO
+# ============================================================================
+
+def matriz_rangos(contexto=None, metricas=None, columna_grupo='Modelo_Seguridad'):
+    """Rangos de todas las métricas a la vez (filas con grupo válido; NaN se omiten)"""
+    ctx = obtener_contexto(contexto)
+    metricas = tuple(metricas)
+
+    return ctx.memoizar(('matriz_rangos', columna_grupo, metricas),
+                        lambda: _calcular_rangos(ctx, list(metricas), columna_grupo))
+
+def _calcular_rangos(ctx, metricas, columna_grupo):
+    indice = ctx.indice(columna_grupo)
+    validos = indice.codigos >= 0
+    valores = ctx.columnas(metricas).to_numpy(dtype=float)[validos]
+    codigos = indice.codigos[validos]
+
+    # Rangos promedio de todas las columnas a la vez; los valores empatados
+    # comparten rango, así que las ligaduras se cuentan sobre los rangos
+    rangos = rankdata(valores, axis=0, nan_policy='omit')
+    ligaduras = _suma_ligaduras(rangos)
+
+    return {
+        'codigos': codigos,
+        'categorias': indice.categorias,
+        'valores': valores,
+        'rangos': rangos,
+        'ligaduras': ligaduras,
+    }
+
+def _suma_ligaduras(rangos):
+    """Σ(t³ - t) por columna, con t el tamaño de cada grupo de rangos empatados"""
+    n, k = rangos.shape
+    if n == 0:
+        return np.zeros(k)
+
+    ordenados = np.sort(rangos, axis=0)
+    presentes = ~np.isnan(ordenados)
+
+    # Inicio de cada corrida de valores iguales; la primera fila abre una
+    # corrida en cada columna, de modo que las corridas no cruzan columnas
+    inicio = np.ones_like(presentes)
+    inicio[1:] = ordenados[1:] != ordenados[:-1]
+
+    inicio, presentes = inicio.ravel(order='F'), presentes.ravel(order='F')
+    corrida = np.cumsum(inicio) - 1
+    tamanos = np.bincount(corrida[presentes], minlength=corrida[-1] + 1)
+    columna_corrida = np.repeat(np.arange(k), n)[inicio]
+
+    return np.bincount(columna_corrida, weights=tamanos ** 3 - tamanos, minlength=k)
+
+def kruskal_wallis(contexto=None, metricas=None, columna_grupo='Modelo_Seguridad'):
+    """H, gl, p y épsilon² de Kruskal–Wallis para todas las métricas en una sola pasada"""
+    metricas = list(metricas)
+    datos = matriz_rangos(contexto, metricas, columna_grupo)
+    rangos, codigos = datos['rangos'], datos['codigos']
+    g = len(datos['categorias'])
+
+    # Suma de rangos y tamaño por grupo para todas las columnas a la vez
+    presentes = ~np.isnan(rangos)
+    suma_rangos = np.zeros((g, len(metricas)))
+    n_grupo = np.zeros((g, len(metricas)))
+    np.add.at(suma_rangos, codigos, np.where(presentes, rangos, 0.0))
+    np.add.at(n_grupo, codigos, presentes)
+
+    n_total = n_grupo.sum(axis=0)
+    grupos = np.count_nonzero(n_grupo, axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        h = (12.0 / (n_total * (n_total + 1)) *
+             np.sum(np.where(n_grupo > 0, suma_rangos ** 2 / n_grupo, 0.0), axis=0) -
+             3 * (n_total + 1))
+        # Corrección por empates (igual que scipy.stats.kruskal)
+        h = h / (1 - datos['ligaduras'] / (n_total ** 3 - n_total))
+        epsilon2 = h / (n_total - 1)
+
+    gl = grupos - 1
+    h = np.where(gl >= 1, h, np.nan)
+    p = np.where(gl >= 1, chi2.sf(h, np.maximum(gl, 1)), np.nan)
+
+    return pd.DataFrame({
+        'Métrica': metricas,
+        'H': h,
+        'gl': gl,
+        'p': p,
+        'epsilon2': np.where(gl >= 1, epsilon2, np.nan),
+        'N': n_total.astype(int),
+        'grupos': grupos,
+    })
+
+# ============================================================================
+# MANN-WHITNEY POR PARES (TODOS LOS PARES × TODAS LAS MÉTRICAS)
+# ============================================================================
+
+@lru_cache(maxsize=64)
+def _cola_u_exacta(m, n):
+    """P(U ≥ u) exacta sin empates para tamaños (m, n), u = 0..m·n"""
+    m, n = min(m, n), max(m, n)
+    largo = m * n + 1
+    total = comb(m + n, m)
+
+    # Coeficientes del binomio gaussiano [m+n, m]_q: Π (1 - q^(n+i)) / (1 - q^i)
+    frecuencias = np.zeros(largo, dtype=np.int64 if total < 2 ** 62 else float)
+    frecuencias[0] = 1
+    for i in range(1, m + 1):
+        anterior = frecuencias.copy()
+        frecuencias[n + i:] -= anterior[:largo - n - i]
+        # Dividir por (1 - q^i): suma acumulada dentro de cada clase de residuo módulo i
+        relleno = (-largo) % i
+        frecuencias = np.concatenate([frecuencias, np.zeros(relleno, frecuencias.dtype)])
+        frecuencias = np.cumsum(frecuencias.reshape(-1, i), axis=0).ravel()[:largo]
+
+    return np.cumsum(frecuencias[::-1])[::-1] / float(total)
+
+def _ajustar_p(p, correccion):
+    """Ajuste por comparaciones múltiples ('holm', 'bh' o None) sobre toda la familia"""
+    p = np.asarray(p, dtype=float)
+    ajustado = np.full_like(p, np.nan)
+    validos = np.flatnonzero(~np.isnan(p))
+    m = len(validos)
+
+    if correccion is None or m == 0:
+        return p.copy()
+
+    orden = validos[np.argsort(p[validos], kind='stable')]
+    ordenados = p[orden]
+    rango = np.arange(1, m + 1)
+
+    if correccion == 'holm':
+        valores = np.maximum.accumulate(np.minimum(1.0, (m - rango + 1) * ordenados))
+    elif correccion == 'bh':
+        valores = np.minimum.accumulate(np.minimum(1.0, m / rango * ordenados)[::-1])[::-1]
+    else:
+        raise ValueError(f"Corrección no soportada: '{correccion}' (use 'holm', 'bh' o None)")
+
+    ajustado[orden] = valores
+    return ajustado
+
+def _u_por_columna(rangos_a, rangos_b, n_filas):
+    """U1 de todas las columnas: Σ_{x∈a} (#b < x + ½·#b = x), vía búsqueda en rangos ordenados"""
+    k = rangos_a.shape[1]
+    # Desplazar cada columna para que sus rangos no se solapen al aplanar
+    desplazamiento = (n_filas + 1.0) * np.arange(k)
+
+    b = (rangos_b + desplazamiento).ravel(order='F')
+    b = np.sort(b[~np.isnan(b)])
+    a = (rangos_a + desplazamiento).ravel(order='F')
+    columna_a = np.repeat(np.arange(k), rangos_a.shape[0])
+    presentes = ~np.isnan(a)
+    a, columna_a = a[presentes], columna_a[presentes]
+
+    izquierda = np.searchsorted(b, a, side='left')
+    derecha = np.searchsorted(b, a, side='right')
+    inicio_columna = np.searchsorted(b, desplazamiento, side='left')
+
+    aporte = (izquierda - inicio_columna[columna_a]) + 0.5 * (derecha - izquierda)
+    return np.bincount(columna_a, weights=aporte, minlength=k)
+
+def mann_whitney_pares(contexto=None, metricas=None, columna_grupo='Modelo_Seguridad',
+                       correccion='holm'):
+    """U, p y correlación biserial de rangos para todos los pares de grupos y métricas (formato largo)"""
+    metricas = list(metricas)
+    datos = matriz_rangos(contexto, metricas, columna_grupo)
+    rangos, codigos, categorias = datos['rangos'], datos['codigos'], datos['categorias']
+    n_filas = len(rangos)
+
+    filas = []
+    for a, b in combinations(range(len(categorias)), 2):
+        rangos_a, rangos_b = rangos[codigos == a], rangos[codigos == b]
+        n1 = np.count_nonzero(~np.isnan(rangos_a), axis=0)
+        n2 = np.count_nonzero(~np.isnan(rangos_b), axis=0)
+
+        u1 = _u_por_columna(rangos_a, rangos_b, n_filas)
+        ligaduras = _suma_ligaduras(rangos[(codigos == a) | (codigos == b)])
+
+        for j, metrica in enumerate(metricas):
+            m1, m2 = int(n1[j]), int(n2[j])
+            fila = {'Métrica': metrica, 'Grupo 1': categorias[a], 'Grupo 2': categorias[b],
+                    'n1': m1, 'n2': m2, 'U': np.nan, 'p': np.nan,
+                    'r_biserial': np.nan, 'metodo': None}
+
+            if m1 > 0 and m2 > 0:
+                u = max(u1[j], m1 * m2 - u1[j])
+                # Mismo criterio que scipy ('auto'): exacta si alguna muestra
+                # tiene 8 o menos observaciones y no hay empates
+                if (m1 <= 8 or m2 <= 8) and ligaduras[j] == 0:
+                    p = 2 * _cola_u_exacta(m1, m2)[int(round(u))]
+                    fila['metodo'] = 'exacto'
+                else:
+                    n = m1 + m2
+                    sigma = np.sqrt(m1 * m2 / 12 * ((n + 1) - ligaduras[j] / (n * (n - 1))))
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        z = (u - m1 * m2 / 2 - 0.5) / sigma
+                    p = 2 * norm.sf(z)
+                    fila['metodo'] = 'asintótico'
+
+                fila['U'] = u1[j]
+                fila['p'] = min(max(p, 0.0), 1.0)
+                fila['r_biserial'] = 2 * u1[j] / (m1 * m2) - 1
+
+            filas.append(fila)
+
+    resultado = pd.DataFrame(filas, columns=['Métrica', 'Grupo 1', 'Grupo 2', 'n1', 'n2',
+                                             'U', 'p', 'r_biserial', 'metodo'])
+    resultado.insert(7, 'p_ajustado', _ajustar_p(resultado['p'], correccion))
+    return resultado
+
+# ============================================================================
+# CORRELACIONES DE SPEARMAN
+# ============================================================================
+
+# Codificación numérica de las variables ordinales
+MAPA_MADUREZ = {'Bajo': 1, 'Medio': 2, 'Alto': 3}
+MAPA_FRECUENCIA = {'Anual': 1, 'Semestral': 2, 'Trimestral': 4, 'Mensual': 12}
+
+# Columnas derivadas: nombre -> (columna original, codificación)
+VARIABLES_DERIVADAS = {
+    'Nivel_Madurez_Num': ('Nivel_Madurez', MAPA_MADUREZ),
+    'Frecuencia_Num': ('Frecuencia_Simulacros', MAPA_FRECUENCIA),
+}
+
+# Variables que se correlacionan (unión de las usadas en la Tabla 12 y el Gráfico 7)
+VARIABLES_CORRELACION = [
+    'Años_Implementación', 'Nivel_Madurez_Num', 'Incidentes_Mensuales', 'Tasa_Bloqueo_%',
+    'Tiempo_Respuesta_min', 'Tiempo_Detección_min', 'Percepción_1_5', 'Capacitación_1_5',
+    'Especialistas', 'Presupuesto_Seguridad_USD', 'Frecuencia_Num'
+]
+
+def columnas_numericas(contexto=None, variables=None):
+    """Columnas pedidas como matriz numérica, resolviendo las variables derivadas"""
+    ctx = obtener_contexto(contexto)
+    originales = [VARIABLES_DERIVADAS.get(v, (v, None))[0] for v in variables]
+    df = ctx.columnas(list(dict.fromkeys(originales)))
+
+    datos = {}
+    for variable, original in zip(variables, originales):
+        mapa = VARIABLES_DERIVADAS.get(variable, (None, None))[1]
+        serie = df[original].map(mapa) if mapa is not None else df[original]
+        datos[variable] = pd.to_numeric(serie, errors='coerce').to_numpy(dtype=float)
+
+    return pd.DataFrame(datos, columns=list(variables))
+
+def correlaciones_spearman(contexto=None, variables=None):
+    """Matrices de rho de Spearman, p (bilateral) y n, calculadas una vez por contexto"""
+    ctx = obtener_contexto(contexto)
+    variables = tuple(VARIABLES_CORRELACION if variables is None else variables)
+
+    return ctx.memoizar(('correlaciones_spearman', variables),
+                        lambda: _calcular_spearman(columnas_numericas(ctx, list(variables))))
+
+def seleccionar_correlaciones(correlaciones, variables):
+    """Submatrices (rho, p, n) de las variables indicadas"""
+    return {clave: matriz.loc[variables, variables] for clave, matriz in correlaciones.items()}
+
+def _calcular_spearman(datos):
+    valores = datos.to_numpy(dtype=float)
+    faltantes = np.isnan(valores)
+
+    if not faltantes.any():
+        # Rangos de cada columna una sola vez y la matriz completa como un producto
+        rangos = rankdata(valores, axis=0)
+        centrados = rangos - rangos.mean(axis=0)
+        suma_cuadrados = np.einsum('ij,ij->j', centrados, centrados)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rho = (centrados.T @ centrados) / np.sqrt(np.outer(suma_cuadrados, suma_cuadrados))
+        n = np.full(rho.shape, len(valores), dtype=float)
+    else:
+        rho, n = _spearman_por_pares(valores, faltantes)
+
+    np.fill_diagonal(rho, np.where(np.isnan(np.diag(rho)), np.nan, 1.0))
+    rho = np.clip(rho, -1.0, 1.0)
+
+    # Valor p con la aproximación t de scipy.stats.spearmanr
+    gl = n - 2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = rho * np.sqrt(gl / ((1.0 - rho) * (1.0 + rho)))
+        p = np.where(gl > 0, 2 * student_t.sf(np.abs(t), np.maximum(gl, 1)), np.nan)
+
+    nombres = list(datos.columns)
+    return {
+        'rho': pd.DataFrame(rho, index=nombres, columns=nombres),
+        'p': pd.DataFrame(p, index=nombres, columns=nombres),
+        'n': pd.DataFrame(n.astype(int), index=nombres, columns=nombres),
+    }
+
+def _spearman_por_pares(valores, faltantes):
+    """Con valores faltantes cada par se calcula sobre sus observaciones completas"""
+    k = valores.shape[1]
+    rho = np.full((k, k), np.nan)
+    n = np.zeros((k, k))
+
+    for i in range(k):
+        for j in range(i, k):
+            completos = ~(faltantes[:, i] | faltantes[:, j])
+            n[i, j] = n[j, i] = np.count_nonzero(completos)
+            if n[i, j] < 2:
+                continue
+            rangos = rankdata(valores[completos][:, [i, j]], axis=0)
+            centrados = rangos - rangos.mean(axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                rho[i, j] = rho[j, i] = (centrados[:, 0] @ centrados[:, 1] /
+                                         np.sqrt((centrados[:, 0] @ centrados[:, 0]) *
+                                                 (centrados[:, 1] @ centrados[:, 1])))
+
+    return rho, n
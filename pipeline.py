@@ -0,0 +1,447 @@
+# pipeline.py
+"""
+PIPELINE DE EXPORTACIÓN (GRAFO DE DEPENDENCIAS)
+Tablas, gráficos, dataset y verificación como nodos con entradas declaradas;
+los intermedios compartidos se calculan una vez y los nodos independientes
+se ejecutan en paralelo en un grupo de procesos
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+# ============================================================================
+# GRAFO DE DEPENDENCIAS
+# ============================================================================
+
+class Nodo:
+    """Paso del pipeline: función, nombres de sus dependencias y dónde se ejecuta"""
+
+    def __init__(self, nombre, funcion, dependencias=(), local=False):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.dependencias = tuple(dependencias)
+        # Los nodos locales (intermedios compartidos) corren en el proceso principal
+        self.local = local
+
+
+class _Compartido:
+    """Referencia a un resultado local, resuelta dentro de cada proceso trabajador"""
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+
+_compartidos_trabajador = {}
+
+def _inicializar_trabajador(compartidos):
+    """Recibe una vez por proceso los intermedios compartidos y fija el backend Agg"""
+    os.environ['MPLBACKEND'] = 'Agg'
+    import matplotlib
+    matplotlib.use('Agg')
+    _compartidos_trabajador.clear()
+    _compartidos_trabajador.update(compartidos)
+
+def _ejecutar_en_trabajador(funcion, argumentos):
+    argumentos = [_compartidos_trabajador[a.nombre] if isinstance(a, _Compartido) else a
+                  for a in argumentos]
+    return funcion(*argumentos)
+
+
+class Pipeline:
+    """Grafo acíclico de nodos; ejecuta cada nodo cuando sus dependencias terminaron"""
+
+    def __init__(self):
+        self.nodos = {}
+
+    def agregar(self, nombre, funcion, dependencias=(), local=False):
+        if nombre in self.nodos:
+            raise ValueError(f"Nodo duplicado: '{nombre}'")
+        self.nodos[nombre] = Nodo(nombre, funcion, dependencias, local)
+        return self
+
+    def orden_topologico(self):
+        """Nodos en un orden compatible con sus dependencias (error si hay ciclos)"""
+        orden, estado = [], {}
+
+        def visitar(nombre, camino):
+            if nombre not in self.nodos:
+                raise ValueError(f"Dependencia desconocida: '{nombre}' (desde '{camino[-1]}')")
+            if estado.get(nombre) == 'listo':
+                return
+            if estado.get(nombre) == 'visitando':
+                raise ValueError(f"Ciclo de dependencias: {' -> '.join(camino + [nombre])}")
+            estado[nombre] = 'visitando'
+            for dependencia in self.nodos[nombre].dependencias:
+                visitar(dependencia, camino + [nombre])
+            estado[nombre] = 'listo'
+            orden.append(nombre)
+
+        for nombre in self.nodos:
+            visitar(nombre, [])
+        return orden
+
+    def ejecutar(self, procesos=None, progreso=None, cancelado=None, aislar=False):
+        """Ejecuta el grafo; retorna (resultados, errores) por nombre de nodo
+
+        `cancelado` (threading.Event) detiene el envío de nodos nuevos: los que no
+        llegaron a empezar quedan como errores 'Cancelado'. Con `aislar` los nodos
+        no locales siempre corren en procesos aparte, aunque haya un solo proceso
+        """
+        orden = self.orden_topologico()
+        for nombre in orden:
+            nodo = self.nodos[nombre]
+            if nodo.local and any(not self.nodos[d].local for d in nodo.dependencias):
+                raise ValueError(f"El nodo local '{nombre}' no puede depender de nodos en paralelo")
+
+        resultados, errores = {}, {}
+        total = len(orden)
+
+        def notificar(nombre, estado):
+            if progreso is not None:
+                progreso(nombre, estado, len(resultados) + len(errores), total)
+
+        def omitir_si_falla(nodo):
+            fallidas = [d for d in nodo.dependencias if d in errores]
+            if fallidas:
+                errores[nodo.nombre] = RuntimeError(f"Dependencia fallida: {', '.join(fallidas)}")
+                notificar(nodo.nombre, 'omitido')
+                return True
+            return False
+
+        def omitir_si_cancelado(nodo):
+            if cancelado is not None and cancelado.is_set():
+                errores[nodo.nombre] = RuntimeError("Cancelado")
+                notificar(nodo.nombre, 'cancelado')
+                return True
+            return False
+
+        # 1) Intermedios compartidos, una sola vez en el proceso principal
+        for nombre in orden:
+            nodo = self.nodos[nombre]
+            if not nodo.local or omitir_si_cancelado(nodo) or omitir_si_falla(nodo):
+                continue
+            try:
+                resultados[nombre] = nodo.funcion(*[resultados[d] for d in nodo.dependencias])
+                notificar(nombre, 'completado')
+            except Exception as e:
+                errores[nombre] = e
+                notificar(nombre, 'error')
+
+        pendientes = [n for n in orden if not self.nodos[n].local]
+        if procesos is None:
+            procesos = os.cpu_count() or 1
+        procesos = max(1, min(procesos, len(pendientes)))
+
+        # 2) Nodos restantes: en orden si hay un solo proceso, si no en el grupo
+        if procesos == 1 and not aislar:
+            for nombre in pendientes:
+                nodo = self.nodos[nombre]
+                if omitir_si_cancelado(nodo) or omitir_si_falla(nodo):
+                    continue
+                try:
+                    resultados[nombre] = nodo.funcion(*[resultados[d] for d in nodo.dependencias])
+                    notificar(nombre, 'completado')
+                except Exception as e:
+                    errores[nombre] = e
+                    notificar(nombre, 'error')
+            return resultados, errores
+
+        locales = {n: r for n, r in resultados.items() if self.nodos[n].local}
+        # 'spawn' evita heredar el estado de Tk/matplotlib del proceso principal
+        with ProcessPoolExecutor(max_workers=procesos,
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_inicializar_trabajador,
+                                 initargs=(locales,)) as ejecutor:
+            en_curso = {}
+
+            def abandonar(error):
+                # El grupo quedó inservible (p. ej. murió un trabajador): los nodos
+                # en curso y los que faltan fallan con el error del grupo
+                for nombre in list(en_curso.values()) + pendientes:
+                    errores[nombre] = error
+                    notificar(nombre, 'error')
+                en_curso.clear()
+                pendientes.clear()
+
+            while pendientes or en_curso:
+                for nombre in list(pendientes):
+                    nodo = self.nodos[nombre]
+                    if omitir_si_cancelado(nodo) or omitir_si_falla(nodo):
+                        pendientes.remove(nombre)
+                        continue
+                    if all(d in resultados for d in nodo.dependencias):
+                        argumentos = [_Compartido(d) if self.nodos[d].local else resultados[d]
+                                      for d in nodo.dependencias]
+                        try:
+                            futuro = ejecutor.submit(_ejecutar_en_trabajador, nodo.funcion, argumentos)
+                        except (BrokenProcessPool, RuntimeError) as e:
+                            abandonar(e)
+                            break
+                        en_curso[futuro] = nombre
+                        pendientes.remove(nombre)
+
+                if not en_curso:
+                    continue
+
+                terminados, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+                for futuro in terminados:
+                    nombre = en_curso.pop(futuro)
+                    try:
+                        resultados[nombre] = futuro.result()
+                        notificar(nombre, 'completado')
+                    except BrokenProcessPool as e:
+                        errores[nombre] = e
+                        notificar(nombre, 'error')
+                        abandonar(e)
+                        break
+                    except Exception as e:
+                        errores[nombre] = e
+                        notificar(nombre, 'error')
+
+        return resultados, errores
+
+# ============================================================================
+# NODOS DE LA EXPORTACIÓN DEL CAPÍTULO IV
+# ============================================================================
+
+def _nodo_contexto(contexto=None):
+    from contexto_datos import obtener_contexto
+    ctx = obtener_contexto(contexto)
+    # Cargar todas las columnas antes de enviarlo a los procesos; un CSV/Excel
+    # no se carga completo: cada nodo lee solo las columnas que necesita
+    if not _por_bloques(ctx):
+        ctx.df
+    return ctx
+
+def _por_bloques(ctx):
+    return getattr(ctx.fuente, 'por_bloques', False)
+
+def _nodo_agregados(ctx):
+    from ingesta_streaming import agregados_contexto
+    return agregados_contexto(ctx)
+
+def _nodo_indices(ctx):
+    return {columna: ctx.indice(columna) for columna in ('Modelo_Seguridad', 'Nivel_Madurez')}
+
+def _nodo_rangos(ctx, indices):
+    from analisis_estadistico import VARIABLES_TABLA10
+    from motor_estadistico import matriz_rangos
+    return matriz_rangos(ctx, [columna for _, columna in VARIABLES_TABLA10])
+
+def _nodo_correlaciones(ctx):
+    from motor_estadistico import correlaciones_spearman
+    return correlaciones_spearman(ctx)
+
+def _nodo_carpetas(directorio):
+    from analisis_estadistico import crear_carpetas_exportacion
+    crear_carpetas_exportacion(directorio)
+    return directorio
+
+def _nodo_tabla(nombre, ctx, *_intermedios):
+    # Los intermedios ya están memoizados dentro del contexto recibido
+    from analisis_estadistico import FUNCIONES_TABLAS
+    return FUNCIONES_TABLAS[nombre](ctx)
+
+def _nodo_exportar_tabla(nombre, formatos, tabla, directorio):
+    from analisis_estadistico import exportar_tabla
+    return exportar_tabla(nombre, tabla, directorio, formatos)
+
+def _nodo_grafico(nombre, formatos, ctx, directorio, *_intermedios):
+    from graficos_completos import guardar_grafico
+    return guardar_grafico(nombre, ctx, directorio, formatos)
+
+def _nodo_dataset(ctx, directorio):
+    from analisis_estadistico import exportar_dataset
+    return exportar_dataset(ctx.df, directorio)
+
+def _nodo_libro_excel(nombres, ctx, directorio, *tablas):
+    from analisis_estadistico import exportar_libro_excel
+    return exportar_libro_excel(dict(zip(nombres, tablas)), ctx.df, directorio)
+
+def _nodo_verificacion(ctx, directorio, *_intermedios):
+    from analisis_estadistico import verificar_todos_calculos
+    from manifiesto_exportacion import escritura_atomica
+    ruta = os.path.join(directorio, 'verificacion_calculos.txt')
+    with escritura_atomica(ruta) as temporal:
+        with open(temporal, 'w', encoding='utf-8') as f:
+            f.write(verificar_todos_calculos(ctx))
+    return [ruta]
+
+# Intermedios que usa cada tabla y gráfico (además del contexto)
+DEPENDENCIAS_TABLAS = {
+    'tabla3': (), 'tabla6': (), 'tabla7': ('indices',),
+    'tabla8': ('indices',), 'tabla9': ('indices',),
+    'tabla10': ('rangos',), 'tabla11': ('rangos',), 'tabla12': ('correlaciones',)
+}
+# Con una fuente CSV/Excel, tablas que salen de los agregados por bloques
+DEPENDENCIAS_POR_BLOQUES = {
+    'tabla3': ('agregados',), 'tabla6': ('agregados',), 'tabla7': ('agregados',),
+    'tabla8': ('agregados',), 'tabla9': ('agregados',),
+}
+DEPENDENCIAS_GRAFICOS = {
+    '3_tiempos': ('indices',), '5_madurez': ('indices',), '7_correlaciones': ('correlaciones',)
+}
+
+# Formatos de los gráficos en la exportación completa (forman parte de su huella)
+FORMATOS_GRAFICOS = ('png', 'pdf')
+
+def _seleccion(valor, disponibles):
+    """True/False o lista de nombres → lista de nombres en el orden de `disponibles`"""
+    if valor is True:
+        return list(disponibles)
+    if not valor:
+        return []
+    return [nombre for nombre in disponibles if nombre in set(valor)]
+
+def construir_pipeline_exportacion(directorio='exportacion_capitulo_iv', contexto=None,
+                                   tablas=True, graficos=True, dataset=True, verificacion=True,
+                                   libro=False, formatos_tablas=None, formatos_graficos=FORMATOS_GRAFICOS):
+    """Grafo de la exportación: intermedios → tablas/gráficos → archivos
+
+    `tablas` y `graficos` aceptan True/False o la lista de nombres a incluir;
+    el libro único de Excel usa todas las tablas, estén o no seleccionadas
+    """
+    from analisis_estadistico import FUNCIONES_TABLAS, FORMATOS_TABLAS
+    from graficos_completos import FUNCIONES_GRAFICOS
+    formatos_tablas = tuple(formatos_tablas or FORMATOS_TABLAS)
+    formatos_graficos = tuple(formatos_graficos)
+    tablas = _seleccion(tablas, FUNCIONES_TABLAS)
+    graficos = _seleccion(graficos, FUNCIONES_GRAFICOS)
+    dependencias_tablas = dict(DEPENDENCIAS_TABLAS)
+    from contexto_datos import obtener_contexto
+    if _por_bloques(obtener_contexto(contexto)):
+        dependencias_tablas.update(DEPENDENCIAS_POR_BLOQUES)
+
+    # Solo se calculan los intermedios que algún nodo seleccionado necesita
+    necesarios = {d for nombre in (FUNCIONES_TABLAS if libro else tablas)
+                  for d in dependencias_tablas.get(nombre, ())}
+    necesarios |= {d for nombre in graficos for d in DEPENDENCIAS_GRAFICOS.get(nombre, ())}
+    if verificacion:
+        necesarios.add('indices')
+    if 'rangos' in necesarios:
+        necesarios.add('indices')
+
+    p = Pipeline()
+    p.agregar('contexto', partial(_nodo_contexto, contexto), local=True)
+    if 'agregados' in necesarios:
+        p.agregar('agregados', _nodo_agregados, ['contexto'], local=True)
+    if 'indices' in necesarios:
+        p.agregar('indices', _nodo_indices, ['contexto'], local=True)
+    if 'rangos' in necesarios:
+        p.agregar('rangos', _nodo_rangos, ['contexto', 'indices'], local=True)
+    if 'correlaciones' in necesarios:
+        p.agregar('correlaciones', _nodo_correlaciones, ['contexto'], local=True)
+    p.agregar('carpetas', partial(_nodo_carpetas, directorio), local=True)
+
+    # El libro único necesita calcular también las tablas que no se exportan por separado
+    calculadas = list(FUNCIONES_TABLAS) if libro else tablas
+    for nombre in calculadas:
+        p.agregar(nombre, partial(_nodo_tabla, nombre),
+                  ['contexto', *dependencias_tablas.get(nombre, ())])
+    for nombre in tablas:
+        p.agregar(f'exportar_{nombre}', partial(_nodo_exportar_tabla, nombre, formatos_tablas),
+                  [nombre, 'carpetas'])
+
+    for nombre in graficos:
+        p.agregar(f'grafico_{nombre}', partial(_nodo_grafico, nombre, formatos_graficos),
+                  ['contexto', 'carpetas', *DEPENDENCIAS_GRAFICOS.get(nombre, ())])
+
+    if dataset:
+        p.agregar('dataset', _nodo_dataset, ['contexto', 'carpetas'])
+
+    if libro:
+        p.agregar('libro_excel', partial(_nodo_libro_excel, list(FUNCIONES_TABLAS)),
+                  ['contexto', 'carpetas', *FUNCIONES_TABLAS])
+
+    if verificacion:
+        p.agregar('verificacion', _nodo_verificacion, ['contexto', 'carpetas', 'indices'])
+
+    return p
+
+def _nodo_de_artefacto(artefacto):
+    """Nombre del nodo que escribe los archivos de un artefacto del manifiesto"""
+    return f'exportar_{artefacto}' if artefacto.startswith('tabla') else artefacto
+
+def exportar_todo(directorio='exportacion_capitulo_iv', contexto=None, procesos=None,
+                  progreso=None, forzar=False, tablas=True, graficos=True, dataset=True,
+                  verificacion=True, libro=True, formatos_tablas=None,
+                  formatos_graficos=FORMATOS_GRAFICOS, cancelado=None, aislar=False):
+    """Exporta lo que cambió desde la última exportación (todo si forzar) usando todos los núcleos
+
+    `tablas` y `graficos` aceptan True/False o la lista de nombres a exportar;
+    `cancelado` y `aislar` se pasan a Pipeline.ejecutar
+    """
+    from contexto_datos import obtener_contexto
+    from analisis_estadistico import FUNCIONES_TABLAS, FORMATOS_TABLAS
+    from graficos_completos import FUNCIONES_GRAFICOS
+    from manifiesto_exportacion import Manifiesto, huella_artefacto
+
+    ctx = obtener_contexto(contexto)
+    manifiesto = Manifiesto(directorio)
+    formatos_tablas = tuple(formatos_tablas or FORMATOS_TABLAS)
+    formatos_graficos = tuple(formatos_graficos)
+
+    # Huella de entradas de cada artefacto seleccionado (mismos nombres que
+    # guardar_todas_tablas y generar_todos_graficos, que comparten el manifiesto)
+    huellas = {nombre: huella_artefacto(ctx, nombre, formatos=formatos_tablas)
+               for nombre in _seleccion(tablas, FUNCIONES_TABLAS)}
+    huellas.update({f'grafico_{nombre}': huella_artefacto(ctx, f'grafico_{nombre}',
+                                                          formatos=formatos_graficos)
+                    for nombre in _seleccion(graficos, FUNCIONES_GRAFICOS)})
+    if dataset:
+        huellas['dataset'] = huella_artefacto(ctx, 'dataset')
+    if verificacion:
+        huellas['verificacion'] = huella_artefacto(ctx, 'verificacion')
+    if libro:
+        huellas['libro_excel'] = huella_artefacto(ctx, 'libro_excel')
+
+    pendientes = {artefacto for artefacto, huella in huellas.items()
+                  if forzar or not manifiesto.vigente(artefacto, huella)}
+
+    pipeline = construir_pipeline_exportacion(
+        directorio, ctx,
+        tablas=[n for n in FUNCIONES_TABLAS if n in pendientes],
+        graficos=[n for n in FUNCIONES_GRAFICOS if f'grafico_{n}' in pendientes],
+        dataset='dataset' in pendientes,
+        verificacion='verificacion' in pendientes,
+        libro='libro_excel' in pendientes,
+        formatos_tablas=formatos_tablas,
+        formatos_graficos=formatos_graficos,
+    )
+    resultados, errores = pipeline.ejecutar(procesos=procesos, progreso=progreso,
+                                           cancelado=cancelado, aislar=aislar)
+
+    archivos = []
+    for artefacto in pendientes:
+        nodo = _nodo_de_artefacto(artefacto)
+        if nodo in resultados:
+            manifiesto.registrar(artefacto, huellas[artefacto], resultados[nodo])
+            archivos.extend(resultados[nodo])
+        else:
+            manifiesto.olvidar(artefacto)
+    # Tablas y gráficos que ya no existen (renombrados o quitados del capítulo)
+    manifiesto.podar(FUNCIONES_TABLAS, prefijo='tabla')
+    manifiesto.podar([f'grafico_{nombre}' for nombre in FUNCIONES_GRAFICOS], prefijo='grafico_')
+    manifiesto.guardar()
+
+    print(f"✅ {len(archivos)} archivos exportados en '{directorio}/' "
+          f"({len(huellas) - len(pendientes)} artefactos sin cambios)")
+    if manifiesto.huerfanos:
+        print(f"⚠️ {len(manifiesto.huerfanos)} archivos huérfanos (no vigentes) listados en el manifiesto")
+    for nombre, error in errores.items():
+        print(f"    ❌ Error en {nombre}: {error}")
+
+    return archivos, errores
+
+# ============================================================================
+# EJECUCIÓN PRINCIPAL
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("EXPORTACIÓN COMPLETA - CAPÍTULO IV")
+    print("=" * 80)
+    exportar_todo()
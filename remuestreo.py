@@ -0,0 +1,284 @@
+# remuestreo.py
+"""
+REMUESTREO: PERMUTACIONES Y BOOTSTRAP
+Valores p de Kruskal–Wallis y Mann–Whitney por permutación de etiquetas
+e intervalos bootstrap de medias por grupo, calculados por lotes
+vectorizados (y, para muchas permutaciones, en varios procesos)
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata, norm
+from contexto_datos import obtener_contexto
+from motor_estadistico import matriz_rangos
+
+# Permutaciones por lote (cada lote es una matriz B_lote × n de índices)
+TAMANO_LOTE = 10000
+# Límite de elementos por matriz de lote, para datasets con muchas filas
+MAX_ELEMENTOS_LOTE = 5_000_000
+# A partir de este número de permutaciones se reparte el trabajo entre procesos
+UMBRAL_PARALELO = 50000
+
+# ============================================================================
+# ESTADÍSTICOS VECTORIZADOS SOBRE MATRICES DE ETIQUETAS
+# ============================================================================
+
+def _estadistico_kruskal(etiquetas, rangos, presentes, n_grupos, factor_ligaduras):
+    """H de Kruskal–Wallis para cada fila de etiquetas (B × n) y cada métrica (B × k)"""
+    rangos = np.where(presentes, rangos, 0.0)
+    presentes = presentes.astype(float)
+    n_total = presentes.sum(axis=0)
+
+    suma = np.zeros((len(etiquetas), rangos.shape[1]))
+    for g in range(n_grupos):
+        # Un producto matricial por grupo: suma de rangos y tamaño de todas las permutaciones
+        pertenece = (etiquetas == g).astype(float)
+        suma_rangos = pertenece @ rangos
+        tamano = pertenece @ presentes
+        with np.errstate(invalid='ignore', divide='ignore'):
+            suma += np.where(tamano > 0, suma_rangos ** 2 / tamano, 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        h = 12.0 / (n_total * (n_total + 1)) * suma - 3 * (n_total + 1)
+        return h / factor_ligaduras
+
+def _estadistico_mann_whitney(etiquetas, rangos, presentes):
+    """|U1 - n1·n2/2| para cada fila de etiquetas (1 = primer grupo) y cada métrica"""
+    rangos = np.where(presentes, rangos, 0.0)
+    presentes = presentes.astype(float)
+    n_total = presentes.sum(axis=0)
+
+    pertenece = (etiquetas == 1).astype(float)
+    suma_rangos = pertenece @ rangos
+    n1 = pertenece @ presentes
+    u1 = suma_rangos - n1 * (n1 + 1) / 2
+    return np.abs(u1 - n1 * (n_total - n1) / 2)
+
+# ============================================================================
+# EJECUCIÓN POR LOTES
+# ============================================================================
+
+def _secuencia_semilla(semilla):
+    """SeedSequence a partir de un entero, None o una SeedSequence ya derivada"""
+    if isinstance(semilla, np.random.SeedSequence):
+        return semilla
+    return np.random.SeedSequence(semilla)
+
+def _lote_permutaciones(semilla, cantidad, codigos, estadistico, argumentos, observado):
+    """Cuenta, por métrica, las permutaciones del lote con estadístico ≥ observado"""
+    rng = np.random.default_rng(semilla)
+    n = len(codigos)
+
+    # Matriz de índices permutados (una fila por permutación)
+    indices = rng.permuted(np.broadcast_to(np.arange(n), (cantidad, n)), axis=1)
+    valores = estadistico(codigos[indices], *argumentos)
+
+    # Misma tolerancia relativa que scipy.stats.permutation_test
+    tolerancia = np.abs(observado) * 1e-14
+    return np.sum(valores >= observado - tolerancia, axis=0)
+
+def _contar_extremos(codigos, estadistico, argumentos, observado, permutaciones,
+                     semilla, procesos):
+    """Suma los conteos de todos los lotes; cada lote tiene su propia semilla derivada"""
+    n = max(len(codigos), 1)
+    lote = max(1, min(TAMANO_LOTE, MAX_ELEMENTOS_LOTE // n))
+    tamanos = [min(lote, permutaciones - inicio) for inicio in range(0, permutaciones, lote)]
+
+    # Las semillas de los lotes no dependen del número de procesos, así que
+    # el resultado es reproducible con cualquier grado de paralelismo
+    semillas = _secuencia_semilla(semilla).spawn(len(tamanos))
+
+    if procesos is None:
+        procesos = (os.cpu_count() or 1) if permutaciones >= UMBRAL_PARALELO else 1
+    procesos = min(procesos, len(tamanos))
+
+    tareas = [(s, t, codigos, estadistico, argumentos, observado)
+              for s, t in zip(semillas, tamanos)]
+
+    if procesos > 1:
+        # 'spawn' evita heredar el estado de Tk/matplotlib y los hilos del proceso principal
+        with ProcessPoolExecutor(max_workers=procesos,
+                                 mp_context=multiprocessing.get_context('spawn')) as ejecutor:
+            conteos = list(ejecutor.map(_lote_permutaciones, *zip(*tareas)))
+    else:
+        conteos = [_lote_permutaciones(*tarea) for tarea in tareas]
+
+    return np.sum(conteos, axis=0)
+
+# ============================================================================
+# PRUEBAS POR PERMUTACIÓN
+# ============================================================================
+
+def permutacion_kruskal(contexto=None, metricas=None, columna_grupo='Modelo_Seguridad',
+                        permutaciones=10000, semilla=None, procesos=None):
+    """Valor p por permutación de Kruskal–Wallis para todas las métricas a la vez"""
+    metricas = list(metricas)
+    datos = matriz_rangos(contexto, metricas, columna_grupo)
+    rangos, codigos = datos['rangos'], datos['codigos']
+    presentes = ~np.isnan(rangos)
+    n_grupos = len(datos['categorias'])
+
+    # Corrección por empates: constante bajo permutación de etiquetas
+    n_total = presentes.sum(axis=0).astype(float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        factor = 1 - datos['ligaduras'] / (n_total ** 3 - n_total)
+
+    argumentos = (rangos, presentes, n_grupos, factor)
+    observado = _estadistico_kruskal(codigos[None, :], *argumentos)[0]
+    extremos = _contar_extremos(codigos, _estadistico_kruskal, argumentos, observado,
+                                permutaciones, semilla, procesos)
+
+    return pd.DataFrame({
+        'Métrica': metricas,
+        'H': observado,
+        'p_permutacion': np.where(np.isnan(observado), np.nan,
+                                  (extremos + 1) / (permutaciones + 1)),
+        'permutaciones': permutaciones,
+    })
+
+def permutacion_mann_whitney(contexto=None, metricas=None, columna_grupo='Modelo_Seguridad',
+                             permutaciones=10000, semilla=None, procesos=None):
+    """Valor p bilateral por permutación de Mann–Whitney para todos los pares y métricas"""
+    metricas = list(metricas)
+    datos = matriz_rangos(contexto, metricas, columna_grupo)
+    valores, codigos, categorias = datos['valores'], datos['codigos'], datos['categorias']
+    pares = list(combinations(range(len(categorias)), 2))
+    semillas = _secuencia_semilla(semilla).spawn(len(pares))
+
+    filas = []
+    for (a, b), semilla_par in zip(pares, semillas):
+        en_par = (codigos == a) | (codigos == b)
+        etiquetas = (codigos[en_par] == a).astype(np.int8)
+
+        # Rangos dentro del par (la U se define sobre la muestra combinada del par)
+        rangos = rankdata(valores[en_par], axis=0, nan_policy='omit')
+        presentes = ~np.isnan(rangos)
+
+        argumentos = (rangos, presentes)
+        observado = _estadistico_mann_whitney(etiquetas[None, :], *argumentos)[0]
+        extremos = _contar_extremos(etiquetas, _estadistico_mann_whitney, argumentos,
+                                    observado, permutaciones, semilla_par, procesos)
+
+        n1 = (presentes & (etiquetas == 1)[:, None]).sum(axis=0)
+        n2 = (presentes & (etiquetas == 0)[:, None]).sum(axis=0)
+        validos = (n1 > 0) & (n2 > 0)
+
+        for j, metrica in enumerate(metricas):
+            filas.append({
+                'Métrica': metrica,
+                'Grupo 1': categorias[a],
+                'Grupo 2': categorias[b],
+                'p_permutacion': (extremos[j] + 1) / (permutaciones + 1) if validos[j] else np.nan,
+                'permutaciones': permutaciones,
+            })
+
+    return pd.DataFrame(filas, columns=['Métrica', 'Grupo 1', 'Grupo 2',
+                                        'p_permutacion', 'permutaciones'])
+
+# ============================================================================
+# INTERVALOS DE CONFIANZA BOOTSTRAP PARA MEDIAS POR GRUPO
+# ============================================================================
+
+def _medias_remuestreadas(valores, presentes, indices):
+    """Medias de cada remuestra (B × k) a partir de una matriz de índices (B × n)"""
+    b, n = indices.shape
+    # Conteo de veces que cada fila aparece en cada remuestra: una sola bincount
+    desplazados = indices + (np.arange(b) * n)[:, None]
+    conteos = np.bincount(desplazados.ravel(), minlength=b * n).reshape(b, n).astype(float)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (conteos @ np.where(presentes, valores, 0.0)) / (conteos @ presentes)
+
+def _cuantil_por_columna(ordenados, q):
+    """Cuantil (interpolación lineal) de cada columna con una probabilidad distinta por columna"""
+    b = ordenados.shape[0]
+    posicion = np.clip(q, 0, 1) * (b - 1)
+    posicion = np.where(np.isnan(posicion), 0, posicion)
+    inferior = np.floor(posicion).astype(int)
+    superior = np.minimum(inferior + 1, b - 1)
+    fraccion = posicion - inferior
+
+    columnas = np.arange(ordenados.shape[1])
+    resultado = (ordenados[inferior, columnas] * (1 - fraccion) +
+                 ordenados[superior, columnas] * fraccion)
+    return np.where(np.isnan(q), np.nan, resultado)
+
+def _intervalos_grupo(valores, rng, remuestras, nivel):
+    """Media, IC percentil e IC BCa de todas las métricas de un grupo"""
+    presentes = ~np.isnan(valores)
+    n, k = valores.shape
+    cantidad = presentes.sum(axis=0)
+    suma = np.where(presentes, valores, 0.0).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = suma / cantidad
+
+    # Remuestras por lotes para acotar la memoria de la matriz de índices
+    lote = max(1, min(TAMANO_LOTE, MAX_ELEMENTOS_LOTE // max(n, 1)))
+    medias = np.concatenate([
+        _medias_remuestreadas(valores, presentes, rng.integers(0, n, (min(lote, remuestras - i), n)))
+        for i in range(0, remuestras, lote)
+    ])
+    ordenados = np.sort(medias, axis=0)
+
+    alfa = (1 - nivel) / 2
+    percentil = (_cuantil_por_columna(ordenados, np.full(k, alfa)),
+                 _cuantil_por_columna(ordenados, np.full(k, 1 - alfa)))
+
+    # BCa: sesgo z0 desde la distribución bootstrap y aceleración por jackknife
+    with np.errstate(invalid='ignore', divide='ignore'):
+        proporcion = ((medias < media).sum(axis=0) + (medias <= media).sum(axis=0)) / (2 * remuestras)
+        z0 = norm.ppf(proporcion)
+
+        jackknife = (suma - np.where(presentes, valores, 0.0)) / (cantidad - presentes)
+        jackknife = np.where(presentes, jackknife, np.nan)
+        desvio = np.nanmean(jackknife, axis=0) - jackknife
+        aceleracion = (np.nansum(desvio ** 3, axis=0) /
+                       (6 * np.nansum(desvio ** 2, axis=0) ** 1.5))
+
+        limites = []
+        for z_alfa in norm.ppf([alfa, 1 - alfa]):
+            q = norm.cdf(z0 + (z0 + z_alfa) / (1 - aceleracion * (z0 + z_alfa)))
+            limites.append(_cuantil_por_columna(ordenados, q))
+
+    return media, cantidad, percentil, tuple(limites)
+
+def bootstrap_medias(contexto=None, metricas=None, columna_grupo='Modelo_Seguridad',
+                     remuestras=10000, nivel=0.95, semilla=None):
+    """IC bootstrap (percentil y BCa) de la media de cada métrica, remuestreando dentro de cada grupo"""
+    ctx = obtener_contexto(contexto)
+    metricas = list(metricas)
+    indice = ctx.indice(columna_grupo)
+    valores = ctx.columnas(metricas).to_numpy(dtype=float)
+    semillas = _secuencia_semilla(semilla).spawn(len(indice.categorias))
+
+    filas = []
+    for categoria, semilla_grupo in zip(indice.categorias, semillas):
+        grupo = valores[indice.posiciones(categoria)]
+        if len(grupo) == 0:
+            continue
+
+        rng = np.random.default_rng(semilla_grupo)
+        media, cantidad, percentil, bca = _intervalos_grupo(grupo, rng, remuestras, nivel)
+
+        for j, metrica in enumerate(metricas):
+            filas.append({
+                columna_grupo: categoria,
+                'Métrica': metrica,
+                'n': int(cantidad[j]),
+                'media': media[j],
+                'ic_percentil_inf': percentil[0][j],
+                'ic_percentil_sup': percentil[1][j],
+                'ic_bca_inf': bca[0][j],
+                'ic_bca_sup': bca[1][j],
+            })
+
+    resultado = pd.DataFrame(filas, columns=[columna_grupo, 'Métrica', 'n', 'media',
+                                             'ic_percentil_inf', 'ic_percentil_sup',
+                                             'ic_bca_inf', 'ic_bca_sup'])
+    resultado['nivel'] = nivel
+    resultado['remuestras'] = remuestras
+    return resultado
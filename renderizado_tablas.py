@@ -0,0 +1,131 @@
+# renderizado_tablas.py
+"""
+RENDERIZADO DE TABLAS EN VARIOS FORMATOS
+Cada columna se formatea una sola vez (una pasada por columna con su propia
+precisión) y Markdown, CSV, LaTeX, HTML y texto plano se generan desde ese
+mismo búfer de celdas ya formateadas
+"""
+
+import csv
+import html
+import io
+import numpy as np
+import pandas as pd
+
+DECIMALES_POR_DEFECTO = 6
+TEXTO_FALTANTE = ''
+
+# Caracteres especiales de LaTeX (se reemplazan en una sola pasada)
+ESCAPES_LATEX = str.maketrans({
+    '\\': r'\textbackslash{}', '&': r'\&', '%': r'\%', '$': r'\$', '#': r'\#',
+    '_': r'\_', '{': r'\{', '}': r'\}', '~': r'\textasciitilde{}', '^': r'\textasciicircum{}',
+})
+
+# ============================================================================
+# FORMATEO POR COLUMNA
+# ============================================================================
+
+def formatear_columna(serie, formato=None, decimales=DECIMALES_POR_DEFECTO, faltante=TEXTO_FALTANTE):
+    """Textos de una columna con un formato printf ('%.2f', '%.1f%%', ...) aplicado en una pasada
+
+    Sin formato, las columnas decimales usan `decimales` y el resto su texto (str)
+    """
+    if isinstance(formato, int):
+        formato = f'%.{formato}f'
+    if formato is None and pd.api.types.is_float_dtype(serie.dtype):
+        formato = f'%.{decimales}f'
+
+    faltantes = serie.isna().to_numpy()
+    if formato is None:
+        textos = list(map(str, serie.tolist()))
+    else:
+        valores = serie.to_numpy(dtype=float, na_value=np.nan)
+        textos = list(map(formato.__mod__, valores.tolist()))
+
+    for i in np.flatnonzero(faltantes):
+        textos[i] = faltante
+    return textos
+
+
+class TablaFormateada:
+    """Tabla con sus celdas ya convertidas a texto, lista para emitirse en cualquier formato"""
+
+    def __init__(self, tabla, formatos=None, decimales=DECIMALES_POR_DEFECTO, faltante=TEXTO_FALTANTE):
+        formatos = formatos or {}
+        self.encabezado = [str(columna) for columna in tabla.columns]
+        self.columnas = [
+            formatear_columna(tabla.iloc[:, j], formatos.get(columna), decimales, faltante)
+            for j, columna in enumerate(tabla.columns)
+        ]
+        # Los valores numéricos se alinean a la derecha
+        self.numericas = [pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+                          for dtype in tabla.dtypes]
+
+    @property
+    def filas(self):
+        return list(zip(*self.columnas))
+
+    def anchos(self):
+        return [max([len(titulo)] + [len(texto) for texto in columna])
+                for titulo, columna in zip(self.encabezado, self.columnas)]
+
+    # ------------------------------------------------------------------------
+    # FORMATOS DE SALIDA
+    # ------------------------------------------------------------------------
+
+    def texto(self, separador='  '):
+        """Texto plano de ancho fijo (equivalente a DataFrame.to_string sin índice)"""
+        anchos = self.anchos()
+        lineas = [separador.join(titulo.rjust(ancho) for titulo, ancho in zip(self.encabezado, anchos))]
+        lineas += [separador.join(texto.rjust(ancho) for texto, ancho in zip(fila, anchos))
+                   for fila in self.filas]
+        return '\n'.join(lineas)
+
+    def markdown(self):
+        """Tabla Markdown con columnas alineadas (numéricas a la derecha)"""
+        encabezado = [titulo.replace('|', r'\|') for titulo in self.encabezado]
+        columnas = [[texto.replace('|', r'\|') for texto in columna] for columna in self.columnas]
+        anchos = [max([len(titulo), 3] + [len(texto) for texto in columna])
+                  for titulo, columna in zip(encabezado, columnas)]
+
+        def alinear(texto, ancho, numerica):
+            return texto.rjust(ancho) if numerica else texto.ljust(ancho)
+
+        lineas = ['| ' + ' | '.join(alinear(t, a, n) for t, a, n in
+                                     zip(encabezado, anchos, self.numericas)) + ' |']
+        lineas.append('|' + '|'.join(('-' * (a + 1) + ':') if n else (':' + '-' * (a + 1))
+                                     for a, n in zip(anchos, self.numericas)) + '|')
+        lineas += ['| ' + ' | '.join(alinear(t, a, n) for t, a, n in
+                                      zip(fila, anchos, self.numericas)) + ' |'
+                   for fila in zip(*columnas)]
+        return '\n'.join(lineas)
+
+    def csv(self):
+        salida = io.StringIO()
+        escritor = csv.writer(salida, lineterminator='\n')
+        escritor.writerow(self.encabezado)
+        escritor.writerows(self.filas)
+        return salida.getvalue()
+
+    def latex(self):
+        """Entorno tabular de LaTeX (solo \\hline, sin paquetes adicionales)"""
+        alineacion = ''.join('r' if numerica else 'l' for numerica in self.numericas)
+        lineas = [f'\\begin{{tabular}}{{{alineacion}}}', '\\hline',
+                  ' & '.join(titulo.translate(ESCAPES_LATEX) for titulo in self.encabezado) + ' \\\\',
+                  '\\hline']
+        lineas += [' & '.join(texto.translate(ESCAPES_LATEX) for texto in fila) + ' \\\\'
+                   for fila in self.filas]
+        lineas += ['\\hline', '\\end{tabular}']
+        return '\n'.join(lineas)
+
+    def html(self):
+        celdas_derecha = ['<td style="text-align: right">' if numerica else '<td>'
+                          for numerica in self.numericas]
+        lineas = ['<table>', '<thead>',
+                  '<tr>' + ''.join(f'<th>{html.escape(titulo)}</th>' for titulo in self.encabezado) + '</tr>',
+                  '</thead>', '<tbody>']
+        lineas += ['<tr>' + ''.join(f'{apertura}{html.escape(texto)}</td>'
+                                    for apertura, texto in zip(celdas_derecha, fila)) + '</tr>'
+                   for fila in self.filas]
+        lineas += ['</tbody>', '</table>']
+        return '\n'.join(lineas)
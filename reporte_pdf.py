@@ -0,0 +1,173 @@
+# reporte_pdf.py
+"""
+REPORTE PDF DEL CAPÍTULO IV
+Tablas 3-12 y los ocho gráficos en un solo PDF (una página por tabla o
+gráfico; las tablas largas continúan en páginas siguientes). Cada página se
+escribe en cuanto se genera y su figura se cierra, así la memoria no crece
+con el número de páginas. Solo usa matplotlib (funciona sin pantalla)
+"""
+
+import os
+import textwrap
+import pandas as pd
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_pdf import PdfPages
+from contexto_datos import obtener_contexto
+from manifiesto_exportacion import escritura_atomica
+from renderizado_tablas import TablaFormateada
+
+RUTA_REPORTE = os.path.join('exportacion_capitulo_iv', 'reporte_capitulo_iv.pdf')
+
+# Página A4 horizontal (pulgadas) y diseño de las tablas
+TAMANO_PAGINA = (11.69, 8.27)
+LINEAS_POR_PAGINA = 32       # Líneas de texto de la tabla por página (incluye encabezado)
+ANCHO_MAXIMO_COLUMNA = 40    # Caracteres antes de partir el texto de una celda
+TAMANO_FUENTE_TABLA = 8
+
+COLOR_ENCABEZADO = '#2c3e50'
+COLOR_FILA_ALTERNA = '#ecf0f1'
+
+# ============================================================================
+# PÁGINAS DE TABLAS
+# ============================================================================
+
+def _envolver(texto, ancho):
+    return textwrap.fill(texto, width=ancho) if len(texto) > ancho else texto
+
+def _preparar_tabla(tabla):
+    """Encabezado y filas como texto partido en líneas; ancho relativo de cada columna"""
+    formateada = TablaFormateada(tabla, decimales=4)
+    encabezado, filas = formateada.encabezado, [list(fila) for fila in formateada.filas]
+
+    # El ancho lo fijan los valores; los encabezados largos se parten en líneas
+    anchos = []
+    for j, titulo in enumerate(encabezado):
+        largo = max([len(fila[j]) for fila in filas] + [len(p) for p in titulo.split()] + [8])
+        anchos.append(min(largo, ANCHO_MAXIMO_COLUMNA))
+
+    encabezado = [_envolver(texto, anchos[j]) for j, texto in enumerate(encabezado)]
+    filas = [[_envolver(texto, anchos[j]) for j, texto in enumerate(fila)] for fila in filas]
+    return encabezado, filas, anchos
+
+def _lineas(fila):
+    return max(texto.count('\n') + 1 for texto in fila)
+
+def _paginar(filas, lineas_encabezado):
+    """Divide las filas en páginas según las líneas de texto que ocupan"""
+    paginas, actual, usadas = [], [], lineas_encabezado
+    for fila in filas:
+        lineas = _lineas(fila)
+        if actual and usadas + lineas > LINEAS_POR_PAGINA:
+            paginas.append(actual)
+            actual, usadas = [], lineas_encabezado
+        actual.append(fila)
+        usadas += lineas
+    paginas.append(actual)
+    return paginas
+
+def _pagina_tabla(titulo, encabezado, filas, anchos):
+    """Figura de una página con el título y la tabla (sin registrarla en pyplot)"""
+    fig = Figure(figsize=TAMANO_PAGINA)
+    fig.text(0.05, 0.95, titulo, fontsize=13, fontweight='bold', va='top')
+
+    ax = fig.add_axes([0.05, 0.05, 0.9, 0.85])
+    ax.axis('off')
+
+    total = sum(anchos)
+    tabla = ax.table(cellText=filas or [[''] * len(encabezado)], colLabels=encabezado,
+                     colWidths=[ancho / total for ancho in anchos], loc='upper center',
+                     cellLoc='left', colLoc='left')
+    tabla.auto_set_font_size(False)
+    tabla.set_fontsize(TAMANO_FUENTE_TABLA)
+
+    # Alto de cada fila proporcional a sus líneas de texto
+    alto_linea = 1.0 / LINEAS_POR_PAGINA
+    alturas = [_lineas(encabezado)] + [_lineas(fila) for fila in filas]
+    for (i, _), celda in tabla.get_celld().items():
+        celda.set_height(alturas[i] * alto_linea if i < len(alturas) else alto_linea)
+        if i == 0:
+            celda.set_facecolor(COLOR_ENCABEZADO)
+            celda.get_text().set_color('white')
+            celda.get_text().set_fontweight('bold')
+        elif i % 2 == 0:
+            celda.set_facecolor(COLOR_FILA_ALTERNA)
+
+    return fig
+
+def paginas_tabla(titulo, tabla):
+    """Genera las páginas (figuras) de una tabla, con '(continuación)' si ocupa varias"""
+    encabezado, filas, anchos = _preparar_tabla(tabla)
+    paginas = _paginar(filas, _lineas(encabezado))
+    for numero, filas_pagina in enumerate(paginas):
+        titulo_pagina = titulo if numero == 0 else f"{titulo} (continuación)"
+        yield _pagina_tabla(titulo_pagina, encabezado, filas_pagina, anchos)
+
+# ============================================================================
+# PORTADA
+# ============================================================================
+
+def _portada(ctx):
+    fig = Figure(figsize=TAMANO_PAGINA)
+    fig.text(0.5, 0.62, "CAPÍTULO IV - RESULTADOS", ha='center', fontsize=24, fontweight='bold')
+    fig.text(0.5, 0.54, "Modelos de seguridad en entidades públicas", ha='center', fontsize=14)
+    fig.text(0.5, 0.40, f"Entidades analizadas: {len(ctx.df)}", ha='center', fontsize=11)
+    fig.text(0.5, 0.35, f"Versión del dataset: {ctx.version[:12]}", ha='center', fontsize=9,
+             color='#7f8c8d')
+    fig.text(0.5, 0.31, f"Generado: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}",
+             ha='center', fontsize=9, color='#7f8c8d')
+    return fig
+
+# ============================================================================
+# REPORTE COMPLETO
+# ============================================================================
+
+def generar_reporte_pdf(ruta=RUTA_REPORTE, contexto=None, tablas=True, graficos=True):
+    """Escribe portada, tablas y gráficos en un PDF, página por página; retorna la ruta"""
+    from analisis_estadistico import FUNCIONES_TABLAS, TITULOS_TABLAS
+    from graficos_completos import FUNCIONES_GRAFICOS, aplicar_estilo
+
+    # Portada y tablas con el mismo estilo que los gráficos
+    aplicar_estilo()
+    ctx = obtener_contexto(contexto)
+    os.makedirs(os.path.dirname(ruta) or '.', exist_ok=True)
+    paginas = 0
+
+    print("📄 Generando reporte PDF...")
+
+    with escritura_atomica(ruta) as temporal:
+        metadatos = {'Title': 'Capítulo IV - Resultados', 'Subject': 'Tablas 3-12 y gráficos'}
+        with PdfPages(temporal, metadata=metadatos) as pdf:
+            pdf.savefig(_portada(ctx))
+            paginas += 1
+
+            if tablas:
+                for nombre, funcion in FUNCIONES_TABLAS.items():
+                    for pagina in paginas_tabla(TITULOS_TABLAS[nombre], funcion(ctx)):
+                        pdf.savefig(pagina)
+                        paginas += 1
+                    print(f"  • {TITULOS_TABLAS[nombre].split(':')[0]} ✅")
+
+            if graficos:
+                for nombre, funcion in FUNCIONES_GRAFICOS.items():
+                    fig = funcion(ctx)
+                    try:
+                        pdf.savefig(fig, bbox_inches='tight')
+                        paginas += 1
+                    finally:
+                        # La página ya está en el archivo: liberar la figura
+                        plt.close(fig)
+                    print(f"  • Gráfico {nombre} ✅")
+
+    print(f"✅ Reporte PDF generado: '{ruta}' ({paginas} páginas)")
+    return ruta
+
+# ============================================================================
+# EJECUCIÓN PRINCIPAL
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("REPORTE PDF - CAPÍTULO IV")
+    print("=" * 80)
+    generar_reporte_pdf()
@@ -0,0 +1,144 @@
+# salida_figuras.py
+"""
+SALIDA DE FIGURAS EN VARIOS FORMATOS
+El recorte ajustado (tight) se calcula sin rasterizar y la figura se dibuja
+una sola vez en Agg: de ese dibujo salen el PNG y la vista previa; los
+formatos vectoriales se escriben con el recorte ya calculado
+"""
+
+import io
+import math
+from contextlib import nullcontext
+import numpy as np
+from matplotlib import rcParams
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+from catalogo import FORMATOS_GRAFICOS as FORMATOS_SOPORTADOS
+from catalogo import FORMATOS_GRAFICOS_POR_DEFECTO as FORMATOS_POR_DEFECTO
+from manifiesto_exportacion import escritura_atomica
+
+DPI_POR_DEFECTO = 300
+DPI_VISTA_PREVIA = 72
+DPI_PANTALLA = 100           # Resolución en pantalla si no se indica el tamaño del panel
+DPI_MINIMO_PANTALLA = 40
+
+def guardar_figura(fig, ruta_base, formatos=FORMATOS_POR_DEFECTO, dpi=DPI_POR_DEFECTO,
+                   dpi_vista_previa=DPI_VISTA_PREVIA):
+    """Guarda la figura en los formatos pedidos a partir de un único dibujo; retorna las rutas"""
+    formatos = list(formatos)
+    desconocidos = [f for f in formatos if f not in FORMATOS_SOPORTADOS]
+    if desconocidos:
+        raise ValueError(f"Formatos no soportados: {desconocidos} (use {FORMATOS_SOPORTADOS})")
+
+    canvas_original = fig.canvas
+    dpi_original = fig.dpi
+    motor_diseno = None
+    rutas = []
+
+    try:
+        canvas = FigureCanvasAgg(fig)
+        fig.dpi = dpi
+
+        # Recorte ajustado calculado una sola vez y antes de rasterizar (mismo
+        # margen que savefig): el diseño se resuelve sin pintar píxeles
+        renderizador = canvas.get_renderer()
+        with getattr(renderizador, '_draw_disabled', nullcontext)():
+            fig.draw(renderizador)
+        recorte = fig.get_tightbbox(renderizador).padded(rcParams['savefig.pad_inches'])
+        # Con el diseño ya resuelto, savefig no repite el pase sin pintar
+        # (lo hace siempre que la figura tiene motor de diseño, p. ej. tras tight_layout)
+        motor_diseno, fig._layout_engine = fig.get_layout_engine(), None
+
+        # Único dibujo rasterizado a la resolución final (solo si hay salida raster)
+        imagen = png = None
+        if 'png' in formatos or 'vista_previa' in formatos:
+            if _dentro_del_lienzo(recorte, fig):
+                canvas.draw()
+                imagen = _recortar_buffer(canvas, recorte, dpi)
+            else:
+                # El recorte sobresale del lienzo (p. ej. suptitle con y > 1):
+                # un solo dibujo ya recortado, del que sale también la vista previa
+                buffer = io.BytesIO()
+                fig.savefig(buffer, format='png', dpi=dpi, bbox_inches=recorte)
+                png = buffer.getvalue()
+                imagen = Image.open(io.BytesIO(png))
+
+        if 'png' in formatos:
+            ruta = f'{ruta_base}.png'
+            with escritura_atomica(ruta) as temporal:
+                if png is not None:
+                    with open(temporal, 'wb') as f:
+                        f.write(png)
+                else:
+                    imagen.save(temporal, dpi=(dpi, dpi))
+            rutas.append(ruta)
+
+        if 'vista_previa' in formatos:
+            ruta = f'{ruta_base}_vista_previa.png'
+            with escritura_atomica(ruta) as temporal:
+                escala = dpi_vista_previa / dpi
+                tamano = (max(1, round(imagen.width * escala)), max(1, round(imagen.height * escala)))
+                previa = imagen.resize(tamano, Image.LANCZOS, reducing_gap=2.0)
+                previa.save(temporal, dpi=(dpi_vista_previa,) * 2)
+            rutas.append(ruta)
+
+        # Vectoriales: el recorte ya calculado evita el pase extra de 'tight'
+        for formato in ('pdf', 'svg'):
+            if formato in formatos:
+                ruta = f'{ruta_base}.{formato}'
+                with escritura_atomica(ruta) as temporal:
+                    fig.savefig(temporal, format=formato, dpi=dpi, bbox_inches=recorte)
+                rutas.append(ruta)
+    finally:
+        if motor_diseno is not None:
+            fig._layout_engine = motor_diseno
+        fig.dpi = dpi_original
+        fig.set_canvas(canvas_original)
+
+    return rutas
+
+def _dentro_del_lienzo(recorte, fig):
+    """True si el cuadro ajustado (en pulgadas) cabe en el lienzo, redondeado a píxeles"""
+    dpi = fig.dpi
+    ancho, alto = fig.canvas.get_width_height()
+    return (math.floor(recorte.x0 * dpi) >= 0 and math.floor(recorte.y0 * dpi) >= 0 and
+            math.ceil(recorte.x1 * dpi) <= ancho and math.ceil(recorte.y1 * dpi) <= alto)
+
+def _recortar_buffer(canvas, recorte, dpi):
+    """Recorta el buffer RGBA (ya dibujado) al cuadro ajustado"""
+    buffer = np.asarray(canvas.buffer_rgba())
+    alto, ancho = buffer.shape[:2]
+
+    x0, x1 = math.floor(recorte.x0 * dpi), math.ceil(recorte.x1 * dpi)
+    y0, y1 = math.floor(recorte.y0 * dpi), math.ceil(recorte.y1 * dpi)
+
+    # El origen de la figura está abajo; el del buffer, arriba
+    return Image.fromarray(buffer[alto - y1:alto - y0, x0:x1].copy(), 'RGBA')
+
+# ============================================================================
+# MAPA DE BITS PARA PANTALLA
+# ============================================================================
+
+def renderizar_para_pantalla(funcion, *args, ancho=None, alto=None, **kwargs):
+    """Genera la figura y la rasteriza con Agg; retorna (PNG, figura serializada con pickle)
+
+    Pensada para un proceso aparte: el PNG se ajusta a ancho×alto píxeles
+    conservando la proporción, y la figura serializada solo se usa si la
+    interfaz activa la vista interactiva (zoom, desplazamiento, exportación)
+    """
+    import pickle
+    import matplotlib.pyplot as plt
+
+    fig = funcion(*args, **kwargs)
+    try:
+        dpi = DPI_PANTALLA
+        if ancho and alto:
+            ancho_pulgadas, alto_pulgadas = fig.get_size_inches()
+            dpi = max(min(ancho / ancho_pulgadas, alto / alto_pulgadas), DPI_MINIMO_PANTALLA)
+
+        # Compresión mínima: el PNG solo viaja al proceso de la interfaz
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=dpi, pil_kwargs={'compress_level': 1})
+        return buffer.getvalue(), pickle.dumps(fig)
+    finally:
+        plt.close(fig)
@@ -0,0 +1,86 @@
+# conftest.py
+"""
+CONFIGURACIÓN COMÚN DE LAS PRUEBAS
+Módulos del proyecto importables desde las pruebas (y desde los procesos
+'spawn' que estas lanzan), backend Agg y caché de resultados en un
+directorio temporal para no tocar la del usuario
+"""
+
+import os
+import sys
+
+DIRECTORIO_PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if DIRECTORIO_PROYECTO not in sys.path:
+    sys.path.insert(0, DIRECTORIO_PROYECTO)
+
+os.environ['MPLBACKEND'] = 'Agg'
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def cache_temporal(tmp_path, monkeypatch):
+    """Cada prueba usa su propio directorio de caché (también en los procesos hijos)"""
+    import cache_resultados
+    directorio = str(tmp_path / 'cache_resultados')
+    # monkeypatch restaura al terminar lo que cambien las pruebas (p. ej. --sin-cache)
+    monkeypatch.setenv('TESIS_CACHE_DIR', directorio)
+    monkeypatch.setenv('TESIS_SIN_CACHE', os.environ.get('TESIS_SIN_CACHE', ''))
+    monkeypatch.setitem(cache_resultados._configuracion, 'directorio', directorio)
+    monkeypatch.setitem(cache_resultados._configuracion, 'habilitado',
+                        cache_resultados._configuracion['habilitado'])
+    return directorio
+
+# ============================================================================
+# DATASET SINTÉTICO
+# ============================================================================
+
+def generar_dataset(filas=300, semilla=0, faltantes=0.05):
+    """Dataset con el esquema del estudio: métricas enteras o de un decimal (muchos
+    empates), valores faltantes y algunas filas sin modelo de seguridad"""
+    import numpy as np
+    import pandas as pd
+    from datos import COLUMNAS_DATASET
+
+    rng = np.random.default_rng(semilla)
+    modelos = np.array(['Perimetral', 'Híbrido', 'Zero Trust'])
+    codigo = rng.integers(0, 3, filas)
+
+    df = pd.DataFrame({
+        'Entidad': [f'ENT_{i}' for i in range(filas)],
+        'Empleados': rng.integers(500, 5000, filas),
+        'Presupuesto_Seguridad_USD': rng.integers(50, 400, filas) * 1000,
+        'Modelo_Seguridad': modelos[codigo],
+        'Años_Implementación': rng.integers(1, 16, filas),
+        'Nivel_Madurez': rng.choice(['Bajo', 'Medio', 'Alto'], filas),
+        'Incidentes_Mensuales': rng.integers(5, 50, filas) - 10 * codigo,
+        'Bloqueos_Exitosos': rng.integers(3, 30, filas),
+        'Tasa_Bloqueo_%': np.round(rng.normal(60 + 10 * codigo, 8), 1),
+        'Tiempo_Respuesta_min': np.round(rng.normal(50 - 15 * codigo, 6)),
+        'Tiempo_Detección_min': np.round(rng.normal(18 - 5 * codigo, 3), 1),
+        'Percepción_1_5': rng.integers(1, 6, filas).astype(float),
+        'Capacitación_1_5': rng.integers(1, 6, filas),
+        'Frecuencia_Simulacros': rng.choice(['Anual', 'Semestral', 'Trimestral', 'Mensual'], filas),
+        '%_Presupuesto_IT_Seguridad': rng.integers(8, 25, filas),
+        'Especialistas': rng.integers(2, 15, filas),
+    }, columns=COLUMNAS_DATASET)
+
+    # Faltantes solo en columnas de punto flotante (las enteras conservan su tipo)
+    for columna in ('Tasa_Bloqueo_%', 'Tiempo_Respuesta_min', 'Percepción_1_5'):
+        df.loc[rng.random(filas) < faltantes, columna] = np.nan
+    df.loc[rng.random(filas) < faltantes / 2, 'Modelo_Seguridad'] = 'Sin dato'
+    return df
+
+
+@pytest.fixture
+def dataset_sintetico():
+    return generar_dataset()
+
+
+@pytest.fixture
+def contexto_sintetico(tmp_path, dataset_sintetico):
+    """Contexto sobre el dataset sintético guardado como directorio de columnas NumPy"""
+    from contexto_datos import ContextoDatos
+    from fuentes_datos import abrir_fuente, guardar_dataset_columnar
+    ruta = guardar_dataset_columnar(dataset_sintetico, str(tmp_path / 'sintetico'))
+    return ContextoDatos(abrir_fuente(ruta))
@@ -0,0 +1,54 @@
+# test_cache_figuras.py
+"""
+PRUEBAS DE LA CACHÉ DE FIGURAS DE LA INTERFAZ
+Al guardar K+1 gráficos se descarta el menos usado y se cierra su figura
+"""
+
+import pickle
+import pytest
+import matplotlib.pyplot as plt
+from cache_figuras import CacheFiguras, CAPACIDAD_POR_DEFECTO, VARIABLE_CAPACIDAD
+
+
+def _serializada(numero):
+    fig, ax = plt.subplots()
+    ax.plot([0, numero])
+    datos = pickle.dumps(fig)
+    plt.close(fig)
+    return datos
+
+@pytest.fixture(autouse=True)
+def cerrar_figuras():
+    plt.close('all')
+    yield
+    plt.close('all')
+
+def test_capacidad_menor_que_los_graficos_del_capitulo():
+    from graficos_completos import FUNCIONES_GRAFICOS
+    assert CAPACIDAD_POR_DEFECTO < len(FUNCIONES_GRAFICOS)
+
+def test_capacidad_configurable(monkeypatch):
+    monkeypatch.setenv(VARIABLE_CAPACIDAD, '2')
+    assert CacheFiguras().capacidad == 2
+    monkeypatch.setenv(VARIABLE_CAPACIDAD, 'muchos')
+    assert CacheFiguras().capacidad == CAPACIDAD_POR_DEFECTO
+    assert CacheFiguras(3).capacidad == 3
+
+def test_k_mas_uno_cierra_la_figura_descartada():
+    k = 3
+    cache = CacheFiguras(k)
+    figuras = {}
+    for numero in range(k):
+        entrada = cache.guardar(numero, b'png', _serializada(numero))
+        figuras[numero] = entrada.obtener_figura()
+    assert len(plt.get_fignums()) == k
+
+    # Usar el 0 lo vuelve el más reciente: el descartado debe ser el 1
+    cache.obtener(0)
+    cache.guardar(k, b'png', _serializada(k)).obtener_figura()
+
+    assert 1 not in cache and len(cache) == k
+    assert not plt.fignum_exists(figuras[1].number)
+    assert plt.fignum_exists(figuras[0].number)
+    assert len(plt.get_fignums()) == k
+    assert cache.estadisticas()['figuras_cache'] == k
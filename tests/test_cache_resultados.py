@@ -0,0 +1,109 @@
+# test_cache_resultados.py
+"""
+PRUEBAS DE LA CACHÉ DE RESULTADOS
+Aciertos solo con el mismo dataset, parámetros y versión del código; los
+resultados aleatorios sin semilla y la caché desactivada no escriben en disco
+"""
+
+import os
+import pandas as pd
+import pytest
+import cache_resultados
+from cache_resultados import en_cache, configurar_cache, clave_resultado
+from conftest import generar_dataset
+from contexto_datos import ContextoDatos
+from fuentes_datos import abrir_fuente, guardar_dataset_columnar
+
+llamadas = []
+
+
+@en_cache
+def _resumen(contexto=None, columna='Incidentes_Mensuales', permutaciones=0, semilla=None):
+    llamadas.append(columna)
+    return contexto.columnas([columna]).describe()
+
+
+@pytest.fixture(autouse=True)
+def cache_activa(cache_temporal):
+    # Independiente de TESIS_SIN_CACHE en el entorno de quien ejecuta las pruebas
+    configurar_cache(habilitado=True)
+
+
+def _archivos(directorio):
+    return sorted(os.listdir(directorio)) if os.path.isdir(directorio) else []
+
+def test_acierto_sin_recalcular(contexto_sintetico, cache_temporal):
+    llamadas.clear()
+    primero = _resumen(contexto_sintetico)
+    segundo = _resumen(contexto_sintetico)
+
+    assert llamadas == ['Incidentes_Mensuales']
+    pd.testing.assert_frame_equal(primero, segundo)
+    assert len(_archivos(cache_temporal)) == 1
+
+    # Otros parámetros: otra entrada
+    _resumen(contexto_sintetico, columna='Especialistas')
+    assert llamadas == ['Incidentes_Mensuales', 'Especialistas']
+    assert len(_archivos(cache_temporal)) == 2
+
+def test_clave_cambia_con_dataset_y_version_del_codigo(tmp_path, contexto_sintetico, monkeypatch):
+    parametros = {'columna': 'Incidentes_Mensuales'}
+    clave = clave_resultado(contexto_sintetico, _resumen.sin_cache, parametros)
+
+    otro = ContextoDatos(abrir_fuente(guardar_dataset_columnar(generar_dataset(semilla=1),
+                                                               str(tmp_path / 'otro'))))
+    assert clave_resultado(otro, _resumen.sin_cache, parametros) != clave
+
+    monkeypatch.setattr(cache_resultados, 'version_codigo', lambda: 'otra version')
+    assert clave_resultado(contexto_sintetico, _resumen.sin_cache, parametros) != clave
+
+def test_version_del_codigo_invalida_entradas(contexto_sintetico, cache_temporal, monkeypatch):
+    llamadas.clear()
+    _resumen(contexto_sintetico)
+    monkeypatch.setattr(cache_resultados, 'version_codigo', lambda: 'otra version')
+    _resumen(contexto_sintetico)
+    assert len(llamadas) == 2
+
+def test_aleatorio_sin_semilla_no_se_guarda(contexto_sintetico, cache_temporal):
+    llamadas.clear()
+    _resumen(contexto_sintetico, permutaciones=100)
+    _resumen(contexto_sintetico, permutaciones=100)
+    assert len(llamadas) == 2
+    assert _archivos(cache_temporal) == []
+
+    _resumen(contexto_sintetico, permutaciones=100, semilla=3)
+    assert len(_archivos(cache_temporal)) == 1
+
+def test_cache_desactivada(contexto_sintetico, cache_temporal):
+    configurar_cache(habilitado=False)
+    assert os.environ['TESIS_SIN_CACHE'] == '1'
+
+    llamadas.clear()
+    _resumen(contexto_sintetico)
+    _resumen(contexto_sintetico)
+    assert len(llamadas) == 2
+    assert _archivos(cache_temporal) == []
+
+def test_entrada_danada_se_descarta(contexto_sintetico, cache_temporal):
+    llamadas.clear()
+    _resumen(contexto_sintetico)
+    (entrada,) = _archivos(cache_temporal)
+    with open(os.path.join(cache_temporal, entrada), 'wb') as f:
+        f.write(b'no es zlib')
+
+    _resumen(contexto_sintetico)
+    assert len(llamadas) == 2
+    assert _archivos(cache_temporal) == [entrada]
+
+def test_desalojo_por_tamano(contexto_sintetico, cache_temporal, monkeypatch):
+    _resumen(contexto_sintetico)
+    tamano = sum(os.path.getsize(os.path.join(cache_temporal, nombre))
+                 for nombre in _archivos(cache_temporal))
+    # Cabe una sola entrada: la usada hace más tiempo se elimina
+    monkeypatch.setitem(cache_resultados._configuracion, 'tamano_maximo', int(tamano * 1.5))
+    primera = _archivos(cache_temporal)
+    os.utime(os.path.join(cache_temporal, primera[0]), ns=(0, 0))
+    _resumen(contexto_sintetico, columna='Especialistas')
+
+    restantes = _archivos(cache_temporal)
+    assert len(restantes) == 1 and restantes != primera
@@ -0,0 +1,35 @@
+# test_contexto_datos.py
+"""
+PRUEBAS DEL CONTEXTO DE DATOS
+Las filas con valores fuera de las categorías del estudio (p. ej. 'Sin dato')
+quedan sin grupo en el índice, sin advertencias de pandas
+"""
+
+import warnings
+import numpy as np
+import pandas as pd
+from contexto_datos import IndiceGrupos, ORDEN_CATEGORIAS
+
+MODELOS = ORDEN_CATEGORIAS['Modelo_Seguridad']
+
+
+def test_valores_fuera_de_categorias_sin_grupo():
+    serie = pd.Series(['Híbrido', 'Sin dato', 'Perimetral', None, 'Zero Trust', 'Híbrido', 'Otro'])
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        indice = IndiceGrupos(serie, MODELOS)
+
+    assert indice.categorias == MODELOS
+    np.testing.assert_array_equal(indice.codigos, [1, -1, 0, -1, 2, 1, -1])
+    assert [list(indice.posiciones(modelo)) for modelo in MODELOS] == [[2], [0, 5], [4]]
+    agrupadas = np.concatenate(indice.dividir(np.arange(len(serie))))
+    assert not set(agrupadas) & {1, 3, 6}
+
+def test_contexto_sin_dato(contexto_sintetico, dataset_sintetico):
+    indice = contexto_sintetico.indice('Modelo_Seguridad')
+    sin_dato = np.flatnonzero(dataset_sintetico['Modelo_Seguridad'] == 'Sin dato')
+    assert len(sin_dato) > 0
+    assert (indice.codigos[sin_dato] == -1).all()
+    for modelo in MODELOS:
+        assert not set(indice.posiciones(modelo)) & set(sin_dato)
+    assert sum(indice.tamano(modelo) for modelo in MODELOS) == len(dataset_sintetico) - len(sin_dato)
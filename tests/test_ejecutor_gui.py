@@ -0,0 +1,120 @@
+# test_ejecutor_gui.py
+"""
+PRUEBAS DEL EJECUTOR DE TAREAS DE LA INTERFAZ
+Con una raíz falsa (sin pantalla): resultados en el hilo que sondea la cola,
+rechazo de una acción en curso, funciones indicadas como 'modulo.funcion'
+que se importan dentro de la tarea y cancelación de tareas aisladas en curso
+"""
+
+import threading
+import time
+from ejecutor_gui import EjecutorTareas
+
+
+class RaizFalsa:
+    """Lo mínimo de Tk que usa el ejecutor: after y after_cancel"""
+
+    def __init__(self):
+        self.pendientes = {}
+        self.contador = 0
+
+    def after(self, milisegundos, funcion):
+        self.contador += 1
+        self.pendientes[self.contador] = funcion
+        return self.contador
+
+    def after_cancel(self, identificador):
+        self.pendientes.pop(identificador, None)
+
+    def procesar(self, hasta, limite=120):
+        inicio = time.time()
+        while not hasta() and time.time() - inicio < limite:
+            for identificador, funcion in list(self.pendientes.items()):
+                self.pendientes.pop(identificador)
+                funcion()
+            time.sleep(0.02)
+
+
+def esperar(tarea, segundos):
+    time.sleep(segundos)
+    return segundos
+
+def test_resultado_en_el_hilo_que_sondea():
+    raiz = RaizFalsa()
+    ejecutor = EjecutorTareas(raiz)
+    resultados = []
+    try:
+        ejecutor.enviar('a', esperar, 0.1,
+                        al_terminar=lambda r: resultados.append((r, threading.current_thread())))
+        assert ejecutor.enviar('a', esperar, 0) is None
+        raiz.procesar(lambda: not ejecutor.ocupado('a'))
+    finally:
+        ejecutor.cerrar()
+    assert resultados == [(0.1, threading.current_thread())]
+
+def test_funcion_por_ruta_en_hilo_y_en_proceso():
+    raiz = RaizFalsa()
+    ejecutor = EjecutorTareas(raiz)
+    resultados = {}
+    try:
+        ejecutor.enviar('hilo', 'test_ejecutor_gui.esperar', 0,
+                        al_terminar=lambda r: resultados.setdefault('hilo', r))
+        ejecutor.enviar('proceso', 'math.sqrt', 16.0, aislado=True,
+                        al_terminar=lambda r: resultados.setdefault('proceso', r),
+                        al_fallar=lambda e: resultados.setdefault('proceso', e))
+        raiz.procesar(lambda: len(resultados) == 2)
+    finally:
+        ejecutor.cerrar()
+    assert resultados == {'hilo': 0, 'proceso': 4.0}
+
+def test_grafico_para_pantalla_en_proceso():
+    from contexto_datos import obtener_contexto
+    raiz = RaizFalsa()
+    ejecutor = EjecutorTareas(raiz)
+    resultados = []
+    try:
+        ejecutor.enviar('grafico', 'graficos_completos.grafico_para_pantalla', '1_incidentes',
+                        ancho=400, alto=300, aislado=True,
+                        al_terminar=resultados.append, al_fallar=resultados.append)
+        raiz.procesar(lambda: resultados)
+    finally:
+        ejecutor.cerrar()
+    png, serializada, version = resultados[0]
+    assert png.startswith(b'\x89PNG') and serializada
+    assert version == obtener_contexto().version
+
+def procesos_aislados(ejecutor):
+    return list(ejecutor._procesos._processes.values())
+
+def test_cancelar_tarea_aislada_termina_su_proceso():
+    raiz = RaizFalsa()
+    ejecutor = EjecutorTareas(raiz)
+    sucesos = {}
+    try:
+        ejecutor.enviar('lenta', 'time.sleep', 600, aislado=True,
+                        al_terminar=lambda r: sucesos.setdefault('lenta', 'terminada'),
+                        al_cancelar=lambda: sucesos.setdefault('lenta', 'cancelada'))
+        ejecutor.enviar('rapida', 'math.sqrt', 16.0, aislado=True,
+                        al_terminar=lambda r: sucesos.setdefault('rapida', r),
+                        al_fallar=lambda e: sucesos.setdefault('rapida', e))
+        procesos = procesos_aislados(ejecutor)
+        ejecutor.cancelar('lenta')
+        for proceso in procesos:
+            proceso.join(10)
+            assert not proceso.is_alive()
+        # La tarea que esperaba detrás pasa a un proceso nuevo
+        raiz.procesar(lambda: len(sucesos) == 2)
+    finally:
+        ejecutor.cerrar()
+    assert sucesos == {'lenta': 'cancelada', 'rapida': 4.0}
+
+def test_cerrar_termina_el_proceso_aislado():
+    raiz = RaizFalsa()
+    ejecutor = EjecutorTareas(raiz)
+    ejecutor.enviar('lenta', 'time.sleep', 600, aislado=True)
+    procesos = procesos_aislados(ejecutor)
+    ejecutor.cerrar()
+    for proceso in procesos:
+        proceso.join(10)
+        assert not proceso.is_alive()
+    assert not ejecutor.ocupado('lenta')
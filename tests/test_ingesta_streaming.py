@@ -0,0 +1,110 @@
+# test_ingesta_streaming.py
+"""
+PRUEBAS DE LA INGESTA POR STREAMING
+Las Tablas 3 y 6-9 calculadas por bloques desde CSV/Excel coinciden con las
+calculadas en memoria, también con faltantes y filas sin modelo; con una
+fuente CSV/Excel, la exportación no carga el archivo completo
+"""
+
+import os
+import pandas as pd
+import pytest
+from analisis_estadistico import FUNCIONES_TABLAS
+from contexto_datos import ContextoDatos
+from fuentes_datos import abrir_fuente, FuenteTabular
+from ingesta_streaming import generar_tablas_streaming, leer_por_bloques, AgregadosParciales
+
+TABLAS_STREAMING = ['tabla3', 'tabla6', 'tabla7', 'tabla8', 'tabla9']
+
+
+@pytest.mark.parametrize('tamano_bloque', [37, 10_000])
+def test_csv_por_bloques_igual_que_en_memoria(tmp_path, dataset_sintetico, contexto_sintetico, tamano_bloque):
+    ruta = tmp_path / 'sintetico.csv'
+    dataset_sintetico.to_csv(ruta, index=False, encoding='utf-8-sig')
+
+    tablas = generar_tablas_streaming(str(ruta), tamano_bloque=tamano_bloque)
+    for nombre in TABLAS_STREAMING:
+        pd.testing.assert_frame_equal(tablas[nombre], FUNCIONES_TABLAS[nombre].sin_cache(contexto_sintetico),
+                                      obj=nombre)
+
+def test_excel_por_bloques_igual_que_en_memoria(tmp_path, dataset_sintetico, contexto_sintetico):
+    ruta = tmp_path / 'sintetico.xlsx'
+    dataset_sintetico.to_excel(ruta, index=False)
+
+    tablas = generar_tablas_streaming(str(ruta), tamano_bloque=50)
+    for nombre in TABLAS_STREAMING:
+        pd.testing.assert_frame_equal(tablas[nombre], FUNCIONES_TABLAS[nombre].sin_cache(contexto_sintetico),
+                                      obj=nombre)
+
+def test_agregados_combinados_igual_que_secuenciales(tmp_path, dataset_sintetico):
+    ruta = tmp_path / 'sintetico.csv'
+    dataset_sintetico.to_csv(ruta, index=False, encoding='utf-8-sig')
+    bloques = list(leer_por_bloques(str(ruta), tamano_bloque=64))
+
+    secuencial = AgregadosParciales()
+    for bloque in bloques:
+        secuencial.actualizar(bloque)
+
+    # Dos mitades agregadas por separado (como en paralelo) y luego combinadas
+    mitad = len(bloques) // 2
+    izquierda, derecha = AgregadosParciales(), AgregadosParciales()
+    for bloque in bloques[:mitad]:
+        izquierda.actualizar(bloque)
+    for bloque in bloques[mitad:]:
+        derecha.actualizar(bloque)
+    combinado = izquierda.combinar(derecha)
+
+    assert combinado.filas == secuencial.filas == len(dataset_sintetico)
+    assert combinado.enteras == secuencial.enteras
+    for modelo in (None, 'Perimetral', 'Híbrido', 'Zero Trust', 'Sin dato'):
+        a, b = combinado.seleccionar(modelo=modelo), secuencial.seleccionar(modelo=modelo)
+        assert (a.n == b.n).all() and a.filas == b.filas
+        assert a.frecuencias == b.frecuencias
+        pd.testing.assert_series_equal(pd.Series(a.suma), pd.Series(b.suma), rtol=1e-12)
+        pd.testing.assert_series_equal(pd.Series(a.m2), pd.Series(b.m2), rtol=1e-9)
+
+@pytest.fixture
+def lecturas(monkeypatch):
+    """Columnas que se leen en memoria desde fuentes CSV/Excel"""
+    leidas = []
+    leer = FuenteTabular.leer
+
+    def registrar(fuente, columnas=None):
+        leidas.append(list(columnas) if columnas is not None else None)
+        return leer(fuente, columnas)
+
+    monkeypatch.setattr(FuenteTabular, 'leer', registrar)
+    return leidas
+
+def test_tablas_de_fuente_csv_desde_agregados(tmp_path, dataset_sintetico, contexto_sintetico, lecturas):
+    ruta = tmp_path / 'sintetico.csv'
+    dataset_sintetico.to_csv(ruta, index=False, encoding='utf-8-sig')
+    ctx = ContextoDatos(abrir_fuente(str(ruta)))
+
+    for nombre in TABLAS_STREAMING:
+        pd.testing.assert_frame_equal(FUNCIONES_TABLAS[nombre].sin_cache(ctx),
+                                      FUNCIONES_TABLAS[nombre].sin_cache(contexto_sintetico), obj=nombre)
+    assert lecturas == []
+
+    # Los intervalos bootstrap sí necesitan los valores individuales
+    FUNCIONES_TABLAS['tabla8'].sin_cache(ctx, bootstrap=100, semilla=0)
+    assert lecturas and None not in lecturas
+
+def test_exportacion_de_csv_lee_solo_columnas_necesarias(tmp_path, dataset_sintetico, lecturas):
+    from pipeline import exportar_todo
+    ruta = tmp_path / 'sintetico.csv'
+    dataset_sintetico.to_csv(ruta, index=False, encoding='utf-8-sig')
+    ctx = ContextoDatos(abrir_fuente(str(ruta)))
+    salida = tmp_path / 'salida'
+
+    _, errores = exportar_todo(str(salida), ctx, procesos=1, tablas=TABLAS_STREAMING + ['tabla10'],
+                               graficos=False, dataset=False, verificacion=False, libro=False,
+                               formatos_tablas=['csv'])
+    assert errores == {}
+    assert sorted(os.listdir(salida / 'tablas')) == sorted(f'{n}.csv' for n in TABLAS_STREAMING + ['tabla10'])
+
+    # Solo la Tabla 10 (rangos) carga columnas: los grupos y sus métricas, nunca el archivo completo
+    leidas = {columna for columnas in lecturas for columna in columnas}
+    assert None not in lecturas
+    assert 'Modelo_Seguridad' in leidas
+    assert not leidas & {'Entidad', 'Empleados', 'Años_Implementación', 'Frecuencia_Simulacros'}
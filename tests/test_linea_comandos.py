@@ -0,0 +1,63 @@
+# test_linea_comandos.py
+"""
+PRUEBAS DE LA EJECUCIÓN POR LÍNEA DE COMANDOS
+--sin-cache también desactiva la caché en los procesos trabajadores,
+--datos acepta CSV/Excel (leídos por bloques) y --help/--listar no importan
+pandas, SciPy ni matplotlib
+"""
+
+import os
+import subprocess
+import sys
+import pytest
+import linea_comandos
+from conftest import DIRECTORIO_PROYECTO
+
+MODULOS_PESADOS = ('numpy', 'pandas', 'scipy', 'matplotlib', 'seaborn')
+
+ARGUMENTOS_TABLAS = ['--tablas', 'tabla3', 'tabla8', 'tabla10', '--sin-graficos', '--sin-dataset',
+                     '--sin-libro', '--formatos-tablas', 'csv', '--procesos', '2']
+
+
+def _entradas(directorio):
+    return os.listdir(directorio) if os.path.isdir(directorio) else []
+
+def test_con_cache_los_trabajadores_escriben_entradas(tmp_path, cache_temporal):
+    codigo = linea_comandos.main(ARGUMENTOS_TABLAS + ['--salida', str(tmp_path / 'salida')])
+    assert codigo == linea_comandos.EXITO
+    assert _entradas(cache_temporal)
+
+def test_sin_cache_el_directorio_queda_vacio(tmp_path, cache_temporal):
+    codigo = linea_comandos.main(ARGUMENTOS_TABLAS + ['--sin-cache', '--salida', str(tmp_path / 'salida')])
+    assert codigo == linea_comandos.EXITO
+    assert _entradas(cache_temporal) == []
+
+def test_datos_csv_y_excel(tmp_path):
+    from datos import cargar_datos_originales
+    df = cargar_datos_originales()
+    df.to_csv(tmp_path / 'inventario.csv', index=False, encoding='utf-8-sig')
+    df.to_excel(tmp_path / 'inventario.xlsx', index=False)
+
+    for nombre in ('inventario.csv', 'inventario.xlsx'):
+        salida = tmp_path / f'salida_{nombre}'
+        codigo = linea_comandos.main(['--datos', str(tmp_path / nombre), '--tablas', 'tabla3', 'tabla10',
+                                      '--sin-graficos', '--sin-libro', '--procesos', '1',
+                                      '--salida', str(salida)])
+        assert codigo == linea_comandos.EXITO
+        assert os.path.exists(salida / 'tablas' / 'tabla10.csv')
+
+def test_catalogo_igual_que_las_funciones():
+    from analisis_estadistico import FUNCIONES_TABLAS
+    from graficos_completos import FUNCIONES_GRAFICOS
+    from catalogo import NOMBRES_TABLAS, NOMBRES_GRAFICOS
+    assert tuple(FUNCIONES_TABLAS) == NOMBRES_TABLAS
+    assert tuple(FUNCIONES_GRAFICOS) == NOMBRES_GRAFICOS
+
+@pytest.mark.parametrize('argumentos', [['--listar'], ['--help'], ['--tablas', 'tabla99']])
+def test_arranque_sin_modulos_pesados(argumentos):
+    codigo = (f"import sys, linea_comandos\n"
+              f"try:\n    linea_comandos.main({argumentos!r})\nexcept SystemExit:\n    pass\n"
+              f"print([m for m in {MODULOS_PESADOS!r} if m in sys.modules], file=sys.stderr)")
+    resultado = subprocess.run([sys.executable, '-c', codigo], cwd=DIRECTORIO_PROYECTO,
+                               capture_output=True, text=True, timeout=60)
+    assert resultado.stderr.strip().splitlines()[-1] == '[]'
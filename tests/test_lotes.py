@@ -0,0 +1,52 @@
+# test_lotes.py
+"""
+PRUEBAS DEL PROCESAMIENTO POR LOTES
+Solo se toman como datasets los archivos soportados y los directorios con
+columnas .npy; la salida del lote dentro de la entrada no se reprocesa
+"""
+
+import os
+from datos import cargar_datos_originales
+from fuentes_datos import guardar_dataset_columnar
+from lotes import listar_datasets, ejecutar_lote
+
+
+def _entrada(tmp_path):
+    entrada = tmp_path / 'regiones'
+    entrada.mkdir()
+    df = cargar_datos_originales()
+    guardar_dataset_columnar(df, str(entrada / 'norte'))
+    df.to_csv(entrada / 'sur.csv', index=False, encoding='utf-8-sig')
+    # Directorios que no son datasets
+    for nombre in ('__pycache__', '.cache_resultados', 'vacio'):
+        (entrada / nombre).mkdir()
+    (entrada / '__pycache__' / 'lotes.cpython-311.pyc').write_bytes(b'')
+    (entrada / 'notas.txt').write_text('no es un dataset', encoding='utf-8')
+    return entrada
+
+def test_listar_omite_directorios_que_no_son_datasets(tmp_path):
+    entrada = _entrada(tmp_path)
+    salida = entrada / 'salida'
+    (salida / 'norte').mkdir(parents=True)
+    (salida / 'indice_lote.csv').write_text('dataset\n', encoding='utf-8')
+
+    rutas = listar_datasets(str(entrada), excluir=str(salida))
+    assert [os.path.basename(ruta) for ruta in rutas] == ['norte', 'sur.csv']
+
+def test_lote_con_salida_dentro_de_la_entrada(tmp_path):
+    entrada = _entrada(tmp_path)
+    opciones = dict(graficos=False, libro=False, formatos_tablas=['csv'])
+
+    # La segunda ejecución encuentra la salida y el índice de la primera
+    for _ in range(2):
+        indice, errores = ejecutar_lote(str(entrada), str(entrada / 'salida'), procesos=1, **opciones)
+        assert errores == {}
+        assert list(indice['dataset']) == ['norte', 'sur.csv']
+
+def test_lote_con_salida_en_el_mismo_directorio(tmp_path):
+    entrada = _entrada(tmp_path)
+    for _ in range(2):
+        indice, errores = ejecutar_lote(str(entrada), str(entrada), procesos=1, graficos=False,
+                                        libro=False, formatos_tablas=['csv'])
+        assert errores == {}
+        assert list(indice['dataset']) == ['norte', 'sur.csv']
@@ -0,0 +1,95 @@
+# test_manifiesto.py
+"""
+PRUEBAS DE LA EXPORTACIÓN INCREMENTAL
+Una segunda exportación sin cambios no regenera ningún artefacto; los archivos
+que un artefacto deja de producir se eliminan y los de uno fallido quedan
+listados como huérfanos
+"""
+
+import json
+import os
+from manifiesto_exportacion import Manifiesto, NOMBRE_MANIFIESTO
+from pipeline import exportar_todo
+
+
+def _nodos_ejecutados(directorio, **opciones):
+    ejecutados = []
+    archivos, errores = exportar_todo(directorio, procesos=1, **opciones,
+                                      progreso=lambda nombre, estado, *_: ejecutados.append(nombre))
+    assert not errores
+    return archivos, ejecutados
+
+def _escribir(directorio, relativa, texto='x'):
+    ruta = os.path.join(directorio, relativa)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write(texto)
+    return ruta
+
+# ============================================================================
+# REEXPORTACIÓN
+# ============================================================================
+
+def test_reexportacion_omite_todos_los_artefactos(tmp_path):
+    directorio = str(tmp_path / 'exportacion')
+    archivos, _ = _nodos_ejecutados(directorio)
+    assert archivos and all(os.path.exists(ruta) for ruta in archivos)
+
+    with open(os.path.join(directorio, NOMBRE_MANIFIESTO), encoding='utf-8') as f:
+        registrados = set(json.load(f)['artefactos'])
+    fechas = {ruta: os.stat(ruta).st_mtime_ns for ruta in archivos}
+
+    archivos, ejecutados = _nodos_ejecutados(directorio)
+
+    # Solo los nodos locales del grafo (contexto y carpetas): ningún artefacto se regenera
+    assert archivos == []
+    assert set(ejecutados) == {'contexto', 'carpetas'}
+    assert not registrados & set(ejecutados)
+    assert all(os.stat(ruta).st_mtime_ns == fecha for ruta, fecha in fechas.items())
+
+def test_formato_quitado_elimina_su_archivo(tmp_path):
+    directorio = str(tmp_path / 'exportacion')
+    opciones = dict(tablas=['tabla3'], graficos=False, dataset=False, verificacion=False, libro=False)
+    _nodos_ejecutados(directorio, formatos_tablas=['md', 'csv'], **opciones)
+    csv = os.path.join(directorio, 'tablas', 'tabla3.csv')
+    assert os.path.exists(csv)
+
+    _nodos_ejecutados(directorio, formatos_tablas=['md'], **opciones)
+    assert not os.path.exists(csv)
+    assert os.path.exists(os.path.join(directorio, 'tablas', 'tabla3.md'))
+    assert Manifiesto(directorio).huerfanos == []
+
+# ============================================================================
+# MANIFIESTO
+# ============================================================================
+
+def test_artefacto_renombrado_se_poda(tmp_path):
+    directorio = str(tmp_path)
+    manifiesto = Manifiesto(directorio)
+    viejo = _escribir(directorio, 'tablas/tabla_vieja.md')
+    nuevo = _escribir(directorio, 'tablas/tabla3.md')
+    manifiesto.registrar('tabla_vieja', 'h1', [viejo])
+    manifiesto.registrar('tabla3', 'h2', [nuevo])
+    manifiesto.registrar('dataset', 'h3', [])
+
+    assert manifiesto.podar(['tabla3'], prefijo='tabla') == ['tabla_vieja']
+    assert not os.path.exists(viejo)
+    assert os.path.exists(nuevo)
+    assert set(manifiesto.artefactos) == {'tabla3', 'dataset'}
+
+def test_artefacto_olvidado_queda_como_huerfano(tmp_path):
+    directorio = str(tmp_path)
+    ruta = _escribir(directorio, 'graficos/1.png')
+    manifiesto = Manifiesto(directorio)
+    manifiesto.registrar('grafico_1', 'h', [ruta])
+    manifiesto.olvidar('grafico_1')
+    manifiesto.guardar()
+
+    assert os.path.exists(ruta)
+    assert Manifiesto(directorio).huerfanos == [os.path.join('graficos', '1.png')]
+
+    # Al regenerarse deja de ser huérfano
+    manifiesto = Manifiesto(directorio)
+    manifiesto.registrar('grafico_1', 'h', [ruta])
+    manifiesto.guardar()
+    assert Manifiesto(directorio).huerfanos == []
@@ -0,0 +1,110 @@
+# test_motor_estadistico.py
+"""
+PRUEBAS DEL MOTOR ESTADÍSTICO
+Los resultados vectorizados coinciden con scipy.stats métrica por métrica,
+con valores faltantes, empates y filas sin modelo de seguridad
+"""
+
+import numpy as np
+import pytest
+from scipy import stats
+from contexto_datos import ContextoDatos, ORDEN_CATEGORIAS
+from fuentes_datos import abrir_fuente, guardar_dataset_columnar
+from conftest import generar_dataset
+from motor_estadistico import (kruskal_wallis, mann_whitney_pares, correlaciones_spearman,
+                                columnas_numericas, VARIABLES_CORRELACION)
+
+MODELOS = ORDEN_CATEGORIAS['Modelo_Seguridad']
+METRICAS = ['Incidentes_Mensuales', 'Tasa_Bloqueo_%', 'Tiempo_Respuesta_min',
+            'Tiempo_Detección_min', 'Percepción_1_5', 'Capacitación_1_5', 'Especialistas']
+
+
+def _muestras(df, metrica):
+    """Valores no faltantes de la métrica por modelo (las filas sin modelo se omiten)"""
+    return [df.loc[df['Modelo_Seguridad'] == modelo, metrica].dropna().to_numpy(dtype=float)
+            for modelo in MODELOS]
+
+def _contexto(tmp_path, df, nombre):
+    return ContextoDatos(abrir_fuente(guardar_dataset_columnar(df, str(tmp_path / nombre))))
+
+# ============================================================================
+# KRUSKAL-WALLIS
+# ============================================================================
+
+def test_kruskal_wallis_igual_que_scipy(dataset_sintetico, contexto_sintetico):
+    resultado = kruskal_wallis(contexto_sintetico, METRICAS).set_index('Métrica')
+
+    for metrica in METRICAS:
+        muestras = _muestras(dataset_sintetico, metrica)
+        esperado = stats.kruskal(*muestras)
+        fila = resultado.loc[metrica]
+        assert fila['H'] == pytest.approx(esperado.statistic, rel=1e-10)
+        assert fila['p'] == pytest.approx(esperado.pvalue, rel=1e-8, abs=1e-300)
+        assert fila['N'] == sum(len(m) for m in muestras)
+        assert fila['gl'] == 2
+
+def test_kruskal_wallis_un_solo_grupo(tmp_path, dataset_sintetico):
+    ctx = _contexto(tmp_path, dataset_sintetico.assign(Modelo_Seguridad='Híbrido'), 'un_grupo')
+
+    resultado = kruskal_wallis(ctx, METRICAS)
+    assert (resultado['gl'] == 0).all()
+    assert resultado[['H', 'p', 'epsilon2']].isna().all().all()
+
+# ============================================================================
+# MANN-WHITNEY POR PARES
+# ============================================================================
+
+def _comparar_mann_whitney(df, resultado, metodo):
+    for _, fila in resultado.iterrows():
+        muestras = dict(zip(MODELOS, _muestras(df, fila['Métrica'])))
+        a, b = muestras[fila['Grupo 1']], muestras[fila['Grupo 2']]
+        esperado = stats.mannwhitneyu(a, b, alternative='two-sided', method='auto')
+        assert (fila['n1'], fila['n2']) == (len(a), len(b))
+        assert fila['U'] == pytest.approx(esperado.statistic)
+        assert fila['p'] == pytest.approx(esperado.pvalue, rel=1e-8, abs=1e-300)
+        assert fila['metodo'] == metodo
+
+def test_mann_whitney_igual_que_scipy(dataset_sintetico, contexto_sintetico):
+    resultado = mann_whitney_pares(contexto_sintetico, METRICAS, correccion=None)
+    assert len(resultado) == 3 * len(METRICAS)
+    assert (resultado['p_ajustado'] == resultado['p']).all()
+    _comparar_mann_whitney(dataset_sintetico, resultado, 'asintótico')
+
+def test_mann_whitney_exacto_en_muestras_pequenas(tmp_path):
+    # Pocas filas y métricas continuas sin empates: scipy también usa la distribución exacta
+    df = generar_dataset(filas=15, semilla=3, faltantes=0.0)
+    df = df.assign(**{'Modelo_Seguridad': MODELOS * 5, 'Tasa_Bloqueo_%': np.arange(15.0)[::-1] * 1.5})
+    ctx = _contexto(tmp_path, df, 'pequeno')
+
+    resultado = mann_whitney_pares(ctx, ['Tasa_Bloqueo_%'], correccion=None)
+    _comparar_mann_whitney(df, resultado, 'exacto')
+
+def test_mann_whitney_holm(contexto_sintetico):
+    resultado = mann_whitney_pares(contexto_sintetico, METRICAS, correccion='holm')
+    p = resultado['p'].to_numpy()
+    orden = np.argsort(p, kind='stable')
+    esperado = np.maximum.accumulate(np.minimum(1.0, (len(p) - np.arange(len(p))) * p[orden]))
+    np.testing.assert_allclose(resultado['p_ajustado'].to_numpy()[orden], esperado)
+
+# ============================================================================
+# CORRELACIONES DE SPEARMAN
+# ============================================================================
+
+@pytest.mark.parametrize('faltantes', [0.0, 0.05])
+def test_spearman_igual_que_scipy(tmp_path, faltantes):
+    df = generar_dataset(faltantes=faltantes)
+    ctx = _contexto(tmp_path, df, 'spearman')
+    correlaciones = correlaciones_spearman(ctx)
+    datos = columnas_numericas(ctx, VARIABLES_CORRELACION)
+
+    for i, x in enumerate(VARIABLES_CORRELACION):
+        for y in VARIABLES_CORRELACION[i + 1:]:
+            # Cada par sobre sus observaciones completas
+            par = datos[[x, y]].dropna()
+            esperado = stats.spearmanr(par[x], par[y])
+            assert correlaciones['n'].loc[x, y] == len(par)
+            assert correlaciones['rho'].loc[x, y] == pytest.approx(esperado.statistic, abs=1e-12)
+            assert correlaciones['p'].loc[x, y] == pytest.approx(esperado.pvalue, rel=1e-8, abs=1e-300)
+
+    np.testing.assert_array_equal(np.diag(correlaciones['rho']), 1.0)
+    assert correlaciones['rho'].equals(correlaciones['rho'].T)
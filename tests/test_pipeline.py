@@ -0,0 +1,77 @@
+# test_pipeline.py
+"""
+PRUEBAS DEL PIPELINE DE EXPORTACIÓN
+Orden por dependencias y registro de fallos por nodo, incluso cuando un
+proceso trabajador muere y el grupo de procesos queda inservible; los
+gráficos solos también pasan por el pipeline
+"""
+
+import os
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from pipeline import Pipeline
+
+# Funciones de nivel de módulo: los procesos 'spawn' las importan por nombre
+
+def uno():
+    return 1
+
+def sumar_uno(x):
+    return x + 1
+
+def fallar():
+    raise ValueError("fallo del nodo")
+
+def morir():
+    os._exit(1)
+
+# ============================================================================
+# GRAFO
+# ============================================================================
+
+def test_ciclo_detectado():
+    p = Pipeline().agregar('a', sumar_uno, ['b']).agregar('b', sumar_uno, ['a'])
+    with pytest.raises(ValueError, match="Ciclo"):
+        p.orden_topologico()
+
+@pytest.mark.parametrize('procesos', [1, 2])
+def test_fallo_de_nodo_omite_dependientes(procesos):
+    p = (Pipeline().agregar('a', uno).agregar('b', sumar_uno, ['a'])
+         .agregar('f', fallar).agregar('g', sumar_uno, ['f']))
+    resultados, errores = p.ejecutar(procesos=procesos)
+
+    assert resultados == {'a': 1, 'b': 2}
+    assert isinstance(errores['f'], ValueError)
+    assert "Dependencia fallida" in str(errores['g'])
+
+def test_trabajador_muerto_se_registra_como_fallo():
+    # Un trabajador que termina el proceso rompe el grupo: ejecutar no debe
+    # propagar BrokenProcessPool, sino marcar los nodos afectados como fallidos
+    p = (Pipeline().agregar('a', uno).agregar('m', morir)
+         .agregar('c', sumar_uno, ['m']))
+    resultados, errores = p.ejecutar(procesos=2)
+
+    assert set(errores) >= {'m', 'c'}
+    assert isinstance(errores['m'], BrokenProcessPool)
+    assert set(resultados) | set(errores) == {'a', 'm', 'c'}
+
+# ============================================================================
+# GRÁFICOS SOLOS
+# ============================================================================
+
+def test_generar_todos_graficos_usa_el_pipeline(tmp_path, contexto_sintetico, monkeypatch):
+    import graficos_completos
+    from graficos_completos import FUNCIONES_GRAFICOS, generar_todos_graficos
+
+    directorio = str(tmp_path / 'salida')
+    assert generar_todos_graficos(contexto_sintetico, directorio, procesos=1, formatos=('pdf',)) is True
+    assert sorted(os.listdir(os.path.join(directorio, 'graficos'))) == \
+        sorted(f'{nombre}.pdf' for nombre in FUNCIONES_GRAFICOS)
+    assert os.listdir(os.path.join(directorio, 'tablas')) == []
+
+    # Sin nada pendiente sigue siendo verdadero; un gráfico que falla no
+    monkeypatch.setattr(graficos_completos, 'FUNCIONES_GRAFICOS',
+                        {**FUNCIONES_GRAFICOS, '1_incidentes': lambda ctx: fallar()})
+    assert generar_todos_graficos(contexto_sintetico, directorio, procesos=1, formatos=('pdf',)) is True
+    assert generar_todos_graficos(contexto_sintetico, directorio, procesos=1, formatos=('pdf',),
+                                  forzar=True) is False
@@ -0,0 +1,87 @@
+# test_remuestreo.py
+"""
+PRUEBAS DEL REMUESTREO
+Valores p por permutación reproducibles con cualquier número de procesos y
+cercanos a los asintóticos; intervalos bootstrap comparables con scipy
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+import remuestreo
+from motor_estadistico import kruskal_wallis, mann_whitney_pares
+from remuestreo import permutacion_kruskal, permutacion_mann_whitney, bootstrap_medias
+
+METRICAS = ['Incidentes_Mensuales', 'Tasa_Bloqueo_%', 'Percepción_1_5', 'Capacitación_1_5',
+            'Especialistas', 'Bloqueos_Exitosos']
+PERMUTACIONES = 4000
+# Error de Monte Carlo de p con 4000 permutaciones: a lo sumo ~0.008 (desvío estándar)
+TOLERANCIA_P = 0.03
+
+# ============================================================================
+# PERMUTACIONES
+# ============================================================================
+
+def test_permutacion_reproducible_en_varios_procesos(contexto_sintetico, monkeypatch):
+    # Lotes pequeños para que haya varios y se repartan entre los procesos
+    monkeypatch.setattr(remuestreo, 'TAMANO_LOTE', 1000)
+    secuencial = permutacion_kruskal(contexto_sintetico, METRICAS, permutaciones=PERMUTACIONES,
+                                     semilla=7, procesos=1)
+    paralelo = permutacion_kruskal(contexto_sintetico, METRICAS, permutaciones=PERMUTACIONES,
+                                   semilla=7, procesos=2)
+    pd.testing.assert_frame_equal(secuencial, paralelo)
+
+    otra_semilla = permutacion_kruskal(contexto_sintetico, METRICAS, permutaciones=PERMUTACIONES,
+                                       semilla=8, procesos=1)
+    assert not otra_semilla['p_permutacion'].equals(secuencial['p_permutacion'])
+
+def test_permutacion_kruskal_cercana_a_asintotica(contexto_sintetico):
+    resultado = permutacion_kruskal(contexto_sintetico, METRICAS, permutaciones=PERMUTACIONES,
+                                    semilla=0, procesos=1)
+    asintotico = kruskal_wallis(contexto_sintetico, METRICAS)
+
+    np.testing.assert_allclose(resultado['H'], asintotico['H'], rtol=1e-12)
+    assert (resultado['p_permutacion'] >= 1 / (PERMUTACIONES + 1)).all()
+    np.testing.assert_allclose(resultado['p_permutacion'], asintotico['p'], atol=TOLERANCIA_P)
+
+def test_permutacion_mann_whitney_cercana_a_asintotica(contexto_sintetico):
+    resultado = permutacion_mann_whitney(contexto_sintetico, METRICAS, permutaciones=PERMUTACIONES,
+                                         semilla=0, procesos=1)
+    asintotico = mann_whitney_pares(contexto_sintetico, METRICAS)
+
+    pd.testing.assert_frame_equal(resultado[['Métrica', 'Grupo 1', 'Grupo 2']],
+                                  asintotico[['Métrica', 'Grupo 1', 'Grupo 2']])
+    np.testing.assert_allclose(resultado['p_permutacion'], asintotico['p'], atol=TOLERANCIA_P)
+
+# ============================================================================
+# BOOTSTRAP
+# ============================================================================
+
+REMUESTRAS = 5000
+# Los extremos de scipy y del motor usan remuestras distintas: se comparan
+# como fracción del ancho del intervalo
+TOLERANCIA_IC = 0.1
+
+def test_bootstrap_igual_que_scipy(dataset_sintetico, contexto_sintetico):
+    resultado = bootstrap_medias(contexto_sintetico, METRICAS, remuestras=REMUESTRAS, semilla=1)
+    assert len(resultado) == 3 * len(METRICAS)
+
+    for _, fila in resultado.iterrows():
+        grupo = dataset_sintetico['Modelo_Seguridad'] == fila['Modelo_Seguridad']
+        valores = dataset_sintetico.loc[grupo, fila['Métrica']].dropna().to_numpy(dtype=float)
+        assert fila['n'] == len(valores)
+        assert np.isclose(fila['media'], valores.mean())
+
+        for metodo, prefijo in (('percentile', 'ic_percentil'), ('BCa', 'ic_bca')):
+            esperado = stats.bootstrap((valores,), np.mean, n_resamples=REMUESTRAS, method=metodo,
+                                       random_state=2).confidence_interval
+            ancho = esperado.high - esperado.low
+            assert abs(fila[f'{prefijo}_inf'] - esperado.low) < TOLERANCIA_IC * ancho
+            assert abs(fila[f'{prefijo}_sup'] - esperado.high) < TOLERANCIA_IC * ancho
+
+def test_bootstrap_reproducible(contexto_sintetico):
+    primero = bootstrap_medias(contexto_sintetico, METRICAS, remuestras=1000, semilla=5)
+    segundo = bootstrap_medias(contexto_sintetico, METRICAS, remuestras=1000, semilla=5)
+    pd.testing.assert_frame_equal(primero, segundo)
+    assert (primero['ic_bca_inf'] < primero['media']).all()
+    assert (primero['media'] < primero['ic_bca_sup']).all()
@@ -0,0 +1,82 @@
+# test_renderizado_tablas.py
+"""
+PRUEBAS DEL RENDERIZADO DE TABLAS
+Una tabla pequeña con caracteres especiales (%, _, &, |, <) y celdas vacías,
+con formato printf por columna, comparada con la salida exacta de cada formato
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from renderizado_tablas import TablaFormateada, formatear_columna
+
+
+@pytest.fixture
+def formateada():
+    tabla = pd.DataFrame({
+        'Modelo': ['A_1 & B', 'x|y <z>', None],
+        'Tasa %': [12.5, np.nan, 3.0],
+        'n': [10, 20, 30],
+        'Media': [0.123456, 1.0, np.nan],
+    })
+    return TablaFormateada(tabla, formatos={'Tasa %': '%.1f%%', 'Media': 2})
+
+def test_formato_por_columna(formateada):
+    assert formateada.columnas == [['A_1 & B', 'x|y <z>', ''],
+                                   ['12.5%', '', '3.0%'],
+                                   ['10', '20', '30'],
+                                   ['0.12', '1.00', '']]
+    assert formateada.numericas == [False, True, True, True]
+
+def test_decimales_y_faltante_por_defecto():
+    serie = pd.Series([1.5, np.nan, 2.0])
+    assert formatear_columna(serie, decimales=3) == ['1.500', '', '2.000']
+    assert formatear_columna(serie, '%.0f', faltante='-') == ['2', '-', '2']
+
+def test_texto(formateada):
+    assert formateada.texto() == '\n'.join([
+        ' Modelo  Tasa %   n  Media',
+        'A_1 & B   12.5%  10   0.12',
+        'x|y <z>          20   1.00',
+        '           3.0%  30       ',
+    ])
+
+def test_markdown(formateada):
+    assert formateada.markdown() == '\n'.join([
+        '| Modelo   | Tasa % |   n | Media |',
+        '|:---------|-------:|----:|------:|',
+        '| A_1 & B  |  12.5% |  10 |  0.12 |',
+        r'| x\|y <z> |        |  20 |  1.00 |',
+        '|          |   3.0% |  30 |       |',
+    ])
+
+def test_csv(formateada):
+    assert formateada.csv() == ('Modelo,Tasa %,n,Media\n'
+                                'A_1 & B,12.5%,10,0.12\n'
+                                'x|y <z>,,20,1.00\n'
+                                ',3.0%,30,\n')
+
+def test_latex(formateada):
+    assert formateada.latex() == '\n'.join([
+        r'\begin{tabular}{lrrr}',
+        r'\hline',
+        r'Modelo & Tasa \% & n & Media \\',
+        r'\hline',
+        r'A\_1 \& B & 12.5\% & 10 & 0.12 \\',
+        r'x|y <z> &  & 20 & 1.00 \\',
+        r' & 3.0\% & 30 &  \\',
+        r'\hline',
+        r'\end{tabular}',
+    ])
+
+def test_html(formateada):
+    derecha = '<td style="text-align: right">'
+    assert formateada.html() == '\n'.join([
+        '<table>', '<thead>',
+        '<tr><th>Modelo</th><th>Tasa %</th><th>n</th><th>Media</th></tr>',
+        '</thead>', '<tbody>',
+        f'<tr><td>A_1 &amp; B</td>{derecha}12.5%</td>{derecha}10</td>{derecha}0.12</td></tr>',
+        f'<tr><td>x|y &lt;z&gt;</td>{derecha}</td>{derecha}20</td>{derecha}1.00</td></tr>',
+        f'<tr><td></td>{derecha}3.0%</td>{derecha}30</td>{derecha}</td></tr>',
+        '</tbody>', '</table>',
+    ])
@@ -0,0 +1,67 @@
+# test_salida_figuras.py
+"""
+PRUEBAS DE LA SALIDA DE FIGURAS
+Cada figura se rasteriza una sola vez con Agg para todos los formatos,
+también cuando el recorte ajustado sobresale del lienzo
+"""
+
+import io
+import matplotlib.pyplot as plt
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+from graficos_completos import FUNCIONES_GRAFICOS
+from salida_figuras import guardar_figura
+
+
+@pytest.fixture
+def dibujos(monkeypatch):
+    """Cuenta los dibujos rasterizados en Agg"""
+    conteo = []
+    dibujar = FigureCanvasAgg.draw
+
+    def contar(canvas, *args, **kwargs):
+        conteo.append(canvas.figure)
+        return dibujar(canvas, *args, **kwargs)
+
+    monkeypatch.setattr(FigureCanvasAgg, 'draw', contar)
+    yield conteo
+    plt.close('all')
+
+@pytest.mark.parametrize('nombre', list(FUNCIONES_GRAFICOS))
+def test_un_dibujo_por_grafico(tmp_path, dibujos, nombre):
+    fig = FUNCIONES_GRAFICOS[nombre]()
+    motor = fig.get_layout_engine()
+    dibujos.clear()
+
+    rutas = guardar_figura(fig, str(tmp_path / nombre), formatos=('png', 'pdf', 'vista_previa'))
+    assert len(dibujos) == 1
+    assert len(rutas) == 3 and all(ruta.startswith(str(tmp_path)) for ruta in rutas)
+    assert fig.get_layout_engine() is motor
+
+def test_recorte_fuera_del_lienzo(tmp_path, dibujos):
+    fig, ax = plt.subplots(figsize=(4, 3))
+    ax.plot([0, 1], [0, 1])
+    fig.suptitle('Título por encima del lienzo', y=1.15)
+    esperado = io.BytesIO()
+    fig.savefig(esperado, format='png', dpi=100, bbox_inches='tight')
+    dibujos.clear()
+
+    guardar_figura(fig, str(tmp_path / 'alto'), formatos=('png', 'vista_previa', 'svg'), dpi=100,
+                   dpi_vista_previa=50)
+    assert len(dibujos) == 1
+
+    with Image.open(tmp_path / 'alto.png') as png, Image.open(esperado) as referencia:
+        assert png.size == referencia.size
+        ancho, alto = png.size
+    with Image.open(tmp_path / 'alto_vista_previa.png') as previa:
+        assert previa.size == (round(ancho / 2), round(alto / 2))
+
+def test_solo_vectoriales_sin_rasterizar(tmp_path, dibujos):
+    fig, ax = plt.subplots()
+    ax.bar(['a', 'b'], [1, 2])
+    plt.tight_layout()
+    dibujos.clear()
+
+    guardar_figura(fig, str(tmp_path / 'vectorial'), formatos=('pdf', 'svg'))
+    assert dibujos == []
@@ -0,0 +1,165 @@
+# vista_virtual.py
+"""
+VISTA VIRTUAL DE TABLAS EN UN TREEVIEW
+El Treeview solo contiene las filas visibles: al desplazarse se reutilizan esas
+mismas filas con los valores de la nueva ventana, tomados directamente del
+DataFrame. Así, mostrar 100.000 entidades cuesta lo mismo que mostrar 20. El
+ancho de las columnas se estima con una muestra acotada de filas
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+MUESTRA_ANCHOS = 200        # Filas usadas para estimar el ancho de cada columna
+PIXELES_POR_CARACTER = 9
+ANCHO_MINIMO = 50
+ANCHO_MAXIMO = 200
+FILAS_POR_RUEDA = 3         # Filas que avanza cada paso de la rueda del ratón
+
+# ============================================================================
+# ANCHO DE COLUMNAS
+# ============================================================================
+
+def estimar_anchos(dataframe, muestra=MUESTRA_ANCHOS):
+    """Ancho en píxeles de cada columna según su título y una muestra de filas repartida en toda la tabla"""
+    total = len(dataframe)
+    if total > muestra:
+        # Sin NumPy: este módulo se importa antes de mostrar la ventana
+        posiciones = sorted({i * (total - 1) // (muestra - 1) for i in range(muestra)})
+        dataframe = dataframe.iloc[posiciones]
+
+    anchos = []
+    for j, columna in enumerate(dataframe.columns):
+        largo = max([len(str(columna))] + [len(str(valor)) for valor in dataframe.iloc[:, j].tolist()])
+        anchos.append(min(max(largo * PIXELES_POR_CARACTER, ANCHO_MINIMO), ANCHO_MAXIMO))
+    return anchos
+
+# ============================================================================
+# VISTA VIRTUAL
+# ============================================================================
+
+class VistaVirtual:
+    """Treeview que materializa solo la ventana de filas visible de un DataFrame"""
+
+    def __init__(self, tree, barra_vertical):
+        self.tree = tree
+        self.barra = barra_vertical
+        self.datos = None
+        self.inicio = 0
+        self.seleccionadas = set()
+
+        # La barra vertical desplaza la ventana de datos, no el contenido del Treeview
+        self.tree.configure(yscrollcommand='')
+        self.barra.configure(command=self._desplazar_barra)
+
+        self.tree.bind('<Configure>', lambda evento: self._dibujar())
+        self.tree.bind('<MouseWheel>', self._rueda)
+        self.tree.bind('<Button-4>', lambda evento: self.desplazar(-FILAS_POR_RUEDA))
+        self.tree.bind('<Button-5>', lambda evento: self.desplazar(FILAS_POR_RUEDA))
+        self.tree.bind('<Prior>', lambda evento: self._tecla(-self.filas_visibles()))
+        self.tree.bind('<Next>', lambda evento: self._tecla(self.filas_visibles()))
+        self.tree.bind('<Home>', lambda evento: self._tecla(-self.total))
+        self.tree.bind('<End>', lambda evento: self._tecla(self.total))
+        self.tree.bind('<<TreeviewSelect>>', self._registrar_seleccion)
+
+    @property
+    def total(self):
+        return 0 if self.datos is None else len(self.datos)
+
+    def mostrar(self, dataframe, anchos=None):
+        """Muestra un DataFrame (sin copiarlo) desde la primera fila"""
+        self.datos = dataframe
+        self.inicio = 0
+        self.seleccionadas = set()
+        self.tree.delete(*self.tree.get_children())
+
+        columnas = [str(columna) for columna in dataframe.columns]
+        self.tree["columns"] = columnas
+        self.tree["show"] = "headings"
+
+        for col, ancho in zip(columnas, anchos or estimar_anchos(dataframe)):
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=ancho, minwidth=ANCHO_MINIMO, anchor=tk.CENTER)
+
+        self._dibujar()
+
+    def filas_visibles(self):
+        """Filas que caben en el alto actual del Treeview"""
+        alto_fila = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        alto = self.tree.winfo_height()
+        if alto <= 1:
+            # Aún sin dibujar: el alto configurado del Treeview
+            return int(self.tree.cget('height'))
+        # Se descuenta la fila de encabezados
+        return max(1, alto // alto_fila - 1)
+
+    def desplazar(self, filas):
+        self.ir_a(self.inicio + filas)
+
+    def ir_a(self, fila):
+        """Muestra la ventana que empieza en `fila` (acotada al final de los datos)"""
+        inicio = max(0, min(int(fila), self.total - self.filas_visibles()))
+        if inicio != self.inicio:
+            self.inicio = inicio
+            self._dibujar()
+
+    def seleccion(self):
+        """Posiciones (en el DataFrame) de las filas seleccionadas"""
+        return sorted(self.seleccionadas)
+
+    # ------------------------------------------------------------------------
+    # DIBUJO DE LA VENTANA
+    # ------------------------------------------------------------------------
+
+    def _dibujar(self):
+        if self.datos is None:
+            return
+
+        fin = min(self.inicio + self.filas_visibles(), self.total)
+        ventana = self.datos.iloc[self.inicio:fin]
+        filas = list(zip(*[ventana.iloc[:, j].tolist() for j in range(ventana.shape[1])]))
+
+        # Se reutilizan los ítems existentes; solo se crean o borran los que sobran
+        items = list(self.tree.get_children())
+        if len(items) < len(filas):
+            items += [self.tree.insert("", "end") for _ in range(len(filas) - len(items))]
+        elif len(items) > len(filas):
+            self.tree.delete(*items[len(filas):])
+            items = items[:len(filas)]
+
+        for item, fila in zip(items, filas):
+            self.tree.item(item, values=fila)
+
+        # La selección sigue a las filas del DataFrame, no a los ítems reutilizados
+        visibles = [item for posicion, item in enumerate(items, self.inicio)
+                    if posicion in self.seleccionadas]
+        self.tree.selection_set(visibles)
+
+        if self.total:
+            self.barra.set(self.inicio / self.total, fin / self.total)
+        else:
+            self.barra.set(0, 1)
+
+    # ------------------------------------------------------------------------
+    # EVENTOS
+    # ------------------------------------------------------------------------
+
+    def _desplazar_barra(self, accion, cantidad, unidad=None):
+        if accion == 'moveto':
+            self.ir_a(float(cantidad) * self.total)
+        elif accion == 'scroll':
+            paso = self.filas_visibles() if unidad == 'pages' else 1
+            self.desplazar(int(cantidad) * paso)
+
+    def _rueda(self, evento):
+        self.desplazar(-FILAS_POR_RUEDA if evento.delta > 0 else FILAS_POR_RUEDA)
+
+    def _tecla(self, filas):
+        self.desplazar(filas)
+        return 'break'
+
+    def _registrar_seleccion(self, evento):
+        items = self.tree.get_children()
+        visibles = set(range(self.inicio, self.inicio + len(items)))
+        elegidas = {self.inicio + items.index(item) for item in self.tree.selection()}
+        self.seleccionadas = (self.seleccionadas - visibles) | elegidas
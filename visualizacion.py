@@ -6,17 +6,17 @@ Modificado para retornar figuras en lugar de mostrarlas
 
 import matplotlib.pyplot as plt
 import seaborn as sns
-import pandas as pd
 import numpy as np
-from datos import cargar_datos_originales
+from contexto_datos import obtener_contexto
+from graficos_completos import aplicar_estilo
+from salida_figuras import guardar_figura, FORMATOS_POR_DEFECTO
 
-# Configuración de estilo
-plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_palette("husl")
-
-def generar_grafico_cajas_incidentes():
+def generar_grafico_cajas_incidentes(contexto=None):
     """Genera gráfico de cajas para incidentes mensuales y retorna la figura"""
-    df = cargar_datos_originales()
+    aplicar_estilo()
+    ctx = obtener_contexto(contexto)
+    df = ctx.df
+    indice = ctx.indice('Modelo_Seguridad')
     
     fig, ax = plt.subplots(figsize=(10, 6))
     
@@ -51,7 +51,7 @@ def generar_grafico_cajas_incidentes():
     # Añadir anotaciones
     modelos = df['Modelo_Seguridad'].unique()
     for i, modelo in enumerate(['Perimetral', 'Híbrido', 'Zero Trust']):
-        media = df[df['Modelo_Seguridad'] == modelo]['Incidentes_Mensuales'].mean()
+        media = df['Incidentes_Mensuales'].take(indice.posiciones(modelo)).mean()
         ax.text(i, df['Incidentes_Mensuales'].max() * 1.05, 
                 f'Media: {media:.1f}', 
                 ha='center', fontsize=10)
@@ -59,9 +59,10 @@ def generar_grafico_cajas_incidentes():
     plt.tight_layout()
     return fig
 
-def generar_grafico_tasa_bloqueo():
+def generar_grafico_tasa_bloqueo(contexto=None):
     """Genera gráfico de barras para tasa de bloqueo y retorna la figura"""
-    df = cargar_datos_originales()
+    aplicar_estilo()
+    df = obtener_contexto(contexto).df
     
     # Calcular promedios por modelo
     promedios = df.groupby('Modelo_Seguridad')['Tasa_Bloqueo_%'].mean().reset_index()
@@ -89,9 +90,10 @@ def generar_grafico_tasa_bloqueo():
     plt.tight_layout()
     return fig
 
-def generar_grafico_tiempos_respuesta():
+def generar_grafico_tiempos_respuesta(contexto=None):
     """Genera gráfico para tiempos de respuesta y detección y retorna la figura"""
-    df = cargar_datos_originales()
+    aplicar_estilo()
+    df = obtener_contexto(contexto).df
     
     # Calcular promedios
     tiempos = df.groupby('Modelo_Seguridad')[['Tiempo_Respuesta_min', 'Tiempo_Detección_min']].mean()
@@ -123,9 +125,10 @@ def generar_grafico_tiempos_respuesta():
     plt.tight_layout()
     return fig
 
-def generar_grafico_percepcion_capacitacion():
+def generar_grafico_percepcion_capacitacion(contexto=None):
     """Genera gráfico para percepción y capacitación y retorna la figura"""
-    df = cargar_datos_originales()
+    aplicar_estilo()
+    df = obtener_contexto(contexto).df
     
     # Calcular promedios
     percep_capac = df.groupby('Modelo_Seguridad')[['Percepción_1_5', 'Capacitación_1_5']].mean()
@@ -176,10 +179,12 @@ def generar_grafico_percepcion_capacitacion():
     plt.tight_layout()
     return fig
 
-def generar_visualizaciones():
+def generar_visualizaciones(contexto=None, formatos=FORMATOS_POR_DEFECTO):
     """Genera todas las visualizaciones y las guarda en archivos"""
     import os
     
+    ctx = obtener_contexto(contexto)
+    
     # Crear directorio de gráficos si no existe
     if not os.path.exists('graficos'):
         os.makedirs('graficos')
@@ -193,9 +198,10 @@ def generar_visualizaciones():
     ]
     
     for funcion, nombre in figuras:
-        fig = funcion()
-        fig.savefig(f'graficos/{nombre}.png', dpi=300, bbox_inches='tight')
-        fig.savefig(f'graficos/{nombre}.pdf', bbox_inches='tight')
-        plt.close(fig)
+        fig = funcion(ctx)
+        try:
+            guardar_figura(fig, f'graficos/{nombre}', formatos)
+        finally:
+            plt.close(fig)
     
     print("✅ Todas las visualizaciones han sido generadas en la carpeta 'graficos/'")
\ No newline at end of file